@@ -1,10 +1,26 @@
-from . import catch_ico
-from . import custom_ui
-from . import process_manager
-from . import log_maker
-from . import config_manager
-from . import APIs
-from . import make_app_icon
-from . import threads
-from . import skills
-from . import notification_system
+"""
+核心模块
+
+子模块在首次访问时才导入：窗口快照、窗口规则、全屏检测、进程缓存等纯 Python 模块
+不依赖 Windows API 与 Qt，可在任意平台单独导入（如运行 tests 下的测试）。
+"""
+import importlib
+
+_SUBMODULES = (
+    'catch_ico',
+    'custom_ui',
+    'process_manager',
+    'log_maker',
+    'config_manager',
+    'APIs',
+    'make_app_icon',
+    'threads',
+    'skills',
+    'notification_system',
+)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,140 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .window_snapshot import normalize_path
+
+AppData = Dict[str, Any]
+
+
+class AppRegistry:
+    """
+    固定应用、用户应用与运行中应用的统一索引
+
+    每个分区保存应用字典列表（保持显示顺序），同时维护 规范化路径 / 名称 / uid 三个索引，
+    增删改名时同步更新，查询均为 O(1)。分区列表只应通过本类的方法修改。
+    """
+
+    PINNED = 'pinned'
+    APPS = 'apps'
+    RUNNING = 'running'
+    SECTIONS = (PINNED, APPS, RUNNING)
+
+    def __init__(self):
+        self._sections: Dict[str, List[AppData]] = {name: [] for name in self.SECTIONS}
+        self._by_path: Dict[str, Dict[str, List[AppData]]] = {name: {} for name in self.SECTIONS}
+        self._by_name: Dict[str, Dict[str, List[AppData]]] = {name: {} for name in self.SECTIONS}
+        self._by_uid: Dict[int, Tuple[str, AppData]] = {}
+        self._uid_counter = 0
+
+    # ====================== 分区 ======================
+
+    def section(self, section: str) -> List[AppData]:
+        """分区的应用列表（按显示顺序）"""
+        return self._sections[section]
+
+    def set_section(self, section: str, apps: Iterable[AppData]) -> None:
+        """整体替换分区内容并重建该分区的索引"""
+        for app in self._sections[section]:
+            self._by_uid.pop(app.get('_uid'), None)
+        self._sections[section] = list(apps or [])
+        self._by_path[section] = {}
+        self._by_name[section] = {}
+        for app in self._sections[section]:
+            self._index(section, app)
+
+    # ====================== 修改 ======================
+
+    def add(self, section: str, app: AppData) -> AppData:
+        self._sections[section].append(app)
+        self._index(section, app)
+        return app
+
+    def remove(self, section: str, app: AppData) -> bool:
+        try:
+            self._sections[section].remove(app)
+        except ValueError:
+            return False
+        self._unindex(section, app)
+        return True
+
+    def rename(self, section: str, app: AppData, new_name: str) -> None:
+        self._discard(self._by_name[section], app.get('name', ''), app)
+        app['name'] = new_name
+        self._by_name[section].setdefault(new_name, []).append(app)
+
+    def assign_uid(self, app: AppData) -> int:
+        """为应用分配唯一标识符；已有且未被其他应用占用的 uid 保持不变"""
+        uid = app.get('_uid')
+        owner = self._by_uid.get(uid) if uid else None
+        if uid and (owner is None or owner[1] is app):
+            self._uid_counter = max(self._uid_counter, uid)
+            return uid
+        self._uid_counter += 1
+        app['_uid'] = self._uid_counter
+        return self._uid_counter
+
+    # ====================== 查询 ======================
+
+    def find_by_path(self, path: str, sections: Iterable[str] = SECTIONS) -> Optional[Tuple[str, AppData]]:
+        key = normalize_path(path)
+        for section in sections:
+            apps = self._by_path[section].get(key)
+            if apps:
+                return section, apps[0]
+        return None
+
+    def apps_for_path(self, path: str, sections: Iterable[str] = SECTIONS) -> List[Tuple[str, AppData]]:
+        """指定路径在各分区中的全部应用"""
+        key = normalize_path(path)
+        return [(section, app) for section in sections for app in self._by_path[section].get(key, ())]
+
+    def find_by_name(self, name: str, sections: Iterable[str] = SECTIONS) -> Optional[Tuple[str, AppData]]:
+        for section in sections:
+            apps = self._by_name[section].get(name)
+            if apps:
+                return section, apps[0]
+        return None
+
+    def find_by_uid(self, uid: int) -> Optional[Tuple[str, AppData]]:
+        return self._by_uid.get(uid)
+
+    def has_path(self, section: str, path: str) -> bool:
+        return bool(self._by_path[section].get(normalize_path(path)))
+
+    def has_name(self, section: str, name: str) -> bool:
+        return bool(self._by_name[section].get(name))
+
+    def unique_name(self, section: str, base_name: str) -> str:
+        """生成分区内不重名的名称，重名时添加 (1), (2)... 后缀"""
+        name = base_name
+        counter = 1
+        while self.has_name(section, name):
+            name = f"{base_name} ({counter})"
+            counter += 1
+        return name
+
+    # ====================== 内部 ======================
+
+    def _index(self, section: str, app: AppData) -> None:
+        self._by_path[section].setdefault(normalize_path(app.get('path', '')), []).append(app)
+        self._by_name[section].setdefault(app.get('name', ''), []).append(app)
+        self._by_uid[self.assign_uid(app)] = (section, app)
+
+    def _unindex(self, section: str, app: AppData) -> None:
+        self._discard(self._by_path[section], normalize_path(app.get('path', '')), app)
+        self._discard(self._by_name[section], app.get('name', ''), app)
+        uid = app.get('_uid')
+        owner = self._by_uid.get(uid)
+        if owner is not None and owner[1] is app:
+            del self._by_uid[uid]
+
+    @staticmethod
+    def _discard(index: Dict[str, List[AppData]], key: str, app: AppData) -> None:
+        apps = index.get(key)
+        if not apps:
+            return
+        for i, candidate in enumerate(apps):
+            if candidate is app:
+                del apps[i]
+                break
+        if not apps:
+            del index[key]
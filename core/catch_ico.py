@@ -1,10 +1,12 @@
 
 import os
 import ctypes
+import threading
 import winreg
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, List, Dict, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum, IntFlag
 import warnings
 
@@ -72,17 +74,144 @@ class IconInfo:
     height: int                  # 高度
     bits_per_pixel: int          # 位深度
     format: str                  # 原始格式
-    size_bytes: int              # 数据大小
+    size_bytes: Optional[int] = None  # PNG 数据大小，None 表示尚未计算（见 ExtractedIcon.size_bytes）
 
 
 @dataclass
 class ExtractedIcon:
-    """提取的图标数据"""
+    """
+    提取的图标数据
+
+    raw_data（PNG 编码）与 size_bytes 在首次访问时才编码并记住结果；
+    只需要 PIL 图像的调用方（如保存为文件）不会产生任何编码开销。
+    """
     image: Optional['Image.Image']   # PIL图像对象
-    raw_data: bytes                  # 原始字节数据
     info: IconInfo                   # 图标信息
     success: bool                    # 提取是否成功
     error: Optional[str] = None      # 错误信息
+    bitmap: Optional[bytes] = field(default=None, repr=False)  # GDI 位图原始像素（BGRX，自上而下）
+    _raw_data: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    @property
+    def raw_data(self) -> bytes:
+        """PNG 编码后的字节数据（惰性计算）"""
+        if self._raw_data is None:
+            if self.image is None:
+                return b''
+            import io
+            buffer = io.BytesIO()
+            self.image.save(buffer, format='PNG')
+            self._raw_data = buffer.getvalue()
+        return self._raw_data
+
+    @property
+    def size_bytes(self) -> int:
+        """PNG 数据大小（惰性计算，结果同时写回 info.size_bytes）"""
+        if self.info.size_bytes is None:
+            self.info.size_bytes = len(self.raw_data)
+        return self.info.size_bytes
+
+    @property
+    def has_raw_data(self) -> bool:
+        """PNG 数据是否已经编码过"""
+        return self._raw_data is not None
+
+    def bgra_view(self) -> Optional[memoryview]:
+        """
+        原始位图像素的只读视图，不复制数据
+
+        每像素 4 字节，顺序为 B, G, R, X（第 4 字节为填充，不是有效的 alpha），
+        行宽 info.width * 4，自上而下排列；没有原始位图时返回 None。
+        """
+        if self.bitmap is None:
+            return None
+        return memoryview(self.bitmap).toreadonly()
+
+
+# ====================== 内存缓存 ======================
+
+def estimate_icon_bytes(icon: ExtractedIcon) -> int:
+    """估算缓存一个 ExtractedIcon 占用的内存（PIL 像素数据 + 原始位图 + 已编码的字节）"""
+    # 只统计已经存在的数据，不为估算而触发 PNG 编码
+    total = (len(icon.raw_data) if icon.has_raw_data else 0) + len(icon.bitmap or b'')
+    image = icon.image
+    if image is not None:
+        try:
+            width, height = image.size
+            total += width * height * len(image.getbands())
+        except Exception:
+            pass
+    return total + 256  # 对象本身的开销
+
+
+class IconMemoryCache:
+    """
+    按总字节数限制的 LRU 图标缓存
+
+    - OrderedDict 实现，命中 move_to_end、淘汰 popitem，均为 O(1)
+    - 线程安全，可在多个提取器（以及多个线程）之间共享
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_entries: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._items: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (icon, 字节数)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[ExtractedIcon]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: str, icon: ExtractedIcon) -> None:
+        size = estimate_icon_bytes(icon)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                # 单个图标超过总预算时不缓存
+                return
+            self._items[key] = (icon, size)
+            self._bytes += size
+            while self._items and (self._bytes > self.max_bytes
+                                   or (self.max_entries is not None and len(self._items) > self.max_entries)):
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._items),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
 
 
 # ====================== 核心类 ======================
@@ -100,13 +229,16 @@ class WindowsIconExtractor:
     - 内置图标缓存机制
     """
     
-    def __init__(self, enable_cache: bool = True, cache_size: int = 50):
+    def __init__(self, enable_cache: bool = True, cache_size: Optional[int] = None,
+                 cache_bytes: int = 16 * 1024 * 1024, cache: Optional[IconMemoryCache] = None):
         """
         初始化图标提取器
         
         Args:
             enable_cache: 是否启用图标缓存
-            cache_size: 缓存大小（最大条目数）
+            cache_size: 缓存最大条目数（可选，默认只按字节数限制）
+            cache_bytes: 缓存总字节数上限
+            cache: 共享的缓存实例（传入时忽略 cache_size / cache_bytes）
         """
         # 不在这里强制抛出 ImportError，延迟报错以避免模块导入失败
         self._missing_dependencies = []
@@ -120,9 +252,7 @@ class WindowsIconExtractor:
             self._dep_error = None
          
         self._cache_enabled = enable_cache
-        self._icon_cache = {}  # 图标缓存字典
-        self._max_cache_size = cache_size
-        self._cache_keys = []  # 用于LRU缓存实现
+        self._icon_cache = cache if cache is not None else IconMemoryCache(cache_bytes, cache_size)
         
         # 系统路径
         self._system_paths = {
@@ -163,11 +293,10 @@ class WindowsIconExtractor:
         
         # 检查缓存
         cache_key = self._make_cache_key(source, size, icon_index)
-        if self._cache_enabled and cache_key in self._icon_cache:
-            # 优化：实现LRU缓存，将使用的缓存项移到最前面
-            self._cache_keys.remove(cache_key)
-            self._cache_keys.append(cache_key)
-            return self._icon_cache[cache_key]
+        if self._cache_enabled:
+            cached = self._icon_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         # 判断源类型并分发
         if isinstance(source, int) or str(source).isdigit():
@@ -196,7 +325,6 @@ class WindowsIconExtractor:
                 else:
                     result = ExtractedIcon(
                         image=None,
-                        raw_data=b'',
                         info=IconInfo(source_path, icon_index, size, size, 32, 'Unknown', 0),
                         success=False,
                         error=f"无法识别的图标源: {source_path}"
@@ -204,7 +332,6 @@ class WindowsIconExtractor:
         else:
             result = ExtractedIcon(
                 image=None,
-                raw_data=b'',
                 info=IconInfo(str(source), icon_index, size, size, 32, 'Unknown', 0),
                 success=False,
                 error="不支持的图标源类型"
@@ -302,7 +429,6 @@ class WindowsIconExtractor:
         
         return ExtractedIcon(
             image=None,
-            raw_data=b'',
             info=IconInfo(app_id, 0, size, size, 32, 'Unknown', 0),
             success=False,
             error=f"未找到UWP应用: {app_id}"
@@ -367,6 +493,9 @@ class WindowsIconExtractor:
             
             if isinstance(format, IconFormat):
                 format = format.name
+            if format.upper() == 'PNG':
+                # 复用（并记住）ExtractedIcon 的 PNG 编码结果
+                return extracted_icon.raw_data
             
             save_kwargs = {'format': format}
             extracted_icon.image.save(buffer, **save_kwargs)
@@ -398,6 +527,7 @@ class WindowsIconExtractor:
                 # 尝试提取图标
                 result = self._extract_file_icon(file_path, 32, index)
                 if result.success:
+                    result.size_bytes  # 列表需要完整信息，在此填充 info.size_bytes
                     icons.append(result.info)
                     index += 1
                 else:
@@ -410,6 +540,14 @@ class WindowsIconExtractor:
     def clear_cache(self) -> None:
         """清除图标缓存"""
         self._icon_cache.clear()
+
+    @property
+    def cache(self) -> IconMemoryCache:
+        return self._icon_cache
+
+    def cache_stats(self) -> Dict[str, int]:
+        """缓存命中/淘汰统计"""
+        return self._icon_cache.stats()
     
     # ====================== 私有方法 ======================
     
@@ -418,21 +556,9 @@ class WindowsIconExtractor:
         return f"{str(source)}|{size}|{index}"
     
     def _add_to_cache(self, key: str, icon: ExtractedIcon) -> None:
-        """添加图标到缓存，实现LRU机制"""
+        """添加图标到缓存（按字节数淘汰最久未使用的项）"""
         if self._cache_enabled:
-            # 如果缓存已满，移除最旧的项
-            if len(self._icon_cache) >= self._max_cache_size and key not in self._icon_cache:
-                oldest_key = self._cache_keys.pop(0)
-                if oldest_key in self._icon_cache:
-                    del self._icon_cache[oldest_key]
-            
-            # 存储新结果
-            self._icon_cache[key] = icon
-            
-            # 更新缓存键列表
-            if key in self._cache_keys:
-                self._cache_keys.remove(key)
-            self._cache_keys.append(key)
+            self._icon_cache.put(key, icon)
     
     def _extract_file_icon(self, 
                            file_path: str, 
@@ -443,7 +569,6 @@ class WindowsIconExtractor:
         if not ok:
             return ExtractedIcon(
                 image=None,
-                raw_data=b'',
                 info=IconInfo(file_path, icon_index, size, size, 32, 'Unknown', 0),
                 success=False,
                 error=err
@@ -461,7 +586,6 @@ class WindowsIconExtractor:
             if not large_icons and not small_icons:
                 return ExtractedIcon(
                     image=None,
-                    raw_data=b'',
                     info=IconInfo(file_path, icon_index, size, size, 32, 'Unknown', 0),
                     success=False,
                     error="未找到图标"
@@ -471,7 +595,8 @@ class WindowsIconExtractor:
             hicon = large_icons[0] if large_icons else small_icons[0]
             
             # 转换为PIL图像
-            image = self._hicon_to_pil(hicon, size)
+            bitmap, width, height = self._render_hicon(hicon, size)
+            image = self._bitmap_to_pil(bitmap, width, height)
             
             # 获取图标信息
             icon_info = win32gui.GetIconInfo(hicon)
@@ -489,13 +614,12 @@ class WindowsIconExtractor:
                 width=size,
                 height=size,
                 bits_per_pixel=32,  # 假设32位
-                format='ICO',
-                size_bytes=len(self._pil_to_bytes(image, 'PNG'))
+                format='ICO'
             )
             
             return ExtractedIcon(
                 image=image,
-                raw_data=self._pil_to_bytes(image, 'PNG'),
+                bitmap=bitmap,
                 info=info,
                 success=True
             )
@@ -503,7 +627,6 @@ class WindowsIconExtractor:
         except Exception as e:
             return ExtractedIcon(
                 image=None,
-                raw_data=b'',
                 info=IconInfo(file_path, icon_index, size, size, 32, 'Unknown', 0),
                 success=False,
                 error=f"提取图标失败: {e}"
@@ -522,14 +645,14 @@ class WindowsIconExtractor:
             if not hicon:
                 return ExtractedIcon(
                     image=None,
-                    raw_data=b'',
                     info=IconInfo(f"SystemIcon:{icon_id}", 0, size, size, 32, 'Unknown', 0),
                     success=False,
                     error="未找到系统图标"
                 )
             
             # 转换为PIL图像
-            image = self._hicon_to_pil(hicon, size)
+            bitmap, width, height = self._render_hicon(hicon, size)
+            image = self._bitmap_to_pil(bitmap, width, height)
             
             # 创建图标信息
             info = IconInfo(
@@ -538,13 +661,12 @@ class WindowsIconExtractor:
                 width=size,
                 height=size,
                 bits_per_pixel=32,
-                format='ICO',
-                size_bytes=len(self._pil_to_bytes(image, 'PNG'))
+                format='ICO'
             )
             
             return ExtractedIcon(
                 image=image,
-                raw_data=self._pil_to_bytes(image, 'PNG'),
+                bitmap=bitmap,
                 info=info,
                 success=True
             )
@@ -552,7 +674,6 @@ class WindowsIconExtractor:
         except Exception as e:
             return ExtractedIcon(
                 image=None,
-                raw_data=b'',
                 info=IconInfo(f"SystemIcon:{icon_id}", 0, size, size, 32, 'Unknown', 0),
                 success=False,
                 error=f"提取系统图标失败: {e}"
@@ -607,7 +728,6 @@ class WindowsIconExtractor:
         except Exception as e:
             return ExtractedIcon(
                 image=None,
-                raw_data=b'',
                 info=IconInfo(extension, 0, size, size, 32, 'Unknown', 0),
                 success=False,
                 error=f"提取扩展名图标失败: {e}"
@@ -632,7 +752,6 @@ class WindowsIconExtractor:
         except Exception as e:
             return ExtractedIcon(
                 image=None,
-                raw_data=b'',
                 info=IconInfo(shortcut_path, 0, size, size, 32, 'Unknown', 0),
                 success=False,
                 error=f"提取快捷方式图标失败: {e}"
@@ -677,7 +796,8 @@ class WindowsIconExtractor:
             
             if result and shfi.hIcon:
                 # 转换为PIL图像
-                image = self._hicon_to_pil(shfi.hIcon, size)
+                bitmap, width, height = self._render_hicon(shfi.hIcon, size)
+                image = self._bitmap_to_pil(bitmap, width, height)
                 
                 info = IconInfo(
                     path=folder_clsid,
@@ -685,20 +805,18 @@ class WindowsIconExtractor:
                     width=size,
                     height=size,
                     bits_per_pixel=32,
-                    format='ICO',
-                    size_bytes=len(self._pil_to_bytes(image, 'PNG'))
+                    format='ICO'
                 )
                 
                 return ExtractedIcon(
                     image=image,
-                    raw_data=self._pil_to_bytes(image, 'PNG'),
+                    bitmap=bitmap,
                     info=info,
                     success=True
                 )
             else:
                 return ExtractedIcon(
                     image=None,
-                    raw_data=b'',
                     info=IconInfo(folder_clsid, 0, size, size, 32, 'Unknown', 0),
                     success=False,
                     error="无法获取特殊文件夹图标"
@@ -707,7 +825,6 @@ class WindowsIconExtractor:
         except Exception as e:
             return ExtractedIcon(
                 image=None,
-                raw_data=b'',
                 info=IconInfo(folder_clsid, 0, size, size, 32, 'Unknown', 0),
                 success=False,
                 error=f"提取特殊文件夹图标失败: {e}"
@@ -715,37 +832,51 @@ class WindowsIconExtractor:
     
     def _hicon_to_pil(self, hicon, size: int) -> 'Image.Image':
         """将图标句柄转换为PIL图像"""
+        return self._bitmap_to_pil(*self._render_hicon(hicon, size))
+
+    def _bitmap_to_pil(self, bitmap: bytes, width: int, height: int) -> 'Image.Image':
+        """由 GDI 位图像素（BGRX）构造 PIL 图像"""
+        return Image.frombuffer('RGB', (width, height), bitmap, 'raw', 'BGRX', 0, 1)
+
+    def _render_hicon(self, hicon, size: int):
+        """将图标绘制到位图，返回 (BGRX 像素字节, 宽, 高)"""
         ok, err = self._check_deps()
         if not ok:
             raise RuntimeError(err)
-        # 创建内存DC
-        hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
-        hbmp = win32ui.CreateBitmap()
-        hbmp.CreateCompatibleBitmap(hdc, size, size)
-        hdc = hdc.CreateCompatibleDC()
-        hdc.SelectObject(hbmp)
-        
-        # 绘制图标
-        hdc.FillSolidRect((0, 0, size, size), 0xFFFFFF)  # 白色背景
-        win32gui.DrawIconEx(
-            hdc.GetHandleOutput(), 
-            0, 0, hicon, 
-            size, size, 
-            0, None, 
-            win32con.DI_NORMAL
-        )
-        
-        # 转换为PIL Image
-        bmpinfo = hbmp.GetInfo()
-        bmpstr = hbmp.GetBitmapBits(True)
-        
-        image = Image.frombuffer(
-            'RGB',
-            (bmpinfo['bmWidth'], bmpinfo['bmHeight']),
-            bmpstr, 'raw', 'BGRX', 0, 1
-        )
-        
-        return image
+        # 创建内存DC（全部 GDI 对象在 finally 中释放，避免长时间运行后句柄泄漏）
+        screen_hdc = win32gui.GetDC(0)
+        screen_dc = mem_dc = hbmp = None
+        try:
+            screen_dc = win32ui.CreateDCFromHandle(screen_hdc)
+            hbmp = win32ui.CreateBitmap()
+            hbmp.CreateCompatibleBitmap(screen_dc, size, size)
+            mem_dc = screen_dc.CreateCompatibleDC()
+            old_bmp = mem_dc.SelectObject(hbmp)
+            
+            # 绘制图标
+            mem_dc.FillSolidRect((0, 0, size, size), 0xFFFFFF)  # 白色背景
+            win32gui.DrawIconEx(
+                mem_dc.GetHandleOutput(), 
+                0, 0, hicon, 
+                size, size, 
+                0, None, 
+                win32con.DI_NORMAL
+            )
+            mem_dc.SelectObject(old_bmp)
+            
+            # 读取位图像素
+            bmpinfo = hbmp.GetInfo()
+            bmpstr = hbmp.GetBitmapBits(True)
+            
+            return bmpstr, bmpinfo['bmWidth'], bmpinfo['bmHeight']
+        finally:
+            if mem_dc is not None:
+                mem_dc.DeleteDC()
+            if hbmp is not None:
+                win32gui.DeleteObject(hbmp.GetHandle())
+            if screen_dc is not None:
+                screen_dc.Detach()
+            win32gui.ReleaseDC(0, screen_hdc)
     
     def _pil_to_bytes(self, image: 'Image.Image', format: str = 'PNG') -> bytes:
         """将PIL图像转换为字节数据"""
@@ -755,84 +886,22 @@ class WindowsIconExtractor:
         return buffer.getvalue()
     
     def _get_uwp_app_info(self, app_id: str) -> Optional[Dict]:
-        """获取UWP应用信息（简化实现）"""
-        # 注意：完整的UWP应用枚举需要复杂的Windows API调用
-        # 这里提供简化实现
+        """
+        获取UWP应用信息
+
+        查询进程内共享的 UWP 索引（core.uwp_index），不再每次遍历 Families 注册表树
+        """
         try:
-            import winreg
-            
-            # 在注册表中查找UWP应用
-            uwp_key = r"SOFTWARE\Classes\Local Settings\Software\Microsoft\Windows\CurrentVersion\AppModel\Repository\Families"
-            
-            try:
-                key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, uwp_key)
-            except:
+            from .uwp_index import get_shared_index
+
+            index = get_shared_index()
+            package = index.find(app_id) if index is not None else None
+            if package is None:
                 return None
-            
-            app_info = {}
-            
-            # 遍历应用包
-            for i in range(winreg.QueryInfoKey(key)[0]):
-                try:
-                    family_name = winreg.EnumKey(key, i)
-                    family_key = winreg.OpenKey(key, family_name)
-                    
-                    # 检查是否匹配app_id
-                    if app_id.lower() in family_name.lower():
-                        # 获取包信息
-                        try:
-                            package_key = winreg.OpenKey(family_key, "Packages")
-                            
-                            for j in range(winreg.QueryInfoKey(package_key)[0]):
-                                package_name = winreg.EnumKey(package_key, j)
-                                if app_id.lower() in package_name.lower():
-                                    # 找到匹配的包
-                                    app_info['name'] = package_name
-                                    
-                                    # 尝试获取资源路径
-                                    resource_key_path = f"{uwp_key}\\{family_name}\\Packages\\{package_name}\\Resources"
-                                    try:
-                                        resource_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, resource_key_path)
-                                        
-                                        # 查找Logo文件
-                                        for k in range(winreg.QueryInfoKey(resource_key)[1]):
-                                            try:
-                                                name, value, _ = winreg.EnumValue(resource_key, k)
-                                                if 'logo' in name.lower() and value:
-                                                    # 构建完整路径
-                                                    base_path = os.path.join(
-                                                        os.environ.get('ProgramFiles', 'C:\\Program Files'),
-                                                        'WindowsApps',
-                                                        package_name
-                                                    )
-                                                    logo_path = os.path.join(base_path, value)
-                                                    if os.path.exists(logo_path):
-                                                        app_info['logo'] = logo_path
-                                                        break
-                                            except:
-                                                continue
-                                        
-                                        winreg.CloseKey(resource_key)
-                                    except:
-                                        pass
-                                    
-                                    break
-                            
-                            winreg.CloseKey(package_key)
-                        except:
-                            pass
-                    
-                    winreg.CloseKey(family_key)
-                    
-                    if app_info:
-                        break
-                        
-                except:
-                    continue
-            
-            winreg.CloseKey(key)
-            return app_info if app_info else None
-            
+            app_info = {'name': package.package}
+            if package.logo:
+                app_info['logo'] = package.logo
+            return app_info
         except Exception:
             return None
 
@@ -876,6 +945,20 @@ class SystemIcons:
     USERS = 109            # 用户文件夹
 
 
+_shared_extractor: Optional[WindowsIconExtractor] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_extractor() -> WindowsIconExtractor:
+    """进程内共享的提取器（及其内存缓存），便捷函数与 ProcessManager 均使用它"""
+    global _shared_extractor
+    if _shared_extractor is None:
+        with _shared_lock:
+            if _shared_extractor is None:
+                _shared_extractor = WindowsIconExtractor()
+    return _shared_extractor
+
+
 def extract_icon(source: Union[str, Path, int], 
                 size: Union[int, IconSize] = IconSize.LARGE,
                 icon_index: int = 0) -> ExtractedIcon:
@@ -890,8 +973,7 @@ def extract_icon(source: Union[str, Path, int],
     Returns:
         ExtractedIcon: 提取的图标数据
     """
-    extractor = WindowsIconExtractor()
-    return extractor.extract_icon(source, size, icon_index)
+    return get_shared_extractor().extract_icon(source, size, icon_index)
 
 
 def get_file_icon(file_path: Union[str, Path], 
@@ -906,8 +988,7 @@ def get_file_icon(file_path: Union[str, Path],
     Returns:
         ExtractedIcon: 提取的图标数据
     """
-    extractor = WindowsIconExtractor()
-    return extractor.extract_file_icon(file_path, size)
+    return get_shared_extractor().extract_file_icon(file_path, size)
 
 
 def get_system_icon(icon_id: int, 
@@ -922,8 +1003,7 @@ def get_system_icon(icon_id: int,
     Returns:
         ExtractedIcon: 提取的图标数据
     """
-    extractor = WindowsIconExtractor()
-    return extractor.extract_system_icon(icon_id, size)
+    return get_shared_extractor().extract_system_icon(icon_id, size)
 
 
 def save_icon_to_file(extracted_icon: ExtractedIcon, 
@@ -940,8 +1020,7 @@ def save_icon_to_file(extracted_icon: ExtractedIcon,
     Returns:
         bool: 是否保存成功
     """
-    extractor = WindowsIconExtractor()
-    return extractor.save_icon(extracted_icon, save_path, format)
+    return get_shared_extractor().save_icon(extracted_icon, save_path, format)
 
 
 # ====================== 高级功能 ======================
@@ -7,6 +7,13 @@ log = log_maker.logger()
 DEFAULT_CONFIG = {
   "dock":{
     "apps": [],
+    "monitor_min_interval": 1000,
+    "monitor_max_interval": 8000,
+    "icon_cache_max_mb": 64,
+    "icon_cache_max_entries": 1000,
+    "icon_extract_isolated": True,
+    "last_running": [],
+    "overflow_mode": True,
     "except_processes": [
       "shellexperiencehost.exe",
       "applicationframehost.exe",
@@ -1,11 +1,13 @@
-from PySide6.QtCore import QObject, Signal
-from PySide6.QtCore import Qt, QTimer, QRect, QEvent, QPoint
-from PySide6.QtGui import QCursor, QFontDatabase
-from PySide6.QtWidgets import (QApplication, QWidget, QPushButton, QHBoxLayout, QVBoxLayout, QDialog, QLabel)
+from PySide6.QtCore import QObject, Signal, Property
+from PySide6.QtCore import Qt, QTimer, QRect, QRectF, QEvent, QPoint
+from PySide6.QtGui import QBrush, QColor, QCursor, QFontDatabase, QIcon, QPainter, QPen
+from PySide6.QtWidgets import (QApplication, QWidget, QPushButton, QHBoxLayout, QVBoxLayout, QGridLayout, QDialog, QLabel)
 import BlurWindow.blurWindow as blurWindow
 import core.log_maker as log_maker
 import core.skills.sys32 as sys32
+from core.dock_reconciler import bind_key
 import os
+import time
 
 # 添加Windows API导入，用于输入法切换
 import win32con
@@ -42,9 +44,255 @@ class IconHoverFilter(QObject):
 			return False
 		return False
 
+class DockButtonTheme:
+	"""
+	DockButton 的配色与尺寸，按 (运行中, 悬停) 预先生成 QPen/QBrush，所有按钮共享
+	"""
+
+	def __init__(self, radius=16, border_width=2,
+				 border_active="#52d1ff", border_inactive="#555555",
+				 bg_active="#008566", bg_inactive="#ECECEC",
+				 bg_hover_active="#00e6eb", bg_hover_inactive="#65E2D2", text="#333333"):
+		self.radius = radius
+		self.border_width = border_width
+		self.text_pen = QPen(QColor(text))
+		active_pen = QPen(QColor(border_active), border_width)
+		inactive_pen = QPen(QColor(border_inactive), border_width)
+		# (running, hovered) -> (pen, brush)，与原样式表一致：悬停时边框统一为高亮色
+		self._tools = {
+			(True, False): (active_pen, QBrush(QColor(bg_active))),
+			(True, True): (active_pen, QBrush(QColor(bg_hover_active))),
+			(False, False): (inactive_pen, QBrush(QColor(bg_inactive))),
+			(False, True): (active_pen, QBrush(QColor(bg_hover_inactive))),
+		}
+
+	def tools(self, running, hovered):
+		return self._tools[(running, hovered)]
+
+
+class DockButton(QPushButton):
+	"""
+	自绘的 Dock 图标按钮
+
+	背景、边框、悬停与运行状态在 paintEvent 中用主题缓存的 QPen/QBrush 绘制，不使用样式表；
+	状态变化只触发一次重绘，状态未变的调用直接返回。
+	"""
+
+	_default_theme = None
+
+	def __init__(self, theme=None, parent=None):
+		super().__init__(parent)
+		if theme is None:
+			if DockButton._default_theme is None:
+				DockButton._default_theme = DockButtonTheme()
+			theme = DockButton._default_theme
+		self._theme = theme
+		self._running = False
+		self._hovered = False
+		# 缓存 (icon.cacheKey, 尺寸, 缩放比, 模式) -> QPixmap，避免每次绘制都向 QIcon 取像素
+		self._pixmap_key = None
+		self._pixmap = None
+		self.setAttribute(Qt.WA_Hover, True)
+
+	def isRunning(self):
+		return self._running
+
+	def setRunning(self, running):
+		"""设置运行状态，返回是否发生变化"""
+		running = bool(running)
+		if running == self._running:
+			return False
+		self._running = running
+		self.update()
+		return True
+
+	running = Property(bool, isRunning, setRunning)
+
+	def isHovered(self):
+		return self._hovered
+
+	def setHovered(self, hovered):
+		hovered = bool(hovered)
+		if hovered == self._hovered:
+			return False
+		self._hovered = hovered
+		self.update()
+		return True
+
+	hovered = Property(bool, isHovered, setHovered)
+
+	def setTheme(self, theme):
+		if theme is not self._theme:
+			self._theme = theme
+			self.update()
+
+	def enterEvent(self, event):
+		self.setHovered(True)
+		super().enterEvent(event)
+
+	def leaveEvent(self, event):
+		self.setHovered(False)
+		super().leaveEvent(event)
+
+	def _icon_pixmap(self):
+		icon = self.icon()
+		if icon.isNull():
+			return None
+		size = self.iconSize()
+		ratio = self.devicePixelRatioF()
+		mode = QIcon.Normal if self.isEnabled() else QIcon.Disabled
+		key = (icon.cacheKey(), size.width(), size.height(), ratio, mode)
+		if key != self._pixmap_key:
+			self._pixmap_key = key
+			self._pixmap = icon.pixmap(size, ratio, mode)
+		return self._pixmap
+
+	def paintEvent(self, event):
+		theme = self._theme
+		pen, brush = theme.tools(self._running, self._hovered)
+		painter = QPainter(self)
+		painter.setRenderHint(QPainter.Antialiasing)
+		half = theme.border_width / 2
+		painter.setPen(pen)
+		painter.setBrush(brush)
+		painter.drawRoundedRect(QRectF(self.rect()).adjusted(half, half, -half, -half), theme.radius, theme.radius)
+
+		pixmap = self._icon_pixmap()
+		if pixmap is not None:
+			size = self.iconSize()
+			x = (self.width() - size.width()) // 2
+			y = (self.height() - size.height()) // 2
+			painter.drawPixmap(QRect(x, y, size.width(), size.height()), pixmap)
+		elif self.text():
+			painter.setPen(theme.text_pen)
+			painter.drawText(self.rect(), Qt.AlignCenter, self.text())
+		painter.end()
+
+
+class OverflowPopup(QWidget):
+	"""
+	Dock 溢出应用的网格弹窗
+
+	按钮在弹窗显示时才由 make_button 创建，关闭后销毁，
+	因此无论有多少溢出的应用，弹窗关闭时都不占用按钮部件。
+	弹窗显示期间更新内容时按 (路径, 名称) 协调网格：仍在溢出的应用保留原按钮并交给 update_button 同步，
+	只创建新增的、销毁移除的按钮，内容未变化时不改动网格。
+	"""
+
+	def __init__(self, make_button, update_button=None, columns=6, spacing=10, radius=18, parent=None):
+		super().__init__(parent)
+		self.setWindowFlags(Qt.Popup | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+		self.setAttribute(Qt.WA_TranslucentBackground, True)
+		self._make_button = make_button
+		self._update_button = update_button
+		self._columns = max(1, columns)
+		self._radius = radius
+		self._items = []
+		self._buttons = []
+		self._keys = []
+		self._grid = QGridLayout(self)
+		self._grid.setContentsMargins(12, 12, 12, 12)
+		self._grid.setSpacing(spacing)
+		self._background = QBrush(QColor("#ECECEC"))
+		self._border = QPen(QColor(0, 0, 0, 30), 1)
+
+	def set_items(self, items):
+		"""更新溢出的应用；弹窗正在显示时立即协调网格"""
+		self._items = list(items)
+		if self.isVisible():
+			if self._items:
+				self._build()
+			else:
+				self.hide()
+
+	def item_count(self):
+		return len(self._items)
+
+	def button_count(self):
+		return len(self._buttons)
+
+	def show_above(self, anchor):
+		"""在锚点部件上方居中显示（超出屏幕时调整到屏幕内）"""
+		if not self._items:
+			return
+		self._build()
+		self.adjustSize()
+		offset = 8
+		top_left = anchor.mapToGlobal(QPoint(0, 0))
+		x = top_left.x() + anchor.width() // 2 - self.width() // 2
+		y = top_left.y() - self.height() - offset
+		screen_rect = QApplication.primaryScreen().availableGeometry()
+		x = max(screen_rect.left(), min(x, screen_rect.right() - self.width()))
+		y = max(screen_rect.top(), y)
+		self.move(x, y)
+		self.show()
+
+	def _build(self):
+		spare = {}
+		for key, button in zip(self._keys, self._buttons):
+			spare.setdefault(key, []).append(button)
+		buttons = []
+		keys = []
+		for item in self._items:
+			key = bind_key(item)
+			candidates = spare.get(key)
+			if candidates:
+				button = candidates.pop(0)
+				if self._update_button is not None:
+					self._update_button(button, item)
+			else:
+				button = self._make_button(item)
+				button.clicked.connect(self.hide)
+			buttons.append(button)
+			keys.append(key)
+		for rest in spare.values():
+			for button in rest:
+				self._dispose(button)
+		if keys != self._keys:
+			for button in buttons:
+				self._grid.removeWidget(button)
+			for i, button in enumerate(buttons):
+				self._grid.addWidget(button, i // self._columns, i % self._columns)
+			self.adjustSize()
+		self._buttons = buttons
+		self._keys = keys
+
+	def _dispose(self, button):
+		self._grid.removeWidget(button)
+		button.hide()
+		button.deleteLater()
+
+	def _clear(self):
+		for button in self._buttons:
+			self._dispose(button)
+		self._buttons = []
+		self._keys = []
+
+	def hideEvent(self, event):
+		self._clear()
+		super().hideEvent(event)
+
+	def paintEvent(self, event):
+		painter = QPainter(self)
+		painter.setRenderHint(QPainter.Antialiasing)
+		painter.setPen(self._border)
+		painter.setBrush(self._background)
+		painter.drawRoundedRect(QRectF(self.rect()).adjusted(0.5, 0.5, -0.5, -0.5), self._radius, self._radius)
+		painter.end()
+
 # 自定义弹出菜单（避免被 Dock 遮挡）
 class ContextPopup(QWidget):
-	def __init__(self, actions, parent=None):
+	"""
+	自定义弹出菜单
+
+	可以每次新建（传入 actions），也可以预先创建一个实例并调用 prepare() 提前创建窗口句柄、应用模糊效果，
+	之后每次通过 set_actions() 替换菜单项后复用；菜单按钮按需增加并复用，不会重新创建窗口。
+	show_at_position(..., started=时间戳) 会在首次绘制时记录从点击到可见的耗时。
+	"""
+
+	LATENCY_SAMPLES = 100
+
+	def __init__(self, actions=(), parent=None):
 		super().__init__(parent)
 		flags = Qt.Popup | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint
 		self.setWindowFlags(flags)
@@ -58,16 +306,16 @@ class ContextPopup(QWidget):
 		layout.setSpacing(4)
 		# 滚动区域
 		from PySide6.QtWidgets import QScrollArea, QFrame
-		scroll_area = QScrollArea()
-		scroll_area.setWidgetResizable(True)
-		scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-		scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-		scroll_area.setFrameStyle(QFrame.NoFrame)
+		self._scroll_area = QScrollArea()
+		self._scroll_area.setWidgetResizable(True)
+		self._scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+		self._scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+		self._scroll_area.setFrameStyle(QFrame.NoFrame)
 		# 内容容器
-		content_widget = QWidget()
-		content_layout = QVBoxLayout(content_widget)
-		content_layout.setContentsMargins(0, 0, 0, 0)
-		content_layout.setSpacing(2)
+		self._content_widget = QWidget()
+		self._content_layout = QVBoxLayout(self._content_widget)
+		self._content_layout.setContentsMargins(0, 0, 0, 0)
+		self._content_layout.setSpacing(2)
 		# 样式（不透明背景）
 		self.setStyleSheet("""
 			QWidget { 
@@ -96,6 +344,28 @@ class ContextPopup(QWidget):
 			}
 		""")
 
+		self._scroll_area.setWidget(self._content_widget)
+		layout.addWidget(self._scroll_area)
+
+		self._buttons = []
+		self._callbacks = []
+		self._blurred = False
+		self._latency_started = None
+		self.latencies = []
+		self.set_actions(actions)
+
+		if actions:
+			# 添加窗口模糊效果（延迟确保窗口句柄有效）
+			QTimer.singleShot(100, self.apply_blur_effect)
+
+	def prepare(self):
+		"""提前创建窗口句柄并应用模糊效果，供复用的实例在首次显示前调用"""
+		self.winId()
+		self.apply_blur_effect()
+
+	def set_actions(self, actions):
+		"""替换菜单项：复用已有按钮，只在数量不足时新建"""
+		actions = list(actions)
 		# 测量最长文本以决定宽度
 		from PySide6.QtGui import QFontMetrics
 		fm = QFontMetrics(self.font())
@@ -106,25 +376,23 @@ class ContextPopup(QWidget):
 				max_label_w = w
 		# 左右内边距 + 按钮内边距估算，最小200，最大420
 		content_w = min(420, max(200, max_label_w + 60))
-		# 动态创建按钮
 		item_h = max(36, int(fm.height() * 1.6))
-		for label, callback, enabled in actions:
-			btn = QPushButton(label, self)
-			btn.setEnabled(enabled)
-			def make_handler(cb):
-				def handler():
-					try:
-						self.close()
-					except:
-						pass
-					if cb:
-						QTimer.singleShot(0, cb)
-				return handler
-			btn.clicked.connect(make_handler(callback))
-			content_layout.addWidget(btn)
-
-		scroll_area.setWidget(content_widget)
-		layout.addWidget(scroll_area)
+
+		while len(self._buttons) < len(actions):
+			btn = QPushButton(self._content_widget)
+			index = len(self._buttons)
+			btn.clicked.connect(lambda checked=False, i=index: self._on_action(i))
+			self._content_layout.addWidget(btn)
+			self._buttons.append(btn)
+		self._callbacks = [callback for _, callback, _ in actions]
+		for i, btn in enumerate(self._buttons):
+			if i < len(actions):
+				label, _, enabled = actions[i]
+				btn.setText(label)
+				btn.setEnabled(enabled)
+				btn.setVisible(True)
+			else:
+				btn.setVisible(False)
 
 		# 计算合适高度（不超过屏幕60%）并固定弹出菜单与滚动区域大小
 		screen_rect = QApplication.primaryScreen().availableGeometry()
@@ -132,22 +400,53 @@ class ContextPopup(QWidget):
 		content_h = min(max_h, len(actions) * (item_h + 2) + 12)
 		# 设置固定尺寸
 		self.setFixedSize(content_w, content_h)
-		scroll_area.setFixedSize(content_w - 12, content_h - 12)
-		content_widget.setFixedWidth(content_w - 12)
-		
-		# 添加窗口模糊效果（延迟确保窗口句柄有效）
-		QTimer.singleShot(100, self.apply_blur_effect)
+		self._scroll_area.setFixedSize(content_w - 12, content_h - 12)
+		self._content_widget.setFixedWidth(content_w - 12)
+
+	def _on_action(self, index):
+		callback = self._callbacks[index] if index < len(self._callbacks) else None
+		try:
+			self.close()
+		except:
+			pass
+		if callback:
+			QTimer.singleShot(0, callback)
 
 	def apply_blur_effect(self):
-		"""应用窗口模糊效果"""
+		"""应用窗口模糊效果（同一窗口只应用一次）"""
+		if self._blurred:
+			return
 		try:
 			# 使用GlobalBlur函数为窗口添加模糊效果
 			blurWindow.blur(self.winId(), hexColor=False, Dark=False)
+			self._blurred = True
 		except Exception as e:
 			pass  # 静默失败，不影响菜单功能
 
+	def paintEvent(self, event):
+		super().paintEvent(event)
+		if self._latency_started is not None:
+			elapsed = (time.perf_counter() - self._latency_started) * 1000
+			self._latency_started = None
+			self.latencies.append(elapsed)
+			del self.latencies[:-self.LATENCY_SAMPLES]
+			log.debug(f"右键菜单从点击到可见: {elapsed:.1f} ms")
+
+	def latency_stats(self):
+		"""最近若干次从点击到可见的耗时（毫秒）"""
+		samples = self.latencies
+		if not samples:
+			return {'count': 0}
+		return {
+			'count': len(samples),
+			'last_ms': samples[-1],
+			'avg_ms': sum(samples) / len(samples),
+			'max_ms': max(samples),
+		}
+
 	# 重写显示位置方法：始终优先在图标上方显示菜单，并确保显示所有选项
-	def show_at_position(self, pos, sender):
+	def show_at_position(self, pos, sender, started=None):
+		self._latency_started = started
 		offset = 8  # 图标与菜单的垂直间距
 		if sender is not None:
 			try:
@@ -0,0 +1,220 @@
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PySide6.QtWidgets import QBoxLayout, QWidget
+
+from .window_snapshot import normalize_path
+
+AppData = Dict[str, Any]
+
+
+@dataclass
+class ReconcileResult:
+    """一次协调中各类操作的数量"""
+    created: int = 0
+    removed: int = 0
+    moved: int = 0
+    rebound: int = 0   # 复用的按钮中，应用字典被替换（uid 变化）而按路径和名称重新绑定的数量
+    kept: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.removed or self.moved or self.rebound)
+
+
+def bind_key(app: AppData) -> Tuple[str, str]:
+    """uid 不匹配时用于复用按钮的次级键"""
+    return normalize_path(app.get('path', '')), app.get('name', '')
+
+
+class SectionReconciler:
+    """
+    按 uid 协调一个分区的按钮与应用列表
+
+    - 按钮通过 _bound_uid / _bound_app 绑定应用（由 create 负责设置）
+    - uid 相同的按钮原样保留，只调用 update 同步名称、图标、运行状态等差异
+    - 分区被整体替换（新字典、新 uid）时，按 (路径, 名称) 复用旧按钮并重新绑定
+    - 只对新增的应用创建按钮、只删除消失的应用的按钮，位置不对的按钮才移动
+
+    create(app) -> QWidget：创建并绑定新按钮（不加入布局）
+    update(widget, app)：保留或重新绑定的按钮与应用同步
+    dispose(widget)：按钮已从布局移除，负责销毁
+    """
+
+    def __init__(self, create: Callable[[AppData], QWidget],
+                 update: Callable[[QWidget, AppData], None],
+                 dispose: Callable[[QWidget], None]):
+        self._create = create
+        self._update = update
+        self._dispose = dispose
+
+    def reconcile(self, layout: QBoxLayout, apps: List[AppData]) -> ReconcileResult:
+        result = ReconcileResult()
+        current: List[QWidget] = []
+        for i in range(layout.count()):
+            widget = layout.itemAt(i).widget()
+            if widget is not None:
+                current.append(widget)
+
+        by_uid: Dict[Any, QWidget] = {}
+        for widget in current:
+            uid = getattr(widget, '_bound_uid', None)
+            if uid and uid not in by_uid:
+                by_uid[uid] = widget
+
+        # 第一轮：按 uid 匹配
+        matched: List[Optional[QWidget]] = []
+        used = set()
+        for app in apps:
+            widget = by_uid.get(app.get('_uid'))
+            if widget is not None and id(widget) not in used:
+                used.add(id(widget))
+                matched.append(widget)
+            else:
+                matched.append(None)
+
+        # 第二轮：剩余的按钮按 (路径, 名称) 复用
+        spare: Dict[Tuple[str, str], List[QWidget]] = {}
+        for widget in current:
+            if id(widget) in used:
+                continue
+            app = getattr(widget, '_bound_app', None)
+            if app is not None:
+                spare.setdefault(bind_key(app), []).append(widget)
+        for i, app in enumerate(apps):
+            if matched[i] is not None:
+                continue
+            candidates = spare.get(bind_key(app))
+            if candidates:
+                widget = candidates.pop(0)
+                used.add(id(widget))
+                matched[i] = widget
+                result.rebound += 1
+
+        for widget in current:
+            if id(widget) not in used:
+                layout.removeWidget(widget)
+                self._dispose(widget)
+                result.removed += 1
+
+        for i, (app, widget) in enumerate(zip(apps, matched)):
+            if widget is None:
+                widget = self._create(app)
+                layout.insertWidget(i, widget)
+                result.created += 1
+                continue
+            self._update(widget, app)
+            if layout.indexOf(widget) != i:
+                layout.removeWidget(widget)
+                layout.insertWidget(i, widget)
+                result.moved += 1
+            else:
+                result.kept += 1
+        return result
+
+
+# ====================== 基准测试 ======================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.dock_reconciler",
+                                     description="分区按钮：整体重建与按 uid 协调的开销对比（offscreen）")
+    parser.add_argument('--apps', type=int, default=25, help="分区中的应用数")
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    import os
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtCore import QObject, QSize, Qt
+    from PySide6.QtGui import QColor, QIcon, QPixmap
+    from PySide6.QtWidgets import QApplication, QHBoxLayout, QPushButton
+
+    app = QApplication.instance() or QApplication([])
+    host = QWidget()
+    layout = QHBoxLayout(host)
+    hover_filter = QObject()
+    pixmap = QPixmap(48, 48)
+    pixmap.fill(QColor(80, 140, 220))
+    icon = QIcon(pixmap)
+    style = "QPushButton { background-color: rgba(255, 255, 255, 40); border-radius: 10px; }"
+
+    def create(app_data):
+        # 与 dock 中的按钮相同的初始化步骤
+        button = QPushButton()
+        button.setFixedSize(60, 60)
+        button.setMouseTracking(True)
+        button._bound_uid = app_data['_uid']
+        button._bound_app = app_data
+        button.setIcon(icon)
+        button.setIconSize(QSize(48, 48))
+        button.setStyleSheet(style)
+        button.clicked.connect(lambda checked, btn=button: btn._bound_app)
+        button.setContextMenuPolicy(Qt.CustomContextMenu)
+        button.customContextMenuRequested.connect(lambda pos, btn=button: btn._bound_app)
+        button.setToolTip(app_data['name'])
+        button.setAttribute(Qt.WA_Hover, True)
+        button.installEventFilter(hover_filter)
+        return button
+
+    def update(button, app_data):
+        button._bound_uid = app_data['_uid']
+        button._bound_app = app_data
+        if button.toolTip() != app_data['name']:
+            button.setToolTip(app_data['name'])
+
+    def dispose(button):
+        button.hide()
+        button.setParent(None)
+        button.deleteLater()
+
+    uid_counter = [0]
+
+    def make_app(i):
+        uid_counter[0] += 1
+        return {'name': f"app{i}", 'path': f"C:/Apps/app{i}.exe", '_uid': uid_counter[0]}
+
+    def rebuild(apps):
+        for i in reversed(range(layout.count())):
+            widget = layout.itemAt(i).widget()
+            layout.removeWidget(widget)
+            dispose(widget)
+        for app_data in apps:
+            layout.addWidget(create(app_data))
+
+    reconciler = SectionReconciler(create, update, dispose)
+    base = [make_app(i) for i in range(args.apps - 1)]
+
+    def changes():
+        # 交替进行：末尾新增一个应用（启动）、移除该应用（退出）
+        extra = make_app(args.apps)
+        return [base + [extra], list(base)]
+
+    def bench(apply) -> float:
+        rebuild(base)
+        app.processEvents()
+        total = 0.0
+        for _ in range(args.rounds):
+            for apps in changes():
+                start = time.perf_counter()
+                apply(apps)
+                app.sendPostedEvents(None, 0)  # 计入 deleteLater 的销毁开销
+                total += time.perf_counter() - start
+        return total / (args.rounds * 2) * 1000
+
+    rebuild_ms = bench(rebuild)
+    reconcile_ms = bench(lambda apps: reconciler.reconcile(layout, apps))
+
+    start_apps = base + [make_app(args.apps)]
+    rebuild(base)
+    stats = reconciler.reconcile(layout, start_apps)
+    print(f"分区 {args.apps} 个应用，每次变化一个应用（{args.rounds * 2} 次）：")
+    print(f"  整体重建: {rebuild_ms:.3f} ms/次（每次创建 {args.apps} 个按钮）")
+    print(f"  按 uid 协调: {reconcile_ms:.3f} ms/次（{stats}）")
+    print(f"  加速: {rebuild_ms / reconcile_ms:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
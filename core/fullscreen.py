@@ -0,0 +1,214 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 可选依赖（非Windows环境下仅可使用 FakeMonitorProvider）
+try:
+    import win32api
+    PYWIN32_AVAILABLE = True
+except ImportError:
+    PYWIN32_AVAILABLE = False
+
+from .window_rules import WindowRules
+from .window_snapshot import WindowInfo, WindowSnapshot
+
+Rect = Tuple[int, int, int, int]
+
+
+def rect_covers(rect: Rect, monitor: Rect) -> bool:
+    """窗口矩形是否完整覆盖显示器矩形"""
+    return (rect[0] <= monitor[0] and rect[1] <= monitor[1]
+            and rect[2] >= monitor[2] and rect[3] >= monitor[3])
+
+
+# ====================== 显示器 ======================
+
+class MonitorProvider:
+    """显示器矩形来源接口"""
+
+    def monitors(self) -> List[Rect]:
+        raise NotImplementedError
+
+
+class Win32MonitorProvider(MonitorProvider):
+    """基于 EnumDisplayMonitors 的来源（物理像素，需进程已 DPI 感知）"""
+
+    def __init__(self, fallback: Optional[Rect] = None):
+        if not PYWIN32_AVAILABLE:
+            raise RuntimeError("pywin32 未安装，无法使用 Win32MonitorProvider")
+        self._fallback = fallback
+
+    def monitors(self) -> List[Rect]:
+        rects = []
+        try:
+            for handle, _, _ in win32api.EnumDisplayMonitors(None, None):
+                rects.append(tuple(win32api.GetMonitorInfo(handle)['Monitor']))
+        except Exception:
+            pass
+        if not rects and self._fallback:
+            rects.append(tuple(self._fallback))
+        return rects
+
+
+class FakeMonitorProvider(MonitorProvider):
+    """假来源，用于测试：可随时替换显示器布局"""
+
+    def __init__(self, rects: Sequence[Rect] = ((0, 0, 1920, 1080),)):
+        self.rects = [tuple(r) for r in rects]
+        self.query_count = 0
+
+    def monitors(self) -> List[Rect]:
+        self.query_count += 1
+        return list(self.rects)
+
+
+# ====================== 检测 ======================
+
+class FullscreenDetector:
+    """
+    全屏窗口检测
+
+    只判定前台窗口以及每个显示器上 Z 序最高的、完整覆盖该显示器的非系统窗口，而不是逐个判断全部窗口：
+    - 显示器矩形缓存到 invalidate_monitors() 被调用为止（由显示器变化事件触发）
+    - 每个窗口的判定按 (矩形, 类名, 标题, 进程名) 缓存，窗口移动或变化后才重新判定
+    """
+
+    def __init__(self, monitor_provider: MonitorProvider,
+                 rules: Optional[Callable[[], WindowRules]] = None,
+                 own_pid: Optional[int] = None):
+        self._provider = monitor_provider
+        default_rules = WindowRules()
+        # 规则可能被热更新，每次判定时取当前规则
+        self._rules = rules if rules is not None else (lambda: default_rules)
+        self._own_pid = os.getpid() if own_pid is None else own_pid
+        self._lock = threading.Lock()
+        self._monitors: Optional[List[Rect]] = None
+        self._epoch = 0
+        # hwnd -> (判定键, 是否系统窗口, 覆盖的显示器索引)
+        self._memo: Dict[int, Tuple[Tuple, bool, Tuple[int, ...]]] = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.monitor_refreshes = 0
+
+    # 显示器
+    def invalidate_monitors(self) -> None:
+        """显示器布局变化时调用，下次检测重新获取显示器矩形"""
+        with self._lock:
+            self._monitors = None
+
+    def clear(self) -> None:
+        """清空窗口判定缓存（规则更新后调用）"""
+        with self._lock:
+            self._memo.clear()
+
+    def monitors(self) -> List[Rect]:
+        with self._lock:
+            return list(self._get_monitors())
+
+    def _get_monitors(self) -> List[Rect]:
+        if self._monitors is None:
+            self._monitors = self._provider.monitors()
+            self._epoch += 1
+            self._memo.clear()
+            self.monitor_refreshes += 1
+        return self._monitors
+
+    # 判定
+    def _judge(self, info: WindowInfo) -> Tuple[bool, Tuple[int, ...]]:
+        """返回 (是否系统窗口, 被该窗口完整覆盖的显示器索引)，按窗口状态缓存"""
+        key = (info.rect, info.class_name, info.title, info.process_name, self._epoch)
+        cached = self._memo.get(info.hwnd)
+        if cached is not None and cached[0] == key:
+            self.memo_hits += 1
+            return cached[1], cached[2]
+        self.memo_misses += 1
+        system = self._rules().is_system_window(info)
+        covered = tuple(i for i, monitor in enumerate(self._monitors) if rect_covers(info.rect, monitor))
+        self._memo[info.hwnd] = (key, system, covered)
+        return system, covered
+
+    def is_rect_fullscreen(self, rect: Rect) -> bool:
+        """矩形是否覆盖任意一个显示器"""
+        with self._lock:
+            return any(rect_covers(rect, monitor) for monitor in self._get_monitors())
+
+    def is_fullscreen(self, info: WindowInfo) -> bool:
+        """单个窗口是否为非系统全屏窗口"""
+        with self._lock:
+            self._get_monitors()
+            if not info.visible:
+                return False
+            system, covered = self._judge(info)
+            return not system and bool(covered)
+
+    def fullscreen_windows(self, snapshot: WindowSnapshot, foreground_hwnd: Optional[int] = None,
+                           query: Optional[Callable[[int], Optional[WindowInfo]]] = None) -> List[int]:
+        """
+        返回全屏窗口句柄列表（前台窗口在前）
+
+        snapshot 需按 Z 序从顶到底排列（EnumWindows 顺序）。
+        query 用于实时查询前台窗口（如 WindowBackend.query）：快照中的矩形可能滞后，
+        前台窗口刚进入全屏时以实时状态为准；为空时使用快照中的记录。
+        """
+        foreground = None
+        if foreground_hwnd:
+            if query is not None:
+                try:
+                    foreground = query(foreground_hwnd)
+                except Exception:
+                    foreground = None
+            if foreground is None:
+                foreground = snapshot.get(foreground_hwnd)
+
+        with self._lock:
+            monitors = self._get_monitors()
+            result: List[int] = []
+
+            if foreground is not None and foreground.visible and foreground.pid != self._own_pid:
+                system, covered = self._judge(foreground)
+                if not system and covered:
+                    result.append(foreground.hwnd)
+
+            # 每个显示器找到 Z 序最高的、完整覆盖它的非系统窗口后即确定；
+            # 不覆盖显示器的窗口（工具提示、弹出菜单、普通窗口）不影响判定，所有显示器都已确定后提前结束
+            pending = set(range(len(monitors)))
+            for info in snapshot:
+                if not pending:
+                    break
+                if foreground is not None and info.hwnd == foreground.hwnd:
+                    info = foreground
+                if not info.visible or info.pid == self._own_pid:
+                    continue
+                hits = [i for i in pending if rect_covers(info.rect, monitors[i])]
+                if not hits:
+                    continue
+                system, _ = self._judge(info)
+                if system:
+                    continue
+                pending.difference_update(hits)
+                if info.hwnd not in result:
+                    result.append(info.hwnd)
+
+            self._retain(snapshot)
+            return result
+
+    def has_fullscreen(self, snapshot: WindowSnapshot, foreground_hwnd: Optional[int] = None,
+                       query: Optional[Callable[[int], Optional[WindowInfo]]] = None) -> bool:
+        return bool(self.fullscreen_windows(snapshot, foreground_hwnd, query))
+
+    def _retain(self, snapshot: WindowSnapshot) -> None:
+        """移除已不存在窗口的判定缓存"""
+        if len(self._memo) > 2 * max(len(snapshot), 16):
+            alive = {info.hwnd for info in snapshot}
+            for hwnd in [h for h in self._memo if h not in alive]:
+                del self._memo[hwnd]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'memo_hits': self.memo_hits,
+                'memo_misses': self.memo_misses,
+                'memo_entries': len(self._memo),
+                'monitor_refreshes': self.monitor_refreshes,
+                'monitors': len(self._monitors or ()),
+            }
@@ -0,0 +1,308 @@
+import glob
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+
+from . import log_maker
+from .window_snapshot import normalize_path
+
+log = log_maker.logger()
+
+# 文件布局：MAGIC | <II 条目数, 索引长度> | 索引 JSON | 对齐填充 | 像素数据
+# 像素为预乘 alpha 的 RGBA8888（QImage.Format_RGBA8888_Premultiplied），每个图标 16 字节对齐
+MAGIC = b"MIKAATL1"
+HEADER = struct.Struct("<II")
+ALIGN = 16
+ATLAS_FORMAT = QImage.Format_RGBA8888_Premultiplied
+ATLAS_PATTERN = "dock.*.atlas"
+
+
+def _align(value: int) -> int:
+    return (value + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _file_stamp(path: str) -> Optional[Tuple[float, int]]:
+    try:
+        st = os.stat(path)
+        return st.st_mtime, st.st_size
+    except OSError:
+        return None
+
+
+def build_atlas(icon_paths: Iterable[str], directory: str) -> Optional[str]:
+    """
+    把图标解码为预乘 RGBA 并打包为一个图集文件，返回新文件路径（失败时返回 None）
+
+    可在后台线程调用（只使用 QImage，不涉及 QPixmap）。每次生成新的文件名，
+    避免覆盖当前仍被映射的图集（Windows 下无法替换已映射的文件）。
+    """
+    entries = []
+    blobs: List[bytes] = []
+    for path in dict.fromkeys(p for p in icon_paths if p):
+        stamp = _file_stamp(path)
+        if stamp is None:
+            continue
+        image = QImage(path)
+        if image.isNull():
+            continue
+        image = image.convertToFormat(ATLAS_FORMAT)
+        data = bytes(image.constBits())[:image.sizeInBytes()]
+        entries.append({
+            'key': normalize_path(path),
+            'mtime': stamp[0],
+            'size': stamp[1],
+            'width': image.width(),
+            'height': image.height(),
+            'stride': image.bytesPerLine(),
+            'length': len(data),
+        })
+        blobs.append(data)
+
+    offset = 0
+    for entry, data in zip(entries, blobs):
+        entry['offset'] = offset
+        offset = _align(offset + len(data))
+    index = json.dumps(entries, ensure_ascii=False).encode('utf-8')
+    data_start = _align(len(MAGIC) + HEADER.size + len(index))
+
+    tmp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='dock.', suffix='.tmp', dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(HEADER.pack(len(entries), len(index)))
+            f.write(index)
+            f.write(b'\0' * (data_start - f.tell()))
+            for entry, data in zip(entries, blobs):
+                f.write(b'\0' * (data_start + entry['offset'] - f.tell()))
+                f.write(data)
+        path = os.path.join(directory, f"dock.{time.time_ns()}.atlas")
+        os.replace(tmp_path, path)
+        return path
+    except Exception as e:
+        log.error(f"生成图标图集失败: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return None
+
+
+class IconAtlas:
+    """
+    只读的内存映射图标图集
+
+    image() 直接以映射内存构造 QImage，不解码也不复制；返回的 QImage 只在图集打开期间有效，
+    调用方应立即转换（如 QPixmap.fromImage）或 copy()。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError("图集文件格式不正确")
+            count, index_len = HEADER.unpack_from(self._map, len(MAGIC))
+            index_start = len(MAGIC) + HEADER.size
+            entries = json.loads(self._map[index_start:index_start + index_len].decode('utf-8'))
+            if len(entries) != count:
+                raise ValueError("图集索引不完整")
+            self._data_start = _align(index_start + index_len)
+            self._view = memoryview(self._map)
+        except Exception:
+            self._file.close()
+            raise
+        self._entries: Dict[str, dict] = {entry['key']: entry for entry in entries}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def stamps(self) -> Dict[str, Tuple[float, int]]:
+        """规范化路径 -> 打包时的图标文件 (mtime, size)"""
+        return {key: (entry['mtime'], entry['size']) for key, entry in self._entries.items()}
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._map)
+
+    def image(self, path: str, stamp: Optional[Tuple[float, int]] = None) -> Optional[QImage]:
+        """
+        图标的 QImage；未打包或图标文件已变化（与 stamp 不符）时返回 None
+
+        stamp 为图标文件当前的 (mtime, size)，调用方已 stat 过时传入以免重复 stat。
+        """
+        entry = self._entries.get(normalize_path(path))
+        if entry is None:
+            return None
+        if stamp is None:
+            stamp = _file_stamp(path)
+        if stamp != (entry['mtime'], entry['size']):
+            return None
+        start = self._data_start + entry['offset']
+        buffer = self._view[start:start + entry['length']]
+        return QImage(buffer, entry['width'], entry['height'], entry['stride'], ATLAS_FORMAT)
+
+    def close(self) -> None:
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:
+            # 仍有 QImage 引用映射内存，交由垃圾回收释放
+            log.debug(f"图标图集仍被引用，延迟关闭: {self.path}")
+        finally:
+            self._file.close()
+
+
+class AtlasStore:
+    """
+    图集目录管理：启动时映射最新的图集，后台生成新图集后在主线程切换，并删除旧文件
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._atlas: Optional[IconAtlas] = None
+        self.hits = 0
+        self.misses = 0
+        self.installs = 0
+
+    @property
+    def atlas(self) -> Optional[IconAtlas]:
+        return self._atlas
+
+    def open_latest(self) -> bool:
+        """映射目录中最新的有效图集，返回是否成功"""
+        candidates = sorted(glob.glob(os.path.join(self.directory, ATLAS_PATTERN)), reverse=True)
+        for path in candidates:
+            try:
+                self._swap(IconAtlas(path))
+                return True
+            except Exception as e:
+                log.error(f"加载图标图集 {path} 失败: {e}")
+        return False
+
+    def install(self, path: str) -> bool:
+        """切换到新生成的图集（主线程调用）"""
+        try:
+            atlas = IconAtlas(path)
+        except Exception as e:
+            log.error(f"加载图标图集 {path} 失败: {e}")
+            return False
+        self._swap(atlas)
+        self.installs += 1
+        return True
+
+    def _swap(self, atlas: IconAtlas) -> None:
+        old, self._atlas = self._atlas, atlas
+        if old is not None:
+            old.close()
+        self._remove_stale()
+
+    def _remove_stale(self) -> None:
+        current = normalize_path(self._atlas.path) if self._atlas else None
+        for path in glob.glob(os.path.join(self.directory, ATLAS_PATTERN)):
+            if normalize_path(path) == current:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # 可能仍被映射，下次切换时再删除
+
+    def image(self, path: str, stamp: Optional[Tuple[float, int]] = None) -> Optional[QImage]:
+        image = self._atlas.image(path, stamp) if self._atlas else None
+        if image is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return image
+
+    def covers(self, icon_paths: Iterable[str]) -> bool:
+        """当前图集是否恰好包含这些图标的当前版本"""
+        wanted = {}
+        for path in icon_paths:
+            stamp = _file_stamp(path) if path else None
+            if stamp is not None:
+                wanted[normalize_path(path)] = stamp
+        have = self._atlas.stamps() if self._atlas else {}
+        return wanted == have
+
+    def close(self) -> None:
+        if self._atlas is not None:
+            self._atlas.close()
+            self._atlas = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._atlas) if self._atlas else 0,
+            'bytes': self._atlas.nbytes if self._atlas else 0,
+            'hits': self.hits,
+            'misses': self.misses,
+            'installs': self.installs,
+        }
+
+
+class AtlasBuilder(QObject):
+    """
+    后台生成图集：单线程执行，生成期间的新请求只保留最后一次
+
+    完成后发出 built(path)，信号在工作线程发出，接收方应使用 Qt.QueuedConnection
+    """
+
+    built = Signal(str)
+
+    def __init__(self, directory: str, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AtlasBuilder")
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending: Optional[List[str]] = None
+        self._closed = False
+        self.builds = 0
+
+    def request(self, icon_paths: Iterable[str]) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._pending = list(icon_paths)
+            if self._running:
+                return
+            self._running = True
+        self._executor.submit(self._run)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                paths, self._pending = self._pending, None
+                if paths is None or self._closed:
+                    self._running = False
+                    return
+            start = time.perf_counter()
+            path = build_atlas(paths, self.directory)
+            if path:
+                with self._lock:
+                    self.builds += 1
+                    closed = self._closed
+                log.debug(f"图标图集已生成: {len(paths)} 个图标，耗时 {(time.perf_counter() - start) * 1000:.1f} ms")
+                if not closed:
+                    self.built.emit(path)
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            self._closed = True
+            self._pending = None
+        self._executor.shutdown(wait=wait)
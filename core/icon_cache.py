@@ -0,0 +1,575 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Dict, List, Optional
+
+from PySide6.QtCore import QThread, Signal
+
+from . import log_maker
+from .window_snapshot import normalize_path
+
+log = log_maker.logger()
+
+INDEX_FORMAT = 1
+ORPHAN_GRACE = 300.0  # 秒
+
+
+@dataclass(frozen=True)
+class IconCacheEntry:
+    """索引中的一条记录"""
+    mtime: float             # 源文件修改时间
+    size: int                # 源文件大小
+    template_version: str    # 生成时的模板版本
+    file: str                # 缓存目录内的图标文件名
+    last_used: float = 0.0   # 最近一次使用时间（time.time()）
+    file_size: int = 0       # 图标文件大小（字节）
+
+
+class IconCache:
+    """
+    带索引的磁盘图标缓存
+
+    索引文件 index.json 记录 规范化路径 -> (源文件 mtime/size, 模板版本, 图标文件)，
+    启动时加载一次，之后查询只访问内存；每条记录在 revalidate_interval 秒内最多校验一次源文件，
+    源文件或模板（app_model.png）变化后记录失效。索引通过临时文件 + os.replace 原子写入，
+    新记录合并后延迟 save_delay 秒写入，退出时由 flush() 写入剩余修改。
+
+    缓存总大小与条目数受 max_bytes / max_entries 限制，prune() 按最近使用时间淘汰（LRU）。
+    """
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, cache_dir: str, template_path: Optional[str] = None,
+                 revalidate_interval: float = 60.0, clock: Callable[[], float] = time.monotonic,
+                 max_bytes: int = 64 * 1024 * 1024, max_entries: int = 1000,
+                 save_delay: float = 2.0):
+        self.cache_dir = cache_dir
+        self.template_path = template_path
+        self.revalidate_interval = revalidate_interval
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries: Dict[str, IconCacheEntry] = {}
+        self._validated_at: Dict[str, float] = {}
+        self._loaded = False
+        self._dirty = False  # 内存中的新记录或 last_used 尚未写入索引
+        self._save_timer: Optional[threading.Timer] = None
+        self._template_stat = None
+        self._template_version = ''
+        self._template_checked_at = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.cache_dir, self.INDEX_NAME)
+
+    # ====================== 模板版本 ======================
+
+    def _check_template(self) -> str:
+        """模板文件内容哈希；只在文件 mtime/size 变化时重新计算"""
+        now = self._clock()
+        if self._template_checked_at is not None and now - self._template_checked_at < self.revalidate_interval:
+            return self._template_version
+        self._template_checked_at = now
+        if not self.template_path:
+            return self._template_version
+        try:
+            st = os.stat(self.template_path)
+            stat_key = (st.st_mtime, st.st_size)
+            if stat_key != self._template_stat:
+                with open(self.template_path, 'rb') as f:
+                    self._template_version = hashlib.md5(f.read()).hexdigest()[:12]
+                self._template_stat = stat_key
+        except OSError:
+            pass
+        return self._template_version
+
+    @property
+    def template_version(self) -> str:
+        with self._lock:
+            self._ensure_loaded()
+            return self._check_template()
+
+    # ====================== 索引 ======================
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def load(self) -> int:
+        """加载索引，返回记录数；索引缺失或损坏时从空索引开始"""
+        with self._lock:
+            self._loaded = True
+            self._entries = {}
+            self._validated_at = {}
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError as e:
+                log.error(f"创建图标缓存目录失败: {e}")
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') == INDEX_FORMAT:
+                    for key, raw in (data.get('entries') or {}).items():
+                        try:
+                            self._entries[key] = IconCacheEntry(**raw)
+                        except TypeError:
+                            continue
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                log.error(f"读取图标缓存索引失败，将重建: {e}")
+            self._check_template()
+            return len(self._entries)
+
+    def save(self) -> bool:
+        """原子写入索引"""
+        with self._lock:
+            data = {
+                'format': INDEX_FORMAT,
+                'template_version': self._template_version,
+                'entries': {key: asdict(entry) for key, entry in self._entries.items()},
+            }
+            tmp_path = None
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix='index.', suffix='.tmp', dir=self.cache_dir)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.index_path)
+                self._dirty = False
+                return True
+            except Exception as e:
+                log.error(f"写入图标缓存索引失败: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                return False
+
+    # ====================== 查询 / 写入 ======================
+
+    def file_for(self, exe_path: str) -> str:
+        """exe 对应的图标文件路径（包含路径哈希，避免不同路径同名冲突）"""
+        name = os.path.splitext(os.path.basename(exe_path))[0]
+        md5 = hashlib.md5((os.path.abspath(exe_path)).encode('utf-8')).hexdigest()[:8]
+        return os.path.join(self.cache_dir, f"{name}_{md5}.png")
+
+    @staticmethod
+    def _source_stat(exe_path: str):
+        try:
+            st = os.stat(exe_path)
+            return st.st_mtime, st.st_size
+        except OSError:
+            return None
+
+    def _is_valid(self, key: str, exe_path: str, entry: IconCacheEntry) -> bool:
+        if entry.template_version != self._check_template():
+            return False
+        now = self._clock()
+        validated = self._validated_at.get(key)
+        if validated is not None and now - validated < self.revalidate_interval:
+            return True
+        stat = self._source_stat(exe_path)
+        if stat is None or stat != (entry.mtime, entry.size):
+            return False
+        if not os.path.exists(os.path.join(self.cache_dir, entry.file)):
+            return False
+        self._validated_at[key] = now
+        return True
+
+    def lookup(self, exe_path: str) -> Optional[str]:
+        """返回有效的缓存图标路径；未缓存或已失效时返回 None"""
+        if not exe_path:
+            return None
+        key = normalize_path(exe_path)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if not self._is_valid(key, exe_path, entry):
+                self._drop(key)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries[key] = replace(entry, last_used=time.time())
+            self._dirty = True
+            return os.path.join(self.cache_dir, entry.file)
+
+    def store(self, exe_path: str, icon_file: str) -> None:
+        """记录新生成的图标并写入索引"""
+        stat = self._source_stat(exe_path)
+        if stat is None:
+            return
+        key = normalize_path(exe_path)
+        try:
+            file_size = os.path.getsize(icon_file)
+        except OSError:
+            file_size = 0
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[key] = IconCacheEntry(
+                mtime=stat[0],
+                size=stat[1],
+                template_version=self._check_template(),
+                file=os.path.basename(icon_file),
+                last_used=time.time(),
+                file_size=file_size,
+            )
+            self._validated_at[key] = self._clock()
+            self._dirty = True
+            self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        """延迟写入索引：冷启动批量生成图标时合并为一次写入，而不是每个图标重写一次"""
+        if self.save_delay <= 0:
+            self.save()
+            return
+        if self._save_timer is not None:
+            return
+        timer = threading.Timer(self.save_delay, self._on_save_timer)
+        timer.daemon = True
+        self._save_timer = timer
+        timer.start()
+
+    def _on_save_timer(self) -> None:
+        with self._lock:
+            self._save_timer = None
+            if self._dirty:
+                self.save()
+
+    def flush(self) -> None:
+        """立即把尚未保存的记录与使用时间写入索引"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self.save()
+
+    def _drop(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._validated_at.pop(key, None)
+
+    def invalidate(self, exe_path: str) -> None:
+        with self._lock:
+            self._drop(normalize_path(exe_path))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    # ====================== 维护 ======================
+
+    def _cache_files(self) -> List[str]:
+        """缓存目录中的图标文件名（不含索引与临时文件）"""
+        try:
+            return [name for name in os.listdir(self.cache_dir) if name.lower().endswith('.png')]
+        except OSError:
+            return []
+
+    def _remove_file(self, name: str) -> int:
+        """删除缓存目录中的文件，返回释放的字节数"""
+        path = os.path.join(self.cache_dir, name)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+        except OSError:
+            return 0
+
+    def _file_size(self, entry: IconCacheEntry) -> int:
+        if entry.file_size:
+            return entry.file_size
+        try:
+            return os.path.getsize(os.path.join(self.cache_dir, entry.file))
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _same_icon(a: Optional[IconCacheEntry], b: IconCacheEntry) -> bool:
+        """两条记录是否指向同一次生成的图标（忽略 last_used）"""
+        return a is not None and (a.file, a.mtime, a.size, a.template_version) == \
+            (b.file, b.mtime, b.size, b.template_version)
+
+    def prune(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None,
+              dry_run: bool = False) -> Dict[str, int]:
+        """
+        清理缓存：删除索引外的孤立文件与文件已丢失的记录，
+        再按最近使用时间从旧到新淘汰，直到总大小与条目数都在限制内
+
+        只在复制记录与移除记录时持有锁，目录扫描与文件删除在锁外进行，不阻塞 lookup()。
+        扫描期间被重新生成的记录不会被移除。
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_entries = self.max_entries if max_entries is None else max_entries
+        result = {'orphans': 0, 'missing': 0, 'evicted': 0, 'freed_bytes': 0}
+        with self._lock:
+            self._ensure_loaded()
+            entries = dict(self._entries)
+
+        referenced = {entry.file for entry in entries.values()}
+        files = set(self._cache_files())
+
+        now = time.time()
+        for name in files - referenced:
+            # 刚写入、尚未登记到索引的图标（另一线程正在 store）不算孤立文件
+            try:
+                if now - os.path.getmtime(os.path.join(self.cache_dir, name)) < ORPHAN_GRACE:
+                    continue
+            except OSError:
+                continue
+            result['orphans'] += 1
+            if not dry_run:
+                result['freed_bytes'] += self._remove_file(name)
+
+        missing = [(key, entry) for key, entry in entries.items() if entry.file not in files]
+        live = [(key, entry, self._file_size(entry)) for key, entry in entries.items() if entry.file in files]
+        total = sum(size for _, _, size in live)
+        count = len(live)
+        evict = []
+        for key, entry, size in sorted(live, key=lambda item: item[1].last_used):
+            if total <= max_bytes and count <= max_entries:
+                break
+            total -= size
+            count -= 1
+            evict.append((key, entry, size))
+
+        if dry_run:
+            result['missing'] = len(missing)
+            result['evicted'] = len(evict)
+            result['freed_bytes'] += sum(size for _, _, size in evict)
+            return result
+
+        evicted_files = []
+        with self._lock:
+            for key, entry in missing:
+                if self._same_icon(self._entries.get(key), entry):
+                    self._drop(key)
+                    result['missing'] += 1
+            for key, entry, _ in evict:
+                if self._same_icon(self._entries.get(key), entry):
+                    self._drop(key)
+                    evicted_files.append(entry.file)
+            result['evicted'] = len(evicted_files)
+            self.evictions += result['evicted']
+            if result['missing'] or result['evicted'] or self._dirty:
+                self.save()
+
+        for name in evicted_files:
+            result['freed_bytes'] += self._remove_file(name)
+        return result
+
+    def verify(self, fix: bool = False) -> Dict[str, List[str]]:
+        """
+        检查每条记录：图标文件缺失、源文件缺失/已变化、模板版本过期；fix 为 True 时移除这些记录
+        """
+        problems: Dict[str, List[str]] = {'missing_file': [], 'missing_source': [], 'stale_source': [],
+                                          'stale_template': []}
+        with self._lock:
+            self._ensure_loaded()
+            version = self._check_template()
+            bad = []
+            for key, entry in self._entries.items():
+                if not os.path.exists(os.path.join(self.cache_dir, entry.file)):
+                    problems['missing_file'].append(key)
+                elif entry.template_version != version:
+                    problems['stale_template'].append(key)
+                else:
+                    stat = self._source_stat(key)
+                    if stat is None:
+                        problems['missing_source'].append(key)
+                    elif stat != (entry.mtime, entry.size):
+                        problems['stale_source'].append(key)
+                    else:
+                        continue
+                bad.append(key)
+            if fix and bad:
+                for key in bad:
+                    entry = self._entries.get(key)
+                    self._drop(key)
+                    if entry is not None:
+                        self._remove_file(entry.file)
+                self.save()
+        return problems
+
+    def clear(self) -> List[str]:
+        """删除全部图标与索引记录，返回原有记录的源路径"""
+        with self._lock:
+            self._ensure_loaded()
+            sources = list(self._entries.keys())
+            for name in self._cache_files():
+                self._remove_file(name)
+            self._entries.clear()
+            self._validated_at.clear()
+            self.save()
+            return sources
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._ensure_loaded()
+            referenced = {entry.file for entry in self._entries.values()}
+            files = self._cache_files()
+            return {
+                'entries': len(self._entries),
+                'total_bytes': sum(self._file_size(entry) for entry in self._entries.values()),
+                'files': len(files),
+                'orphan_files': sum(1 for name in files if name not in referenced),
+                'max_bytes': self.max_bytes,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'evictions': self.evictions,
+            }
+
+
+class IconCacheMaintainer(QThread):
+    """
+    图标磁盘缓存后台维护线程，适配 core.threads.manager.ThreadManager
+
+    启动后立即执行一次清理（IconCache.prune），之后每隔 interval 秒执行一次。
+    """
+
+    errorOccurred = Signal(str)
+
+    def __init__(self, cache, interval: float = 1800.0, parent=None):
+        super().__init__(parent)
+        self._name = "IconCacheMaintainer"
+        self._cache = cache
+        self._interval = interval
+        self._paused = False
+        self._trigger = threading.Event()
+
+    # 线程控制方法
+    def get_name(self) -> str:
+        return self._name
+
+    def pause(self):
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        self._trigger.set()
+
+    def is_paused(self) -> bool:
+        return self._paused
+
+    def quit(self):
+        """请求停止并唤醒等待中的循环"""
+        self.requestInterruption()
+        self._trigger.set()
+        super().quit()
+
+    def request_prune(self) -> None:
+        """请求尽快清理一次（如缓存上限被调低后）"""
+        self._trigger.set()
+
+    def run(self):
+        log.info(f"图标缓存维护线程开始运行: {self.get_name()}")
+        while not self.isInterruptionRequested():
+            if not self._paused:
+                try:
+                    result = self._cache.prune()
+                    if result['orphans'] or result['missing'] or result['evicted']:
+                        log.info(f"图标缓存清理: 孤立文件 {result['orphans']}，丢失记录 {result['missing']}，"
+                                 f"淘汰 {result['evicted']}，释放 {result['freed_bytes']} 字节")
+                except Exception as e:
+                    log.error(f"清理图标缓存时出错: {e}")
+                    self.errorOccurred.emit(str(e))
+            self._trigger.wait(self._interval)
+            self._trigger.clear()
+        log.info(f"图标缓存维护线程运行结束: {self.get_name()}")
+
+
+# ====================== 命令行 ======================
+
+def default_cache_dir() -> str:
+    return os.path.join(os.getenv('LOCALAPPDATA') or os.path.expanduser("~"), 'AppIcon')
+
+
+def default_template_path() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "make_app_icon", "app_model.png")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.icon_cache", description="图标磁盘缓存维护")
+    parser.add_argument('--dir', default=default_cache_dir(), help="缓存目录（默认 %%LOCALAPPDATA%%/AppIcon）")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help="显示缓存统计")
+    verify = sub.add_parser('verify', help="检查记录是否有效")
+    verify.add_argument('--fix', action='store_true', help="移除无效记录及其图标")
+    prune = sub.add_parser('prune', help="清理孤立文件并按 LRU 淘汰到限制内")
+    prune.add_argument('--max-mb', type=float, default=None, help="总大小上限（MB）")
+    prune.add_argument('--max-entries', type=int, default=None, help="条目数上限")
+    prune.add_argument('--dry-run', action='store_true', help="只显示将要删除的内容")
+    rebuild = sub.add_parser('rebuild', help="清空缓存并为仍存在的源文件重新生成图标")
+    rebuild.add_argument('--no-extract', action='store_true', help="只清空，不重新生成")
+    args = parser.parse_args(argv)
+
+    cache = IconCache(args.dir, default_template_path())
+    cache.load()
+
+    if args.command == 'stats':
+        for key, value in cache.stats().items():
+            print(f"{key}: {value}")
+        return 0
+
+    if args.command == 'verify':
+        problems = cache.verify(fix=args.fix)
+        total = 0
+        for kind, keys in problems.items():
+            total += len(keys)
+            print(f"{kind}: {len(keys)}")
+            for key in keys:
+                print(f"  {key}")
+        if args.fix and total:
+            print(f"已移除 {total} 条无效记录")
+        return 1 if total and not args.fix else 0
+
+    if args.command == 'prune':
+        max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None
+        result = cache.prune(max_bytes=max_bytes, max_entries=args.max_entries, dry_run=args.dry_run)
+        for key, value in result.items():
+            print(f"{key}: {value}")
+        return 0
+
+    if args.command == 'rebuild':
+        sources = cache.clear()
+        print(f"已清空 {len(sources)} 条记录")
+        if args.no_extract:
+            return 0
+        try:
+            from .process_manager import ProcessManager
+        except Exception as e:
+            print(f"无法加载图标提取器，仅清空缓存: {e}")
+            return 1
+        manager = ProcessManager()
+        manager._icon_cache = cache
+        rebuilt = 0
+        for source in sources:
+            if os.path.exists(source) and manager.extract_icon(source):
+                rebuilt += 1
+        cache.flush()
+        print(f"已重新生成 {rebuilt} 个图标")
+        return 0
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
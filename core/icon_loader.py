@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+from . import log_maker
+from .window_snapshot import normalize_path
+
+log = log_maker.logger()
+
+
+def _init_worker_thread():
+    """工作线程初始化：快捷方式/UWP 图标需要 COM"""
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()
+    except Exception:
+        pass
+
+
+class IconLoader(QObject):
+    """
+    异步图标加载
+
+    - 在有界线程池中执行 resolve(exe_path)，不阻塞 GUI 线程
+    - 同一可执行文件的重复请求合并为一个任务
+    - 提取失败的文件记入负缓存，文件未被修改时 retry_interval 秒内不再重试
+    - 完成后发出 icon_ready(exe_path, icon_path)，失败时 icon_path 为空字符串；
+      信号在工作线程发出，接收方应使用 Qt.QueuedConnection 回到主线程
+    """
+
+    icon_ready = Signal(str, str)
+
+    def __init__(self, resolve: Callable[[str], Optional[str]], max_workers: int = 2,
+                 retry_interval: float = 300.0, parent=None):
+        super().__init__(parent)
+        self._resolve = resolve
+        self._retry_interval = retry_interval
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="IconLoader",
+            initializer=_init_worker_thread,
+        )
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        # 规范化路径 -> (失败时的文件修改时间, 允许重试的时刻)
+        self._failures: Dict[str, Tuple[Optional[float], float]] = {}
+        self._closed = False
+        self.requested = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+        self.negative_hits = 0
+
+    @staticmethod
+    def _mtime(exe_path: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(exe_path)
+        except OSError:
+            return None
+
+    def _is_failed_locked(self, key: str, mtime: Optional[float]) -> bool:
+        failure = self._failures.get(key)
+        if failure is None:
+            return False
+        failed_mtime, retry_at = failure
+        if failed_mtime == mtime and time.monotonic() < retry_at:
+            return True
+        del self._failures[key]
+        return False
+
+    def is_failed(self, exe_path: str) -> bool:
+        """该文件最近是否提取失败（仍在重试间隔内）"""
+        if not exe_path:
+            return False
+        mtime = self._mtime(exe_path)
+        with self._lock:
+            return self._is_failed_locked(normalize_path(exe_path), mtime)
+
+    def request(self, exe_path: str) -> bool:
+        """请求加载图标；已有相同任务在进行时合并，最近失败过时跳过，返回是否新建了任务"""
+        if not exe_path:
+            return False
+        key = normalize_path(exe_path)
+        mtime = self._mtime(exe_path)
+        with self._lock:
+            if self._closed:
+                return False
+            self.requested += 1
+            if self._is_failed_locked(key, mtime):
+                self.negative_hits += 1
+                return False
+            if key in self._pending:
+                self.coalesced += 1
+                return False
+            future = self._executor.submit(self._run, exe_path, key)
+            self._pending[key] = future
+        return True
+
+    def is_pending(self, exe_path: str) -> bool:
+        with self._lock:
+            return normalize_path(exe_path) in self._pending
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self, exe_path: str, key: str) -> str:
+        icon_path = ''
+        try:
+            icon_path = self._resolve(exe_path) or ''
+        except Exception as e:
+            log.error(f"异步提取图标 {exe_path} 时出错: {e}")
+        with self._lock:
+            self._pending.pop(key, None)
+            if icon_path:
+                self.completed += 1
+                self._failures.pop(key, None)
+            else:
+                self.failed += 1
+                self._failures[key] = (self._mtime(exe_path), time.monotonic() + self._retry_interval)
+            closed = self._closed
+        if not closed:
+            self.icon_ready.emit(exe_path, icon_path)
+        return icon_path
+
+    def shutdown(self, wait: bool = False) -> None:
+        """停止接受新任务；wait 为 False 时不等待进行中的任务"""
+        with self._lock:
+            self._closed = True
+            pending = list(self._pending.values())
+        for future in pending:
+            future.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'requested': self.requested,
+                'coalesced': self.coalesced,
+                'completed': self.completed,
+                'failed': self.failed,
+                'negative_hits': self.negative_hits,
+                'negative_entries': len(self._failures),
+                'pending': len(self._pending),
+            }
+
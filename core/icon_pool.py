@@ -0,0 +1,329 @@
+import argparse
+import hashlib
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional, Tuple
+
+from . import log_maker
+
+log = log_maker.logger()
+
+MAX_ICON_SIDE = 256
+SLOT_BYTES = MAX_ICON_SIDE * MAX_ICON_SIDE * 4  # 每个工作进程一块共享内存，容纳一个最大尺寸的 32 位位图
+
+# 提取器：(路径, 尺寸) -> (BGRX 像素字节, 宽, 高)，在工作进程中调用，必须可被 pickle（模块级函数）
+Extractor = Callable[[str, int], Tuple[bytes, int, int]]
+
+
+@dataclass(frozen=True)
+class PooledIcon:
+    """工作进程返回的图标像素"""
+    path: str
+    size: int
+    pixels: bytes = b''            # BGRX，自上而下，行宽 width * 4
+    width: int = 0
+    height: int = 0
+    error: Optional[str] = None
+    timed_out: bool = False
+    worker_pid: int = 0
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and bool(self.pixels)
+
+
+# ====================== 提取器 ======================
+
+_win32_extractor = None
+
+
+def win32_extract(path: str, size: int) -> Tuple[bytes, int, int]:
+    """真实提取器（工作进程内复用同一个不带缓存的 WindowsIconExtractor）"""
+    global _win32_extractor
+    if _win32_extractor is None:
+        from .catch_ico import WindowsIconExtractor
+        _win32_extractor = WindowsIconExtractor(enable_cache=False)
+    icon = _win32_extractor.extract_file_icon(path, size=size)
+    if not icon.success or icon.bitmap is None:
+        raise RuntimeError(icon.error or "未找到图标")
+    return icon.bitmap, icon.info.width, icon.info.height
+
+
+def fake_extract(path: str, size: int) -> Tuple[bytes, int, int]:
+    """
+    假提取器，用于在非 Windows 环境测试进程池
+
+    路径前缀控制行为：hang: 永不返回；crash: 进程直接退出；fail: 抛出异常；
+    slow:<毫秒>: 延迟后返回。其余路径返回由路径哈希决定的纯色位图。
+    """
+    if path.startswith("hang:"):
+        time.sleep(3600)
+    if path.startswith("crash:"):
+        os._exit(3)
+    if path.startswith("fail:"):
+        raise RuntimeError(f"无法提取: {path}")
+    if path.startswith("slow:"):
+        time.sleep(int(path.split(":", 2)[1]) / 1000.0)
+    pixel = hashlib.md5(path.encode("utf-8")).digest()[:3] + b"\0"
+    return pixel * (size * size), size, size
+
+
+# ====================== 工作进程 ======================
+
+def _worker_main(conn, shm_name: str, extractor: Extractor) -> None:
+    # 共享内存由父进程创建并负责 unlink，子进程只映射
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()
+    except Exception:
+        pass
+    try:
+        while True:
+            try:
+                job = conn.recv()
+            except (EOFError, OSError):
+                break
+            if job is None:
+                break
+            job_id, path, size = job
+            try:
+                pixels, width, height = extractor(path, size)
+                length = len(pixels)
+                if length > shm.size:
+                    raise ValueError(f"图标过大: {width}x{height}")
+                shm.buf[:length] = pixels
+                conn.send((job_id, width, height, length, None))
+            except Exception as e:
+                conn.send((job_id, 0, 0, 0, str(e) or type(e).__name__))
+    finally:
+        shm.close()
+
+
+class _Worker:
+    """父进程一侧的工作进程句柄：进程 + 管道 + 共享内存"""
+
+    def __init__(self, ctx, extractor: Extractor):
+        self.shm = shared_memory.SharedMemory(create=True, size=SLOT_BYTES)
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, self.shm.name, extractor),
+            name="IconPoolWorker", daemon=True,
+        )
+        try:
+            self.process.start()
+        except Exception:
+            self._release()
+            raise
+        finally:
+            child_conn.close()
+        self.jobs = 0
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid or 0
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """请求正常退出，超时则强制结束"""
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout)
+        self._release()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(2.0)
+        self._release()
+
+    def _release(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except Exception:
+            pass
+
+
+class IconProcessPool:
+    """
+    进程隔离的图标提取池
+
+    - 在独立进程中调用提取器，第三方 exe 中损坏的图标资源导致的卡死/崩溃不会影响 dock 进程
+    - 像素通过每个工作进程专用的共享内存返回，管道中只传递尺寸等少量数据
+    - 每个任务有超时；超时或进程崩溃时结束该进程，下次使用时重新创建
+    - 每个进程处理 max_jobs_per_worker 个任务后回收，限制 GDI 句柄等资源泄漏的累积
+    - 工作进程在首次使用时才启动；extract() 可在多个线程中同时调用，超过进程数的请求排队等待
+    """
+
+    def __init__(self, workers: int = 2, job_timeout: float = 10.0, max_jobs_per_worker: int = 50,
+                 extractor: Extractor = win32_extract, start_method: str = "spawn"):
+        self.job_timeout = job_timeout
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self._extractor = extractor
+        self._ctx = multiprocessing.get_context(start_method)
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        for _ in range(max(1, workers)):
+            self._idle.put(None)  # 空槽位，首次使用时启动进程
+        self._lock = threading.Lock()
+        self._closed = False
+        self._job_id = 0
+        self.jobs = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycled = 0
+        self.spawned = 0
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx, self._extractor)
+        self._count('spawned')
+        return worker
+
+    def extract(self, path: str, size: int = 64) -> PooledIcon:
+        """在工作进程中提取图标（阻塞直到完成、失败或超时）"""
+        if size > MAX_ICON_SIDE:
+            return PooledIcon(path, size, error=f"尺寸超过 {MAX_ICON_SIDE}")
+        if self._closed:
+            return PooledIcon(path, size, error="图标进程池已关闭")
+        worker = self._idle.get()
+        try:
+            if self._closed:
+                return PooledIcon(path, size, error="图标进程池已关闭")
+            if worker is not None and not worker.process.is_alive():
+                worker.kill()
+                worker = None
+            if worker is None:
+                worker = self._spawn()
+            with self._lock:
+                self._job_id += 1
+                job_id = self._job_id
+                self.jobs += 1
+            worker.jobs += 1
+            pid = worker.pid
+            worker.conn.send((job_id, path, size))
+
+            if not worker.conn.poll(self.job_timeout):
+                log.error(f"提取图标超时（{self.job_timeout}s），结束工作进程 {pid}: {path}")
+                worker.kill()
+                worker = None
+                self._count('timeouts')
+                return PooledIcon(path, size, error="提取超时", timed_out=True, worker_pid=pid)
+            try:
+                reply_id, width, height, length, error = worker.conn.recv()
+            except (EOFError, OSError):
+                log.error(f"图标工作进程 {pid} 异常退出: {path}")
+                worker.kill()
+                worker = None
+                self._count('crashes')
+                return PooledIcon(path, size, error="工作进程异常退出", worker_pid=pid)
+            if reply_id != job_id:
+                # 不应发生：丢弃状态不一致的进程
+                worker.kill()
+                worker = None
+                self._count('failed')
+                return PooledIcon(path, size, error="工作进程响应不匹配", worker_pid=pid)
+            if error:
+                self._count('failed')
+                return PooledIcon(path, size, error=error, worker_pid=pid)
+            pixels = bytes(worker.shm.buf[:length])
+            self._count('completed')
+            return PooledIcon(path, size, pixels, width, height, worker_pid=pid)
+        except Exception as e:
+            if worker is not None:
+                worker.kill()
+                worker = None
+            self._count('failed')
+            return PooledIcon(path, size, error=f"图标进程池出错: {e}")
+        finally:
+            if worker is not None and (self._closed or worker.jobs >= self.max_jobs_per_worker):
+                worker.stop()
+                worker = None
+                if not self._closed:
+                    self._count('recycled')
+            self._idle.put(worker)
+
+    def shutdown(self) -> None:
+        """
+        停止所有空闲的工作进程；正在执行的任务结束后由其调用方停止对应进程
+
+        空槽位会放回队列，已在等待槽位的 extract() 随即返回"已关闭"而不会永久阻塞。
+        """
+        self._closed = True
+        slots = 0
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+            slots += 1
+        for _ in range(slots):
+            self._idle.put(None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'jobs': self.jobs,
+                'completed': self.completed,
+                'failed': self.failed,
+                'timeouts': self.timeouts,
+                'crashes': self.crashes,
+                'recycled': self.recycled,
+                'spawned': self.spawned,
+            }
+
+
+# ====================== 基准测试 ======================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.icon_pool", description="图标进程池吞吐量基准测试（假提取器）")
+    parser.add_argument('--jobs', type=int, default=200, help="正常任务数")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=2, help="并发提交线程数")
+    parser.add_argument('--max-jobs', type=int, default=50, help="每个进程处理多少任务后回收")
+    parser.add_argument('--timeout', type=float, default=1.0, help="单个任务超时（秒）")
+    parser.add_argument('--size', type=int, default=64)
+    args = parser.parse_args(argv)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool = IconProcessPool(workers=args.workers, job_timeout=args.timeout,
+                           max_jobs_per_worker=args.max_jobs, extractor=fake_extract)
+    try:
+        paths = [f"C:/Apps/app{i}.exe" for i in range(args.jobs)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            results = list(executor.map(lambda p: pool.extract(p, args.size), paths))
+        elapsed = time.perf_counter() - start
+        ok = sum(1 for r in results if r.success and len(r.pixels) == args.size * args.size * 4)
+        pids = {r.worker_pid for r in results}
+        print(f"正常任务: {ok}/{args.jobs}，耗时 {elapsed * 1000:.1f} ms，"
+              f"{args.jobs / elapsed:.0f} 个/秒（含进程启动），使用过的进程 {len(pids)} 个")
+        print(pool.stats())
+    finally:
+        pool.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,7 @@ import datetime
 
 class logger:
     _initialized = False
+    is_debug = False  # 未调用 enable_debug/disable_debug 的实例默认不输出调试日志
     
     def __init__(self):
         if not logger._initialized:
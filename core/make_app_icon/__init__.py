@@ -1 +1,2 @@
 from . import overlay
+from . import compositor
\ No newline at end of file
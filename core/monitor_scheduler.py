@@ -0,0 +1,105 @@
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+
+class MonitorScheduler:
+    """
+    监控循环的自适应节奏
+
+    - 快照连续未变化时，间隔从 min_interval 开始按 backoff 倍数增长，直到 max_interval
+    - dock 隐藏（如被全屏应用遮挡）时固定使用 hidden_interval
+    - boost() 后的一段时间内使用 min_interval，用于点击启动/结束进程后尽快反映状态
+    - 线程安全：boost/set_hidden 在主线程调用，observe/next_interval 在监控线程调用
+    """
+
+    def __init__(self, min_interval: float = 1.0, max_interval: float = 8.0,
+                 hidden_interval: Optional[float] = None, boost_duration: float = 5.0,
+                 backoff: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._backoff = max(1.0, backoff)
+        self._boost_duration = boost_duration
+        self._hidden_interval_override = hidden_interval
+        self.min_interval = 0.0
+        self.max_interval = 0.0
+        self.hidden_interval = 0.0
+        self.configure(min_interval, max_interval)
+
+        self._last_signature: Optional[int] = None
+        self._idle_streak = 0
+        self._hidden = False
+        self._boost_until = 0.0
+        self.boost_count = 0
+        self.unchanged_scans = 0
+        self.changed_scans = 0
+
+    def configure(self, min_interval: float, max_interval: float) -> None:
+        """更新间隔范围（秒），非法值会被修正为 min <= max"""
+        with self._lock:
+            self.min_interval = max(0.05, float(min_interval))
+            self.max_interval = max(self.min_interval, float(max_interval))
+            if self._hidden_interval_override is not None:
+                self.hidden_interval = max(self.min_interval, float(self._hidden_interval_override))
+            else:
+                self.hidden_interval = self.max_interval
+
+    # 主线程接口
+    def boost(self, duration: Optional[float] = None) -> None:
+        """在接下来的 duration 秒内使用最快节奏，并清零退避"""
+        with self._lock:
+            until = self._clock() + (self._boost_duration if duration is None else duration)
+            self._boost_until = max(self._boost_until, until)
+            self._idle_streak = 0
+            self.boost_count += 1
+
+    def set_hidden(self, hidden: bool) -> None:
+        with self._lock:
+            if self._hidden and not hidden:
+                # 重新显示后从最快节奏开始退避
+                self._idle_streak = 0
+            self._hidden = hidden
+
+    # 监控线程接口
+    def observe(self, signature: Hashable) -> bool:
+        """记录一次扫描的快照签名，返回是否与上一次不同"""
+        digest = hash(signature)
+        with self._lock:
+            changed = digest != self._last_signature
+            self._last_signature = digest
+            if changed:
+                self._idle_streak = 0
+                self.changed_scans += 1
+            else:
+                self._idle_streak += 1
+                self.unchanged_scans += 1
+            return changed
+
+    @property
+    def is_boosted(self) -> bool:
+        with self._lock:
+            return self._clock() < self._boost_until
+
+    def next_interval(self) -> float:
+        """距离下一次扫描的等待时间（秒）"""
+        with self._lock:
+            if self._clock() < self._boost_until:
+                return self.min_interval
+            if self._hidden:
+                return self.hidden_interval
+            # 指数退避，streak 较大时直接取上限，避免浮点溢出
+            if self._idle_streak >= 64:
+                return self.max_interval
+            return min(self.max_interval, self.min_interval * (self._backoff ** self._idle_streak))
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'min_interval': self.min_interval,
+                'max_interval': self.max_interval,
+                'idle_streak': self._idle_streak,
+                'hidden': self._hidden,
+                'boost_count': self.boost_count,
+                'changed_scans': self.changed_scans,
+                'unchanged_scans': self.unchanged_scans,
+            }
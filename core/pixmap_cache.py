@@ -0,0 +1,120 @@
+import os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtGui import QIcon, QPixmap
+
+from .window_snapshot import normalize_path
+
+
+def pixmap_bytes(pixmap: QPixmap) -> int:
+    """QPixmap 解码后占用的内存（宽 × 高 × 位深）"""
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class PixmapCache:
+    """
+    进程内共享的图标像素缓存（仅在 GUI 线程使用）
+
+    - 以 (规范化路径) 为键，记录文件 mtime/size；每次取用只做一次 os.stat，
+      文件被重新生成（mtime/size 变化）或删除后自动丢弃旧图像并重新解码
+    - 返回的 QIcon 在多个按钮之间共享（Qt 隐式共享，不复制像素）
+    - 总内存超过 max_bytes 时按最近使用顺序淘汰
+    - 设置了 atlas（core.icon_atlas.AtlasStore）时优先从内存映射图集取像素，图集中没有或已过期再解码 PNG
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, atlas=None):
+        self.max_bytes = max_bytes
+        self.atlas = atlas
+        # key -> ((mtime, size), QIcon, 字节数)
+        self._entries: "OrderedDict[str, Tuple[Tuple[float, int], QIcon, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def icon(self, path: str) -> Optional[QIcon]:
+        """图标文件对应的 QIcon；文件不存在或无法解码时返回 None"""
+        if not path:
+            return None
+        key = normalize_path(path)
+        try:
+            st = os.stat(path)
+            stamp = (st.st_mtime, st.st_size)
+        except OSError:
+            self.invalidate(path)
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._drop(key)
+            self.invalidations += 1
+
+        self.misses += 1
+        image = self.atlas.image(path, stamp) if self.atlas is not None else None
+        pixmap = QPixmap.fromImage(image) if image is not None else QPixmap(path)
+        if pixmap.isNull():
+            return None
+        icon = QIcon(pixmap)
+        size = pixmap_bytes(pixmap)
+        if size <= self.max_bytes:
+            self._entries[key] = (stamp, icon, size)
+            self._bytes += size
+            self._evict()
+        return icon
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def invalidate(self, path: str) -> None:
+        """图标文件被替换或删除时调用，下次取用重新解码"""
+        if path:
+            self._drop(normalize_path(path))
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+        }
+
+
+_shared_cache: Optional[PixmapCache] = None
+
+
+def shared_pixmap_cache() -> PixmapCache:
+    """进程内共享的 PixmapCache（首次调用时创建）"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = PixmapCache()
+    return _shared_cache
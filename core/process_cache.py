@@ -0,0 +1,267 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+from .window_snapshot import normalize_path
+
+
+class ProcessGone(Exception):
+    """进程已不存在"""
+
+
+class ProcessAccessDenied(Exception):
+    """无权限读取进程信息"""
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    """进程信息缓存项"""
+    pid: int
+    create_time: float
+    exe: str                 # 可执行文件路径（无权限时为空）
+    exe_norm: str            # 规范化路径
+    name: str                # 进程名（保留原始大小写）
+    denied: bool = False     # 是否因权限不足而缺少 exe
+
+
+# ====================== 信息来源 ======================
+
+class ProcessInfoProvider:
+    """进程信息来源接口"""
+
+    def create_time(self, pid: int) -> float:
+        raise NotImplementedError
+
+    def describe(self, pid: int) -> Tuple[str, str]:
+        """返回 (exe, name)，无权限时抛出 ProcessAccessDenied"""
+        raise NotImplementedError
+
+    def name(self, pid: int) -> str:
+        raise NotImplementedError
+
+
+class PsutilProcessProvider(ProcessInfoProvider):
+    """
+    基于 psutil 的默认来源
+
+    psutil.Process 会缓存自身的 create_time，复用旧对象无法发现 pid 复用，
+    因此 create_time() 每次都构造新对象；随后的 describe()/name() 复用这次构造的对象。
+    """
+
+    def __init__(self):
+        if not PSUTIL_AVAILABLE:
+            raise RuntimeError("psutil 未安装，无法使用 PsutilProcessProvider")
+        self._last: Tuple[int, Optional['psutil.Process']] = (-1, None)
+
+    def _process(self, pid: int, fresh: bool = False) -> 'psutil.Process':
+        last_pid, proc = self._last
+        if fresh or last_pid != pid or proc is None:
+            try:
+                proc = psutil.Process(pid)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess) as e:
+                raise ProcessGone(str(e))
+            except psutil.AccessDenied as e:
+                raise ProcessAccessDenied(str(e))
+            self._last = (pid, proc)
+        return proc
+
+    def create_time(self, pid: int) -> float:
+        try:
+            return self._process(pid, fresh=True).create_time()
+        except (psutil.NoSuchProcess, psutil.ZombieProcess) as e:
+            raise ProcessGone(str(e))
+        except psutil.AccessDenied as e:
+            raise ProcessAccessDenied(str(e))
+
+    def describe(self, pid: int) -> Tuple[str, str]:
+        proc = self._process(pid)
+        try:
+            name = proc.name()
+            return proc.exe(), name
+        except (psutil.NoSuchProcess, psutil.ZombieProcess) as e:
+            raise ProcessGone(str(e))
+        except psutil.AccessDenied as e:
+            raise ProcessAccessDenied(str(e))
+
+    def name(self, pid: int) -> str:
+        try:
+            return self._process(pid).name()
+        except (psutil.NoSuchProcess, psutil.ZombieProcess) as e:
+            raise ProcessGone(str(e))
+        except psutil.AccessDenied as e:
+            raise ProcessAccessDenied(str(e))
+
+
+class FakeProcessProvider(ProcessInfoProvider):
+    """
+    假来源，用于测试：processes 为 pid -> (create_time, exe, name)
+
+    denied 中的 pid 读取 exe 时拒绝访问，denied_create_time 中的 pid 读取创建时间时拒绝访问。
+    """
+
+    def __init__(self, processes: Optional[Dict[int, Tuple[float, str, str]]] = None,
+                 denied: Iterable[int] = (), denied_create_time: Iterable[int] = ()):
+        self.processes: Dict[int, Tuple[float, str, str]] = dict(processes or {})
+        self.denied = set(denied)
+        self.denied_create_time = set(denied_create_time)
+        self.describe_calls = 0
+
+    def create_time(self, pid: int) -> float:
+        if pid not in self.processes:
+            raise ProcessGone(pid)
+        if pid in self.denied_create_time:
+            raise ProcessAccessDenied(pid)
+        return self.processes[pid][0]
+
+    def describe(self, pid: int) -> Tuple[str, str]:
+        self.describe_calls += 1
+        if pid not in self.processes:
+            raise ProcessGone(pid)
+        if pid in self.denied:
+            raise ProcessAccessDenied(pid)
+        _, exe, name = self.processes[pid]
+        return exe, name
+
+    def name(self, pid: int) -> str:
+        if pid not in self.processes:
+            raise ProcessGone(pid)
+        return self.processes[pid][2]
+
+
+# ====================== 缓存 ======================
+
+class ProcessInfoCache:
+    """
+    pid -> 进程信息缓存，以 (pid, create_time) 校验有效性
+
+    - pid 被复用（create_time 变化）时淘汰旧条目
+    - 读取 exe 被拒绝的进程进入负缓存，在 negative_ttl 秒内不再重试
+    - 无法读取创建时间的进程不进入正缓存（无法校验 pid 复用），只受负缓存的 TTL 约束
+    - 线程安全，可在监控线程与 GUI 线程间共享；读取进程信息时不持有锁
+    """
+
+    def __init__(self, provider: Optional[ProcessInfoProvider] = None,
+                 max_entries: int = 2048, negative_ttl: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._provider = provider
+        self._clock = clock
+        self._max_entries = max_entries
+        self._negative_ttl = negative_ttl
+        self._entries: 'OrderedDict[int, ProcessInfo]' = OrderedDict()
+        self._negative: Dict[Tuple[int, Optional[float]], Tuple[ProcessInfo, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.stale_evictions = 0
+
+    def _get_provider(self) -> ProcessInfoProvider:
+        if self._provider is None:
+            self._provider = PsutilProcessProvider()
+        return self._provider
+
+    def get(self, pid: int) -> Optional[ProcessInfo]:
+        """获取进程信息；进程不存在时返回 None"""
+        with self._lock:
+            provider = self._get_provider()
+        # 读取进程信息不持有锁，GUI 线程的查询不必等待监控线程的整轮扫描
+        try:
+            create_time: Optional[float] = provider.create_time(pid)
+        except ProcessGone:
+            self.invalidate(pid)
+            return None
+        except ProcessAccessDenied:
+            create_time = None  # 无法校验 pid 是否被复用
+
+        with self._lock:
+            entry = self._entries.get(pid)
+            if entry is not None:
+                if entry.create_time == create_time:
+                    self.hits += 1
+                    self._entries.move_to_end(pid)
+                    return entry
+                # pid 已被新进程复用（或已无法校验）
+                self._drop(pid)
+                self.stale_evictions += 1
+
+            negative = self._negative.get((pid, create_time))
+            if negative is not None:
+                info, expires_at = negative
+                if self._clock() < expires_at:
+                    self.negative_hits += 1
+                    return info
+                del self._negative[(pid, create_time)]
+            self.misses += 1
+
+        try:
+            exe, name = provider.describe(pid)
+        except ProcessGone:
+            return None
+        except ProcessAccessDenied:
+            try:
+                name = provider.name(pid)
+            except Exception:
+                name = ''
+            info = ProcessInfo(pid, create_time or 0.0, '', '', name, denied=True)
+            with self._lock:
+                self._negative[(pid, create_time)] = (info, self._clock() + self._negative_ttl)
+            return info
+        except Exception:
+            return None
+
+        info = ProcessInfo(pid, create_time or 0.0, exe or '', normalize_path(exe), name or '')
+        if create_time is None:
+            # 没有创建时间的条目无法发现 pid 复用，不进入缓存
+            return info
+        with self._lock:
+            current = self._entries.get(pid)
+            if current is not None and current.create_time == create_time:
+                # 其他线程已写入同一进程的信息
+                return current
+            self._entries[pid] = info
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return info
+
+    def _drop(self, pid: int) -> None:
+        self._entries.pop(pid, None)
+        for key in [k for k in self._negative if k[0] == pid]:
+            del self._negative[key]
+
+    def invalidate(self, pid: int) -> None:
+        with self._lock:
+            self._drop(pid)
+
+    def retain(self, alive_pids: Iterable[int]) -> None:
+        """只保留仍存活的 pid，避免已退出进程的条目长期驻留"""
+        alive = set(alive_pids)
+        with self._lock:
+            for pid in [p for p in self._entries if p not in alive]:
+                del self._entries[pid]
+            for key in [k for k in self._negative if k[0] not in alive]:
+                del self._negative[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._negative.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """命中统计"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'negative_hits': self.negative_hits,
+                'stale_evictions': self.stale_evictions,
+                'entries': len(self._entries),
+                'negative_entries': len(self._negative),
+            }
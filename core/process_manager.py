@@ -1,179 +1,173 @@
 import psutil
 import win32gui
-import win32process
 import win32con
 import os
 import sys
-import hashlib
+import threading
 import win32api
 
 import core.skills.sys32 as sys32
 from . import make_app_icon
 from . import log_maker
+from . import window_snapshot
+from . import process_cache
+from . import fullscreen
+from . import window_rules
+from . import icon_cache
 
 log = log_maker.logger()
 
+DEFAULT_EXCEPT_PROCESSES = (
+    'shellexperiencehost.exe',
+    'applicationframehost.exe',
+    'startmenuexperiencehost.exe',
+    'widgets.exe',
+    'widgetservice.exe',
+    'SystemSettings.exe',
+    'TextInputHost.exe',
+)
 
 
 class ProcessManager:
-    def __init__(self):
-        self.except_processes = [
-            'shellexperiencehost.exe',
-            'applicationframehost.exe',
-            'startmenuexperiencehost.exe',
-            'widgets.exe',
-            'widgetservice.exe',
-            'SystemSettings.exe',
-            'TextInputHost.exe'
-        ]
-        # lazy extractor instance (复用 CatchIco 提取器，避免频繁创建)
+    def __init__(self, window_backend=None, monitor_provider=None, icon_pool=None):
+        # 排除进程与系统窗口规则（编译后不可变，更新时整体替换）
+        self.window_rules = window_rules.WindowRules(except_processes=DEFAULT_EXCEPT_PROCESSES)
+        # lazy extractor instance (复用 CatchIco 的共享提取器及其内存缓存，可在多个线程中使用)
         self._extractor = None
         try:
-            from .catch_ico import WindowsIconExtractor
+            from .catch_ico import get_shared_extractor
             # 不立即实例化过重资源，延迟在需要时创建
-            self._extractor_class = WindowsIconExtractor
+            self._extractor_factory = get_shared_extractor
         except Exception:
-            self._extractor_class = None
+            self._extractor_factory = None
+        # 跨监控周期的 pid -> exe/进程名 缓存，以进程创建时间校验
+        self.process_cache = process_cache.ProcessInfoCache()
+        # 带索引的磁盘图标缓存（索引在首次查询时加载）
+        cache_dir = os.path.join(os.getenv('LOCALAPPDATA') or os.path.expanduser("~"), 'AppIcon')
+        template_path = os.path.join(os.path.dirname(make_app_icon.overlay.__file__), "app_model.png")
+        self._icon_cache = icon_cache.IconCache(cache_dir, template_path)
+        # 窗口枚举后端（可注入假后端用于测试），延迟创建
+        self._window_backend = window_backend
+        # 全屏检测（显示器来源可注入假来源用于测试），延迟创建
+        self._monitor_provider = monitor_provider
+        self._fullscreen_detector = None
+        # 进程隔离的图标提取池（core.icon_pool.IconProcessPool），为 None 时在本进程内提取
+        self.icon_pool = icon_pool
 
     def _norm_path(self, p):
-        try:
-            return os.path.abspath(p).lower()
-        except Exception:
-            return str(p).lower()
+        return window_snapshot.normalize_path(p)
+
+    def _get_window_backend(self):
+        if self._window_backend is None:
+            self._window_backend = window_snapshot.default_backend(process_cache=self.process_cache)
+        return self._window_backend
+
+    @property
+    def window_backend(self):
+        """当前使用的窗口枚举后端"""
+        return self._get_window_backend()
+
+    def get_process_cache_stats(self):
+        """进程信息缓存的命中统计"""
+        return self.process_cache.stats()
+
+    def take_snapshot(self) -> window_snapshot.WindowSnapshot:
+        """枚举一次全部顶层窗口，供同一监控周期内的所有查询复用"""
+        return self._get_window_backend().snapshot()
+
+    def _is_excluded_process(self, process_name):
+        """是否为排除列表中的进程或程序自身"""
+        process_name = (process_name or '').lower()
+        current_process_name = os.path.basename(sys.executable).lower()
+        return process_name == current_process_name or self.window_rules.is_excluded_process(process_name)
+
+    @property
+    def except_processes(self):
+        """当前排除进程规则的原始文本（写入配置用；判定请使用 _is_excluded_process）"""
+        return list(self.window_rules.except_processes.rules)
 
     def set_except_processes(self, proc_list):
         """
         更新排除进程列表（用户可通过设置界面调用）。
         规范化为小写、去重、每项尽量带 .exe（若用户只写了进程名则自动补 .exe）。
+        支持通配符（如 wetype_*）与 "re:" 前缀的正则表达式。
         """
         try:
             if not proc_list:
                 return
             normalized = []
             for s in proc_list:
-                if not s:
-                    continue
-                if not isinstance(s, str):
-                    s = str(s)
-                s = s.strip().lower()
                 if not s:
                     continue
                 # 若用户只写了名称（例如 "python"），自动补 .exe；若已有扩展名则保留
-                if '.' not in s:
-                    s = s + '.exe'
-                if s not in normalized:
+                s = window_rules.normalize_process_rule(s)
+                if s and s not in normalized:
                     normalized.append(s)
             if normalized:
-                self.except_processes = normalized
+                self.set_window_rules(self.window_rules.with_except_processes(normalized))
         except Exception as e:
             log.error(f"设置排除进程列表时出错: {e}")
 
+    def set_window_rules(self, rules):
+        """整体替换排除/系统窗口规则（设置界面保存后热更新）"""
+        self.window_rules = rules
+        if self._fullscreen_detector is not None:
+            self._fullscreen_detector.clear()
+
     def _get_extractor(self):
-        if self._extractor is None and self._extractor_class:
+        if self._extractor is None and self._extractor_factory:
             try:
-                self._extractor = self._extractor_class()
+                self._extractor = self._extractor_factory()
             except Exception as e:
                 self._extractor = None
         return self._extractor
 
-    def is_process_running(self, app_path):
+    def is_process_running(self, app_path, snapshot=None):
         """检查指定路径的应用是否正在运行 - 仅当有可见窗口时"""
         try:
-            normalized_app = self._norm_path(app_path)
-            current_process_name = os.path.basename(sys.executable).lower()
-            
-            # 遍历所有窗口，查找与应用路径匹配的窗口
-            def enum_windows_proc(hwnd, param):
-                if not win32gui.IsWindowVisible(hwnd) or win32gui.GetWindowText(hwnd) == '':
-                    return True  # 跳过不可见或无标题窗口
-                    
-                try:
-                    # 获取窗口的进程ID
-                    _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                    proc = psutil.Process(pid)
-                    
-                    # 获取进程信息
-                    proc_path = proc.exe()
-                    process_name = proc.name().lower()
-                    
-                    # 跳过排除列表中的进程和程序本身
-                    if process_name in self.except_processes or process_name == current_process_name:
-                        return True
-                    
-                    # 比较路径是否匹配
-                    if self._norm_path(proc_path) == normalized_app:
-                        param.append(True)  # 找到匹配的窗口
-                        return False  # 停止遍历
-                        
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass  # 忽略无法访问的进程
-                except Exception as e:
-                    log.debug(f"检查窗口 {hwnd} 时出错: {e}")
-                    
-                return True  # 继续遍历
-            
-            result = []
-            win32gui.EnumWindows(enum_windows_proc, result)
-            
-            # 只有当找到对应窗口时才认为应用正在运行
-            return len(result) > 0
-            
+            if snapshot is None:
+                snapshot = self.take_snapshot()
+            for info in snapshot.visible_titled_windows(app_path):
+                # 跳过排除列表中的进程和程序本身
+                if self._is_excluded_process(info.process_name):
+                    continue
+                return True
+            return False
         except Exception as e:
             log.error(f"检查窗口时出错: {e}")
             return False
 
-    def get_running_processes(self, known_apps_paths):
+    def get_running_processes(self, known_apps_paths, snapshot=None):
         """获取系统中所有正在运行的进程，找出未添加但运行的应用"""
         running_processes = {}
         try:
-            # 先一次性枚举所有可见窗口，建立 pid -> visible-window-info 映射（提升性能）
-            pid_windows = {}
-            def _collect_windows(hwnd, param):
-                try:
-                    if win32gui.IsWindow(hwnd) and win32gui.IsWindowVisible(hwnd):
-                        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                        title = win32gui.GetWindowText(hwnd)
-                        if title and title.strip():
-                            pid_windows.setdefault(pid, []).append((hwnd, title, win32gui.GetClassName(hwnd)))
-                except Exception:
-                    pass
-                return True
-            try:
-                win32gui.EnumWindows(_collect_windows, None)
-            except Exception:
-                pass
+            if snapshot is None:
+                snapshot = self.take_snapshot()
 
             # 规范化已知应用路径，避免重复检查
             normalized_known_paths = {self._norm_path(p) for p in known_apps_paths}
-            current_process_name = os.path.basename(sys.executable).lower()
 
-            # 现在遍历进程并快速判断
-            for proc in psutil.process_iter(['pid', 'name', 'exe', 'cmdline']):
+            # 按进程遍历快照中的可见窗口
+            for pid in snapshot.pids():
                 try:
-                    process_info = proc.info
-                    exe_path = process_info.get('exe')
-                    
+                    windows = [w for w in snapshot.windows_for_pid(pid) if w.visible and w.has_title]
+                    if not windows:
+                        continue  # 没有可见窗口，跳过
+
+                    exe_path = windows[0].exe
+                    process_name = windows[0].process_name
+
                     # 基本过滤
                     if not exe_path or not os.path.exists(exe_path):
                         continue
 
                     # 检查进程名称是否在排除列表中
-                    process_name = process_info.get('name', '').lower()
-                    if process_name in self.except_processes or process_name == current_process_name:
+                    if self._is_excluded_process(process_name):
                         continue  # 跳过排除列表和程序自身
 
-                    pid = process_info.get('pid')
-                    windows = pid_windows.get(pid)
-                    if not windows:
-                        continue  # 没有可见窗口，跳过
-
                     # 过滤特殊类名的窗口
-                    valid_window_found = False
-                    for hwnd, title, cls in windows:
-                        if cls not in ["MSCTFIME UI", "IAIMETIPWndClass", "TIPBand", "Candidate"]:
-                            valid_window_found = True
-                            break
-                    if not valid_window_found:
+                    rules = self.window_rules
+                    if all(rules.is_ignored_class(info.class_name) for info in windows):
                         continue
 
                     # 检查是否已知（固定或用户添加）
@@ -181,105 +175,55 @@ class ProcessManager:
                         continue
 
                     if exe_path not in running_processes:
-                        app_name = process_info.get('name', '').replace('.exe', '')
-                        # 使用图标提取函数获取图标（可能为 None）
-                        icon_path = None
-                        try:
-                            icon_path = self.extract_icon(exe_path) or ''
-                        except Exception:
-                            icon_path = ''
+                        app_name = process_name.replace('.exe', '')
+                        # 只读取已缓存的图标，未缓存的由界面异步提取（core.icon_loader）
+                        icon_path = self.cached_icon(exe_path) or ''
                         running_processes[exe_path] = {
                             'name': app_name,
                             'path': exe_path,
                             'icon': icon_path
                         }
 
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
                 except Exception as e:
-                    log.debug(f"处理进程 {process_info.get('name', 'Unknown')} 时出错: {e}")
+                    log.debug(f"处理进程 {pid} 时出错: {e}")
                     continue
         except Exception as e:
             log.error(f"获取运行进程时出错: {e}")
         
         return running_processes
 
-    def get_app_visible_windows(self, app_path):
+    def get_app_visible_windows(self, app_path, snapshot=None):
         """获取应用的所有可见窗口"""
         try:
-            app_filename = os.path.basename(app_path).lower()
-            
+            if snapshot is None:
+                snapshot = self.take_snapshot()
             visible_windows = []
-            
-            def enum_windows_proc(hwnd, param):
-                if win32gui.IsWindowVisible(hwnd) and win32gui.GetWindowText(hwnd) != '':
-                    try:
-                        # 获取窗口的进程ID
-                        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                        proc = psutil.Process(pid)
-                        
-                        # 获取进程的可执行文件路径
-                        proc_path = proc.exe().lower()
-                        normalized_app_path = os.path.abspath(app_path).lower()
-                        
-                        # 比较路径是否匹配
-                        if os.path.abspath(proc_path).lower() == normalized_app_path:
-                            # 检查是否为系统服务或程序本身
-                            process_name = proc.name().lower()
-                            
-                            # 检查是否为系统服务
-                            if process_name in self.except_processes:
-                                return True  # 继续遍历，但不添加到结果中
-                            
-                            # 检查是否为程序本身
-                            current_process_name = os.path.basename(sys.executable).lower()
-                            if process_name == current_process_name.lower():
-                                return True  # 继续遍历，但不添加到结果中
-                            
-                            # 获取窗口标题
-                            window_title = win32gui.GetWindowText(hwnd)
-                            
-                            # 窗口存在且可见，添加到结果列表
-                            param.append((hwnd, window_title))
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                        pass
-                    except Exception as e:
-                        log.debug(f"检查窗口 {hwnd} 时出错: {e}")
-                return True  # 继续遍历
-            
-            win32gui.EnumWindows(enum_windows_proc, visible_windows)
-            
+            for info in snapshot.visible_titled_windows(app_path):
+                # 检查是否为系统服务或程序本身
+                if self._is_excluded_process(info.process_name):
+                    continue
+                # 窗口存在且可见，添加到结果列表
+                visible_windows.append((info.hwnd, info.title))
             return visible_windows
         except Exception as e:
             log.error(f"检查窗口时出错: {e}")
             return []
 
-    def close_app_window(self, app_path):
+    def close_app_window(self, app_path, snapshot=None):
         """关闭应用窗口"""
-        app_filename = os.path.basename(app_path)
-        
-        def enum_windows_proc(hwnd, param):
-            if win32gui.IsWindowVisible(hwnd):
-                try:
-                    # 获取窗口的进程ID
-                    _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                    proc = psutil.Process(pid)
-                    
-                    # 检查进程名称是否匹配
-                    if proc.name().lower() == app_filename.lower():
-                        # 检查窗口标题是否为空（避免关闭系统窗口）
-                        window_title = win32gui.GetWindowText(hwnd)
-                        if window_title.strip() != '':
-                            # 尝试优雅地关闭窗口
-                            win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
-                            log.info(f"已发送关闭命令到窗口: {window_title}")
-                            return False  # 找到并处理了窗口，停止枚举
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-            return True  # 继续枚举其他窗口
+        app_filename = os.path.basename(app_path).lower()
 
         try:
-            win32gui.EnumWindows(enum_windows_proc, 0)
+            if snapshot is None:
+                snapshot = self.take_snapshot()
+            for info in snapshot:
+                # 检查进程名称是否匹配，且窗口标题不为空（避免关闭系统窗口）
+                if not info.visible or info.process_name.lower() != app_filename or not info.has_title:
+                    continue
+                # 尝试优雅地关闭窗口
+                win32gui.PostMessage(info.hwnd, win32con.WM_CLOSE, 0, 0)
+                log.info(f"已发送关闭命令到窗口: {info.title}")
+                break  # 找到并处理了窗口，停止枚举
         except Exception as e:
             log.error(f"关闭窗口时出错: {e}")
 
@@ -293,15 +237,9 @@ class ProcessManager:
                 try:
                     process_info = proc.info
                     if process_info['exe'] and os.path.abspath(process_info['exe']) == os.path.abspath(app_path):
-                        # 检查是否为系统服务
-                        process_name = process_info['name'].lower()
-                        if process_name in self.except_processes:
-                            continue  # 跳过系统服务
-                        
-                        # 检查是否为程序本身
-                        current_process_name = os.path.basename(sys.executable).lower()
-                        if process_name == current_process_name:
-                            continue  # 跳过程序自身
+                        # 跳过排除规则中的系统进程与程序自身
+                        if self._is_excluded_process(process_info['name']):
+                            continue
                         
                         # 终止进程
                         proc.terminate()
@@ -314,34 +252,75 @@ class ProcessManager:
         except Exception as e:
             log.error(f"终止应用进程时出错: {e}")
             
-    def extract_icon(self, exe_path):
-        """提取图标，使用CatchIco.py中的功能并通过 MakeAppIcon.compose_on_template 生成统一风格图标"""
+    def _get_icon_cache(self):
+        return self._icon_cache
+
+    @property
+    def icon_cache(self):
+        """磁盘图标缓存（core.icon_cache.IconCache）"""
+        return self._get_icon_cache()
+
+    def icon_memory_cache_stats(self):
+        """提取器内存缓存统计（命中/未命中/淘汰/字节数），提取器不可用时返回空字典"""
+        extractor = self._get_extractor()
+        return extractor.cache_stats() if extractor else {}
+
+    def icon_cache_path(self, exe_path):
+        """应用图标的缓存文件路径"""
+        return self._get_icon_cache().file_for(exe_path)
+
+    def cached_icon(self, exe_path):
+        """有效的已生成图标路径，未缓存或已失效时返回 None（不做任何提取，可在 GUI 线程调用）"""
         try:
-            # 使用包含路径哈希的缓存名，避免不同路径同名冲突
-            cache_dir = os.path.join(os.getenv('LOCALAPPDATA') or os.path.expanduser("~"), 'AppIcon')
-            os.makedirs(cache_dir, exist_ok=True)
-            name = os.path.splitext(os.path.basename(exe_path))[0]
-            md5 = hashlib.md5((os.path.abspath(exe_path)).encode('utf-8')).hexdigest()[:8]
-            icon_path = os.path.join(cache_dir, f"{name}_{md5}.png")
-            if os.path.exists(icon_path):
-                return icon_path
-            extractor = self._get_extractor()
-            if not extractor:
+            return self._get_icon_cache().lookup(exe_path)
+        except Exception:
+            return None
+
+    def set_icon_pool(self, pool):
+        """设置（或取消）进程隔离的图标提取池，返回原来的池以便调用方关闭"""
+        old, self.icon_pool = self.icon_pool, pool
+        return old
+
+    def _extract_image(self, exe_path, size=64):
+        """提取图标为 PIL 图像：设置了 icon_pool 时在工作进程中提取，否则使用本进程的提取器"""
+        pool = self.icon_pool
+        if pool is not None:
+            result = pool.extract(exe_path, size)
+            if not result.success:
+                log.debug(f"工作进程提取图标失败 {exe_path}: {result.error}")
                 return None
+            from PIL import Image
+            return Image.frombuffer('RGB', (result.width, result.height), result.pixels, 'raw', 'BGRX', 0, 1)
+        extractor = self._get_extractor()
+        if not extractor:
+            return None
+        extracted_icon = extractor.extract_file_icon(exe_path, size=size)
+        return extracted_icon.image if extracted_icon.success else None
 
-            extracted_icon = extractor.extract_file_icon(exe_path, size=64)
-            if extracted_icon.success and extracted_icon.image:
+    def extract_icon(self, exe_path):
+        """提取图标，使用CatchIco.py中的功能并通过 MakeAppIcon.compose_on_template（共享的 IconCompositor，模板只加载一次）生成统一风格图标"""
+        try:
+            cache = self._get_icon_cache()
+            cached = cache.lookup(exe_path)
+            if cached:
+                return cached
+            icon_path = cache.file_for(exe_path)
+            image = self._extract_image(exe_path)
+            if image is not None:
                 try:
                     # 优先使用合成库生成统一风格图标
+                    # 先写临时文件再替换，避免其他线程读到写了一半的图标
+                    tmp_path = f"{icon_path}.{threading.get_ident()}.tmp"
                     try:
-                        composed_bytes = make_app_icon.overlay.compose_on_template(extracted_icon.image)
-                        with open(icon_path, "wb") as f:
+                        composed_bytes = make_app_icon.overlay.compose_on_template(image)
+                        with open(tmp_path, "wb") as f:
                             f.write(composed_bytes)
-                        return icon_path
                     except Exception:
                         # 合成失败则回退为直接保存提取到的图像
-                        extracted_icon.image.save(icon_path)
-                        return icon_path
+                        image.save(tmp_path, format="PNG")
+                    os.replace(tmp_path, icon_path)
+                    cache.store(exe_path, icon_path)
+                    return icon_path
                 except Exception as e:
                     log.error(f"保存/合成图标时出错: {e}")
                     return None
@@ -351,135 +330,60 @@ class ProcessManager:
             log.error(f"使用图标提取器出错: {e}")
             return None
 
+    def _get_fullscreen_detector(self):
+        if self._fullscreen_detector is None:
+            if self._monitor_provider is None:
+                if fullscreen.PYWIN32_AVAILABLE:
+                    self._monitor_provider = fullscreen.Win32MonitorProvider(fallback=sys32.REAL_SCREEN_RECT)
+                else:
+                    self._monitor_provider = fullscreen.FakeMonitorProvider()
+            self._fullscreen_detector = fullscreen.FullscreenDetector(
+                self._monitor_provider, rules=lambda: self.window_rules
+            )
+        return self._fullscreen_detector
+
+    @property
+    def fullscreen_detector(self):
+        """全屏检测器（显示器变化时需调用其 invalidate_monitors）"""
+        return self._get_fullscreen_detector()
+
     def is_window_fullscreen(self, hwnd) -> bool:
         """判断给定窗口句柄是否处于全屏状态"""
         try:
-            if not win32gui.IsWindow(hwnd) or not win32gui.IsWindowVisible(hwnd):
+            info = self._get_window_backend().query(hwnd)
+            if info is None or not info.visible:
                 return False
-            
-            sys32._user32.SetProcessDPIAware()
-            rect = sys32.get_window_rect(hwnd)
-            #print(rect)
-            return (rect[2] >= sys32.REAL_SCREEN_WIDTH and rect[3] >= sys32.REAL_SCREEN_HEIGHT)
+            return self._is_rect_fullscreen(info.rect)
         except Exception:
             return False
 
-    def is_app_fullscreen(self, app_path) -> bool:
+    def _is_rect_fullscreen(self, rect) -> bool:
+        """判断窗口矩形是否覆盖整个屏幕（任意显示器）"""
+        return self._get_fullscreen_detector().is_rect_fullscreen(rect)
+
+    def is_app_fullscreen(self, app_path, snapshot=None) -> bool:
         """判断指定应用（路径）是否有任意可见窗口处于全屏"""
         try:
-            visible = self.get_app_visible_windows(app_path)
-            for hwnd, _ in visible:
-                if self.is_window_fullscreen(hwnd):
+            if snapshot is None:
+                snapshot = self.take_snapshot()
+            for info in snapshot.visible_titled_windows(app_path):
+                if self._is_rect_fullscreen(info.rect):
                     return True
         except Exception:
             pass
         return False
 
 
-    def get_fullscreen_windows(self):
-        """获取所有全屏窗口的句柄列表，忽略系统窗口"""
-        fullscreen_windows = []
-        
-        def is_system_window(hwnd):
-            """检查窗口是否为系统窗口（桌面、任务栏等）"""
-            try:
-                class_name = win32gui.GetClassName(hwnd)
-                window_title = win32gui.GetWindowText(hwnd)
-                
-                # 常见系统窗口类名
-                system_classes = [
-                    "Progman",           # 程序管理器（桌面）
-                    "WorkerW",           # Worker窗口（桌面背景）
-                    "Shell_TrayWnd",     # 任务栏
-                    "Windows.UI.Core.CoreWindow",  # Windows核心UI窗口
-                    "EdgeUiInputWndClass",  # Windows边缘UI
-                    "ImmersiveLauncher", # 沉浸式启动器（开始菜单）
-                    "ApplicationFrameWindow",  # UWP应用框架
-                    "MsgrHTMLWndClass",  # Messenger HTML窗口
-                    "Internet Explorer_Hidden",  # IE隐藏窗口
-                    "MSCTFIME UI",       # 输入法UI
-                    "TrayNotifyWnd",     # 通知区域
-                    "DV2ControlHost",    # 桌面窗口管理器控制主机
-                    "NativeHWNDHost",    # 原生HWND主机
-                    "ToolbarWindow32",   # 工具栏窗口
-                    "ReBarWindow32",     # ReBar窗口
-                    "MSTaskSwWClass",    # 任务切换窗口
-                    "Shell_SecondaryTrayWnd",  # 副显示器任务栏
-                    "SysListView32",     # 系统列表视图（桌面图标）
-                    "DirectUIHWND",      # DirectUI窗口
-                    "Breadcrumb Parent", # 面包屑导航父窗口
-                    "Search Box",        # 搜索框
-                    "SearchEditBox",     # 搜索编辑框
-                    "SearchDialog",      # 搜索对话框
-                ]
-                
-                # 常见系统窗口标题模式
-                system_title_patterns = [
-                    "Program Manager",
-                    "Windows Shell Experience Host",
-                    "Start",
-                    "Settings",
-                    "Microsoft Text Input Application",
-                    "Cortana",
-                    "Search",
-                    "通知",
-                    "Action Center",
-                    "Windows Explorer",
-                ]
-                
-                # 检查窗口类名
-                if class_name in system_classes:
-                    return True
-                
-                # 检查窗口标题是否匹配系统模式
-                for pattern in system_title_patterns:
-                    if pattern in window_title:
-                        return True
-                
-                # 检查是否为桌面窗口（空标题或特定标题且类名为Progman或WorkerW）
-                if class_name in ["Progman", "WorkerW"]:
-                    # 桌面窗口通常没有标题或有特定标题
-                    if not window_title.strip() or window_title == "Program Manager":
-                        return True
-                
-                # 检查进程是否为explorer.exe且窗口是桌面相关类
-                try:
-                    _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                    proc = psutil.Process(pid)
-                    proc_name = proc.name().lower()
-                    
-                    # 如果是explorer.exe且窗口类是桌面相关的，则认为是系统窗口
-                    if proc_name == "explorer.exe" and class_name in ["Progman", "WorkerW", "SysListView32"]:
-                        return True
-                    
-                    # 检查是否在排除进程列表中
-                    if proc_name in self.except_processes:
-                        return True
-                        
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-                except Exception:
-                    pass
-                
-                return False
-            except Exception:
-                return False  # 出错时保守返回非系统窗口
-        
-        def callback(hwnd, _):
-            try:
-                if not win32gui.IsWindowVisible(hwnd):
-                    return True
-                
-                # 跳过系统窗口
-                if is_system_window(hwnd):
-                    return True
-                
-                # 检查是否为全屏窗口
-                if self.is_window_fullscreen(hwnd):
-                    fullscreen_windows.append(hwnd)
-            except Exception:
-                pass
-            return True
-        
-        win32gui.EnumWindows(callback, None)
-        return fullscreen_windows
+    def get_fullscreen_windows(self, snapshot=None, foreground_hwnd=None):
+        """获取全屏窗口的句柄列表，忽略系统窗口；只检查前台窗口与各显示器最顶层的窗口"""
+        try:
+            if snapshot is None:
+                snapshot = self.take_snapshot()
+            backend = self._get_window_backend()
+            if foreground_hwnd is None:
+                foreground_hwnd = backend.foreground()
+            # 事件跟踪的快照可能尚未反映前台窗口的最新矩形，前台窗口实时查询
+            return self._get_fullscreen_detector().fullscreen_windows(snapshot, foreground_hwnd, query=backend.query)
+        except Exception as e:
+            log.debug(f"检测全屏窗口时出错: {e}")
+            return []
@@ -0,0 +1,248 @@
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, Optional, Tuple
+
+from PySide6.QtCore import QThread, Signal
+
+from . import log_maker
+from .window_snapshot import WindowSnapshot, normalize_path
+
+log = log_maker.logger()
+
+
+@dataclass(frozen=True)
+class AppState:
+    """单个正在运行的应用在一次扫描中的状态"""
+    name: str
+    path: str
+    icon: str
+    known: bool                   # 是否为固定/用户添加的应用（否则为未添加的运行中应用）
+    titles: Tuple[str, ...]       # 可见窗口标题
+
+    @property
+    def key(self) -> Tuple[bool, str, str]:
+        return (self.known, self.name, normalize_path(self.path))
+
+    @property
+    def window_count(self) -> int:
+        return len(self.titles)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {'name': self.name, 'path': self.path, 'icon': self.icon}
+
+
+@dataclass(frozen=True)
+class RunningDelta:
+    """两次扫描之间的运行状态变化"""
+    started: Tuple[AppState, ...] = ()
+    exited: Tuple[AppState, ...] = ()
+    window_count_changed: Tuple[Tuple[AppState, int], ...] = ()        # (新状态, 原窗口数)
+    title_changed: Tuple[Tuple[AppState, Tuple[str, ...]], ...] = ()   # (新状态, 原标题)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.started or self.exited or self.window_count_changed or self.title_changed)
+
+
+@dataclass(frozen=True)
+class MonitorResult:
+    """一次后台扫描的不可变结果，通过排队信号交给 UI 线程"""
+    seq: int                                  # 扫描序号（单调递增）
+    generation: int                           # 扫描时的应用列表版本
+    apps: Tuple[AppState, ...]                # 全部正在运行的应用（已知 + 未添加）
+    has_fullscreen: bool                      # 是否存在全屏窗口
+    snapshot: WindowSnapshot                  # 本次扫描使用的窗口快照
+    duration: float                           # 扫描耗时（秒）
+    base_seq: int = 0                         # delta 相对的扫描序号
+    delta: RunningDelta = RunningDelta()      # 相对 base_seq 的变化
+
+    @property
+    def running(self) -> Tuple[Tuple[str, str], ...]:
+        """已知应用中正在运行的 (name, path)"""
+        return tuple((app.name, app.path) for app in self.apps if app.known)
+
+    @property
+    def unpinned(self) -> Tuple[AppState, ...]:
+        """未添加但正在运行的应用"""
+        return tuple(app for app in self.apps if not app.known)
+
+    def running_dict(self) -> Dict[str, str]:
+        return dict(self.running)
+
+
+def compute_delta(previous: Optional[MonitorResult], current: MonitorResult) -> RunningDelta:
+    """计算两次扫描结果之间的变化；previous 为空时全部视为新启动"""
+    old = {app.key: app for app in previous.apps} if previous is not None else {}
+    new = {app.key: app for app in current.apps}
+    started = tuple(app for key, app in new.items() if key not in old)
+    exited = tuple(app for key, app in old.items() if key not in new)
+    count_changed = []
+    title_changed = []
+    for key, app in new.items():
+        before = old.get(key)
+        if before is None:
+            continue
+        if before.window_count != app.window_count:
+            count_changed.append((app, before.window_count))
+        elif before.titles != app.titles:
+            title_changed.append((app, before.titles))
+    return RunningDelta(started, exited, tuple(count_changed), tuple(title_changed))
+
+
+class ProcessMonitorWorker(QThread):
+    """
+    进程/窗口监控线程，适配 core.threads.manager.ThreadManager
+
+    - 所有枚举都在本线程完成，结果以 MonitorResult 通过 result_ready 发出
+    - 单线程循环保证扫描不会重叠，扫描期间的多次请求合并为一次
+    - 结果携带应用列表版本号，UI 可用 is_stale() 丢弃过期结果
+    - 提供 scheduler（core.monitor_scheduler.MonitorScheduler）时按自适应节奏扫描，否则使用固定 interval
+    """
+
+    result_ready = Signal(object)
+    errorOccurred = Signal(str)
+
+    def __init__(self, process_manager, tracker=None, interval: float = 1.4,
+                 reconcile_interval: float = 15.0, scheduler=None, parent=None):
+        super().__init__(parent)
+        self._name = "ProcessMonitor"
+        self._process_manager = process_manager
+        self._tracker = tracker
+        self._scheduler = scheduler
+        self._interval = interval
+        self._reconcile_interval = reconcile_interval
+        self._last_reconcile = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._apps: Tuple[Tuple[str, str], ...] = ()
+        self._generation = 0
+        self._seq = 0
+        self._previous: Optional[MonitorResult] = None
+
+        self._paused = False
+        self._trigger = threading.Event()
+
+    # 线程控制方法
+    def get_name(self) -> str:
+        return self._name
+
+    def pause(self):
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        self._trigger.set()
+
+    def is_paused(self) -> bool:
+        return self._paused
+
+    def quit(self):
+        """请求停止并唤醒等待中的循环"""
+        self.requestInterruption()
+        self._trigger.set()
+        super().quit()
+
+    # 数据接口（可在任意线程调用）
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set_apps(self, apps: Iterable[Dict]) -> None:
+        """更新需要检查运行状态的已知应用；列表变化时递增版本号并立即触发扫描"""
+        new_apps = tuple((app['name'], app['path']) for app in apps)
+        with self._lock:
+            if new_apps == self._apps:
+                return
+            self._apps = new_apps
+            self._generation += 1
+        self._trigger.set()
+
+    def request_scan(self) -> None:
+        """请求尽快扫描一次（扫描进行中时合并到下一次）"""
+        self._trigger.set()
+
+    def is_stale(self, result: MonitorResult) -> bool:
+        """结果扫描期间应用列表已变化，则为过期结果"""
+        return result.generation != self.generation
+
+    def _wait_interval(self) -> float:
+        live = self._tracker is not None and self._tracker.is_live
+        scheduler = self._scheduler
+        if scheduler is None:
+            return self._reconcile_interval if live else self._interval
+        interval = scheduler.next_interval()
+        if live and not scheduler.is_boosted:
+            # 事件驱动时变化由事件触发扫描，仅加速期内需要主动轮询
+            return max(interval, self._reconcile_interval)
+        return interval
+
+    def _take_snapshot(self) -> WindowSnapshot:
+        tracker = self._tracker
+        if tracker is not None and tracker.is_live:
+            # 事件驱动模式下仅低频全量校正
+            if time.monotonic() - self._last_reconcile >= self._reconcile_interval:
+                corrections = tracker.reconcile()
+                self._last_reconcile = time.monotonic()
+                if corrections:
+                    log.debug(f"窗口状态校正: 修正 {corrections} 个窗口")
+            return tracker.snapshot()
+        return self._process_manager.take_snapshot()
+
+    def scan(self) -> MonitorResult:
+        """执行一次完整扫描"""
+        with self._lock:
+            apps, generation = self._apps, self._generation
+        self._seq += 1
+        started = time.monotonic()
+        pm = self._process_manager
+
+        snapshot = self._take_snapshot()
+        if self._scheduler is not None:
+            self._scheduler.observe(snapshot.signature())
+        states = []
+        for name, path in apps:
+            windows = pm.get_app_visible_windows(path, snapshot)
+            if windows:
+                states.append(AppState(name, path, '', True, tuple(title for _, title in windows)))
+        processes = pm.get_running_processes([path for _, path in apps], snapshot)
+        for info in processes.values():
+            titles = tuple(title for _, title in pm.get_app_visible_windows(info['path'], snapshot))
+            states.append(AppState(info['name'], info['path'], info.get('icon') or '', False, titles))
+        has_fullscreen = len(pm.get_fullscreen_windows(snapshot)) > 0
+
+        result = MonitorResult(
+            seq=self._seq,
+            generation=generation,
+            apps=tuple(states),
+            has_fullscreen=has_fullscreen,
+            snapshot=snapshot,
+            duration=time.monotonic() - started,
+        )
+        previous = self._previous
+        result = replace(
+            result,
+            base_seq=previous.seq if previous is not None else 0,
+            delta=compute_delta(previous, result),
+        )
+        self._previous = result
+        return result
+
+    def run(self):
+        log.info(f"进程监控线程开始运行: {self.get_name()}")
+        while not self.isInterruptionRequested():
+            if self._paused:
+                self._trigger.wait(1)
+                self._trigger.clear()
+                continue
+
+            try:
+                self.result_ready.emit(self.scan())
+            except Exception as e:
+                # 单次扫描失败不影响后续扫描
+                log.error(f"后台检查运行进程时出错: {e}")
+
+            self._trigger.wait(self._wait_interval())
+            self._trigger.clear()
+        log.info(f"进程监控线程运行结束: {self.get_name()}")
@@ -9,6 +9,7 @@ import datetime
 import requests
 import core.config_manager as Config
 from core import log_maker
+from core import window_rules
 
 import BlurWindow.blurWindow as blurWindow
 
@@ -71,6 +72,7 @@ class SettingsUI(QDialog):
         self.tabWidget.addTab(self.general, "")
 
         self.dock = QWidget()
+        self.verticalLayout_2 = QVBoxLayout(self.dock)
 
         self.except_apps = QGroupBox(self.dock)
         self.verticalLayout = QVBoxLayout(self.except_apps)
@@ -84,8 +86,30 @@ class SettingsUI(QDialog):
         self.plainTextEdit.setPlaceholderText(u"例如：notepad.exe\\nmsedge.exe")
         self.verticalLayout.addWidget(self.plainTextEdit)
 
+        self.verticalLayout_2.addWidget(self.except_apps)
 
-        #self.verticalLayout_2.addWidget(self.except_apps)
+        self.system_windows = QGroupBox(self.dock)
+        self.system_windows_layout = QVBoxLayout(self.system_windows)
+
+        self.system_windows_tips_label = QLabel(self.system_windows)
+        self.system_windows_tips_label.setWordWrap(True)
+        self.system_windows_layout.addWidget(self.system_windows_tips_label)
+
+        self.system_classes_label = QLabel(self.system_windows)
+        self.system_windows_layout.addWidget(self.system_classes_label)
+
+        self.system_classes_edit = QPlainTextEdit(self.system_windows)
+        self.system_classes_edit.setStyleSheet(u"background: #EEEEEE")
+        self.system_windows_layout.addWidget(self.system_classes_edit)
+
+        self.system_titles_label = QLabel(self.system_windows)
+        self.system_windows_layout.addWidget(self.system_titles_label)
+
+        self.system_titles_edit = QPlainTextEdit(self.system_windows)
+        self.system_titles_edit.setStyleSheet(u"background: #EEEEEE")
+        self.system_windows_layout.addWidget(self.system_titles_edit)
+
+        self.verticalLayout_2.addWidget(self.system_windows)
 
         self.tabWidget.addTab(self.dock, "")
 
@@ -193,7 +217,11 @@ class SettingsUI(QDialog):
         self.enable_debug.setText(u"启用debug日志")
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.general), u"通用")
         self.except_apps.setTitle(u"排除的应用")
-        self.except_apps_tips_label.setText(u"键入进程名（每行一个，无需.exe后缀）")
+        self.except_apps_tips_label.setText(u"键入进程名（每行一个，无需.exe后缀；支持 * ? 通配符，以 re: 开头为正则表达式）")
+        self.system_windows.setTitle(u"系统窗口")
+        self.system_windows_tips_label.setText(u"匹配的窗口不参与全屏检测。每行一条规则，写法同上（类名与标题区分大小写）")
+        self.system_classes_label.setText(u"窗口类名：")
+        self.system_titles_label.setText(u"窗口标题：")
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.dock), u"Dock")
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.notify), u"通知")
         self.notify_group.setTitle(u"通知选项")
@@ -225,6 +253,12 @@ class SettingsUI(QDialog):
         except_list = dock_config.get('except_processes', [])
         self.plainTextEdit.setPlainText('\n'.join(except_list))
 
+        rules_config = dock_config.get('window_rules') or {}
+        self.system_classes_edit.setPlainText(
+            '\n'.join(rules_config.get('system_classes', window_rules.DEFAULT_SYSTEM_CLASSES)))
+        self.system_titles_edit.setPlainText(
+            '\n'.join(rules_config.get('system_titles', window_rules.DEFAULT_SYSTEM_TITLES)))
+
         notify_config = self.config_data.get('notify', {})
         timeout = notify_config.get('default_timeout', 0)
         self.notify_timeout_spin.setValue(timeout)
@@ -279,9 +313,12 @@ class SettingsUI(QDialog):
 
     def collect_settings(self):
         dock_config = self.config_data.get('dock', {})
-        dock_config['except_processes'] = [
-            line.strip() for line in self.plainTextEdit.toPlainText().split('\n') if line.strip()
-        ]
+        dock_config['except_processes'] = self._text_lines(self.plainTextEdit)
+
+        rules_config = dict(dock_config.get('window_rules') or {})
+        rules_config['system_classes'] = self._text_lines(self.system_classes_edit)
+        rules_config['system_titles'] = self._text_lines(self.system_titles_edit)
+        dock_config['window_rules'] = rules_config
 
         notify_config = self.config_data.get('notify', {})
         notify_config['default_timeout'] = self.notify_timeout_spin.value()
@@ -290,10 +327,21 @@ class SettingsUI(QDialog):
         self.config_data['dock'] = dock_config
         self.config_data['notify'] = notify_config
 
+    @staticmethod
+    def _text_lines(edit: QPlainTextEdit):
+        return [line.strip() for line in edit.toPlainText().split('\n') if line.strip()]
+
     def save_settings(self):
         try:
             self.collect_settings()
 
+            # 保存前先编译规则，避免写入无效的正则
+            try:
+                window_rules.WindowRules.from_config(self.config_data.get('dock', {}))
+            except window_rules.RuleError as e:
+                self.upd_status(f"规则无效: {e}", "error")
+                return
+
             if self.config_path:
                 Config.save_config(self.config_path, self.config_data)
 
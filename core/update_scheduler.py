@@ -0,0 +1,110 @@
+from typing import Callable, Dict, List, Tuple
+
+from PySide6.QtCore import QObject, QTimer
+
+from . import log_maker
+
+log = log_maker.logger()
+
+# dock 使用的更新阶段，按注册顺序执行
+PROCESSES = 'processes'  # 请求后台重新扫描进程
+BUTTONS = 'buttons'      # 协调应用按钮
+LAYOUT = 'layout'        # 容器可见性 + 窗口几何/动画
+
+FRAME_INTERVAL = 16  # 毫秒，约一帧
+
+
+class UpdateScheduler(QObject):
+    """
+    按帧合并的更新调度器（仅在 GUI 线程使用）
+
+    - request(*flags) 只标记脏标志，同一帧内的多次请求在下一帧合并为一次执行
+    - 各阶段按注册顺序执行；执行中请求的后续阶段（如按钮变化后需要重新布局）在同一轮完成，
+      请求的已执行阶段留到下一帧
+    - request(..., delay=毫秒) 为延迟请求：同一标志的延迟请求互相合并，以最后一次请求为准
+    - 记录请求数、执行轮数与被合并的请求数
+    """
+
+    def __init__(self, parent=None, interval: int = FRAME_INTERVAL):
+        super().__init__(parent)
+        self._stages: List[Tuple[str, Callable[[], None]]] = []
+        self._dirty = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+        self._delayed: Dict[str, QTimer] = {}
+        self._flushing = False
+        self._batch = 0
+        self.requests = 0
+        self.flushes = 0
+        self.runs: Dict[str, int] = {}
+        self.max_batch = 0
+
+    def register(self, flag: str, callback: Callable[[], None]) -> None:
+        self._stages.append((flag, callback))
+        self.runs.setdefault(flag, 0)
+
+    def request(self, *flags: str, delay: int = 0) -> None:
+        if delay > 0:
+            for flag in flags:
+                self._request_later(flag, delay)
+            return
+        for flag in flags:
+            self.requests += 1
+            self._batch += 1
+            self._dirty.add(flag)
+        if not self._flushing and not self._timer.isActive():
+            self._timer.start()
+
+    def _request_later(self, flag: str, delay: int) -> None:
+        timer = self._delayed.get(flag)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda f=flag: self.request(f))
+            self._delayed[flag] = timer
+        elif timer.isActive():
+            self.requests += 1  # 被之后的延迟请求取代，计为已合并
+        timer.start(delay)
+
+    def flush(self) -> None:
+        """立即执行所有脏阶段"""
+        self._timer.stop()
+        if not self._dirty:
+            return
+        self.flushes += 1
+        self.max_batch = max(self.max_batch, self._batch)
+        self._batch = 0
+        self._flushing = True
+        try:
+            for flag, callback in self._stages:
+                if flag not in self._dirty:
+                    continue
+                self._dirty.discard(flag)
+                self.runs[flag] += 1
+                try:
+                    callback()
+                except Exception as e:
+                    log.error(f"执行更新阶段 {flag} 时出错: {e}")
+        finally:
+            self._flushing = False
+        if self._dirty:
+            self._timer.start()
+
+    def cancel(self) -> None:
+        self._timer.stop()
+        for timer in self._delayed.values():
+            timer.stop()
+        self._dirty.clear()
+
+    def stats(self) -> Dict[str, object]:
+        executed = sum(self.runs.values())
+        return {
+            'requests': self.requests,
+            'flushes': self.flushes,
+            'executed': executed,
+            'merged': max(0, self.requests - executed - len(self._dirty)),
+            'max_batch': self.max_batch,
+            'runs': dict(self.runs),
+        }
@@ -0,0 +1,406 @@
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# 可选依赖（非Windows环境下仅可使用 DictRegistryReader）
+try:
+    import winreg
+    WINREG_AVAILABLE = True
+except ImportError:
+    WINREG_AVAILABLE = False
+
+from . import log_maker
+
+log = log_maker.logger()
+
+FAMILIES_KEY = (r"SOFTWARE\Classes\Local Settings\Software\Microsoft\Windows\CurrentVersion"
+                r"\AppModel\Repository\Families")
+INDEX_FORMAT = 1
+# 清单中的 Logo 通常只是逻辑名，磁盘上是带缩放后缀的文件
+LOGO_QUALIFIERS = ("", ".scale-100", ".scale-200", ".scale-150", ".scale-400", ".targetsize-256", ".targetsize-48")
+
+
+# ====================== 注册表读取 ======================
+
+class RegistryReader:
+    """注册表只读接口（路径使用反斜杠分隔，相对于同一个根键）"""
+
+    def subkeys(self, path: str) -> List[str]:
+        """子键名称；键不存在时返回空列表"""
+        raise NotImplementedError
+
+    def values(self, path: str) -> Dict[str, str]:
+        """字符串值；键不存在时返回空字典"""
+        raise NotImplementedError
+
+    def last_write(self, path: str) -> Optional[int]:
+        """键的最后写入时间（任意单调的整数），键不存在时返回 None"""
+        raise NotImplementedError
+
+
+class WinRegReader(RegistryReader):
+    """基于 winreg 的实现"""
+
+    def __init__(self, root=None):
+        if not WINREG_AVAILABLE:
+            raise RuntimeError("winreg 不可用，无法使用 WinRegReader")
+        self._root = winreg.HKEY_LOCAL_MACHINE if root is None else root
+
+    def _open(self, path: str):
+        return winreg.OpenKey(self._root, path)
+
+    def subkeys(self, path: str) -> List[str]:
+        try:
+            with self._open(path) as key:
+                return [winreg.EnumKey(key, i) for i in range(winreg.QueryInfoKey(key)[0])]
+        except OSError:
+            return []
+
+    def values(self, path: str) -> Dict[str, str]:
+        result = {}
+        try:
+            with self._open(path) as key:
+                for i in range(winreg.QueryInfoKey(key)[1]):
+                    name, value, _ = winreg.EnumValue(key, i)
+                    if isinstance(value, str):
+                        result[name] = value
+        except OSError:
+            pass
+        return result
+
+    def last_write(self, path: str) -> Optional[int]:
+        try:
+            with self._open(path) as key:
+                return winreg.QueryInfoKey(key)[2]
+        except OSError:
+            return None
+
+
+class DictRegistryReader(RegistryReader):
+    """
+    基于字典的假注册表，用于测试
+
+    tree 为 {完整路径: {'values': {...}, 'last_write': 整数}}，中间键自动补齐；
+    修改 tree 后调用 touch(path) 模拟写入（递增该键的最后写入时间）。
+    """
+
+    def __init__(self, tree: Mapping[str, Mapping] = ()):
+        self._keys: Dict[str, Dict] = {}
+        self.reads = 0
+        for path, node in dict(tree).items():
+            self.set_key(path, node.get('values'), node.get('last_write', 1))
+
+    @staticmethod
+    def _norm(path: str) -> str:
+        return path.strip("\\").lower()
+
+    def set_key(self, path: str, values: Optional[Mapping[str, str]] = None, last_write: int = 1) -> None:
+        parts = path.strip("\\").split("\\")
+        for i in range(1, len(parts)):
+            self._keys.setdefault(self._norm("\\".join(parts[:i])),
+                                  {'name': parts[i - 1], 'values': {}, 'last_write': last_write})
+        self._keys[self._norm(path)] = {'name': parts[-1], 'values': dict(values or {}), 'last_write': last_write}
+
+    def delete_key(self, path: str) -> None:
+        prefix = self._norm(path)
+        for key in [k for k in self._keys if k == prefix or k.startswith(prefix + "\\")]:
+            del self._keys[key]
+
+    def touch(self, path: str) -> None:
+        node = self._keys.get(self._norm(path))
+        if node is not None:
+            node['last_write'] += 1
+
+    def subkeys(self, path: str) -> List[str]:
+        self.reads += 1
+        prefix = self._norm(path) + "\\"
+        return [node['name'] for key, node in self._keys.items()
+                if key.startswith(prefix) and "\\" not in key[len(prefix):]]
+
+    def values(self, path: str) -> Dict[str, str]:
+        self.reads += 1
+        node = self._keys.get(self._norm(path))
+        return dict(node['values']) if node else {}
+
+    def last_write(self, path: str) -> Optional[int]:
+        self.reads += 1
+        node = self._keys.get(self._norm(path))
+        return node['last_write'] if node else None
+
+
+# ====================== 索引 ======================
+
+@dataclass(frozen=True)
+class UwpPackage:
+    """一个已安装的 UWP 包"""
+    family: str     # 包系列名（Name_PublisherId）
+    package: str    # 包全名（Name_Version_Arch__PublisherId）
+    logo: str = ''  # Logo 文件的完整路径，未找到时为空
+
+
+def default_apps_root() -> str:
+    return os.path.join(os.environ.get('ProgramFiles', 'C:\\Program Files'), 'WindowsApps')
+
+
+def default_cache_path() -> str:
+    return os.path.join(os.getenv('LOCALAPPDATA') or os.path.expanduser("~"), 'AppIcon', 'uwp_index.json')
+
+
+class UwpIndex:
+    """
+    UWP 包索引：包系列 -> 包 -> Logo 路径
+
+    - 首次构建遍历一次 Families 注册表树，结果写入磁盘缓存
+    - 刷新是增量的：每个包系列以其 Packages 键的最后写入时间为版本，未变化的系列直接沿用缓存，
+      只重新读取新增或变化的系列；删除的系列从索引移除
+    - 查询只访问内存字典；按名称的模糊匹配结果也会被记住
+    - 线程安全：可在后台线程刷新，同时在其他线程查询
+    """
+
+    def __init__(self, reader: RegistryReader, cache_path: Optional[str] = None,
+                 apps_root: Optional[str] = None, exists=os.path.exists):
+        self._reader = reader
+        self.cache_path = cache_path
+        self.apps_root = apps_root or default_apps_root()
+        self._exists = exists
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()  # 串行化刷新，查询不获取此锁
+        self._save_lock = threading.Lock()
+        # family -> (版本, 该系列下的包)
+        self._families: Dict[str, Tuple[Optional[int], Tuple[UwpPackage, ...]]] = {}
+        self._by_key: Dict[str, UwpPackage] = {}
+        self._lookups: Dict[str, Optional[UwpPackage]] = {}
+        self._loaded = False
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.families_rescanned = 0
+        self.hits = 0
+        self.misses = 0
+
+    # ====================== 构建 ======================
+
+    def _resolve_logo(self, package: str, relative: str) -> str:
+        base = os.path.join(self.apps_root, package)
+        stem, ext = os.path.splitext(relative)
+        for qualifier in LOGO_QUALIFIERS:
+            path = os.path.join(base, f"{stem}{qualifier}{ext}")
+            if self._exists(path):
+                return path
+        return ''
+
+    def _scan_family(self, family: str) -> Tuple[UwpPackage, ...]:
+        packages = []
+        packages_path = f"{FAMILIES_KEY}\\{family}\\Packages"
+        for package in self._reader.subkeys(packages_path):
+            logo = ''
+            resources = self._reader.values(f"{packages_path}\\{package}\\Resources")
+            for name, value in resources.items():
+                if 'logo' in name.lower() and value:
+                    logo = self._resolve_logo(package, value)
+                    if logo:
+                        break
+            packages.append(UwpPackage(family, package, logo))
+        return tuple(packages)
+
+    def _family_version(self, family: str) -> Optional[int]:
+        version = self._reader.last_write(f"{FAMILIES_KEY}\\{family}\\Packages")
+        if version is None:
+            version = self._reader.last_write(f"{FAMILIES_KEY}\\{family}")
+        return version
+
+    def refresh(self) -> int:
+        """
+        增量刷新索引，返回重新读取的包系列数
+
+        注册表遍历不持有查询锁：新的索引在锁外构建完成后整体替换，刷新期间 find() 仍只查内存字典。
+        """
+        with self._refresh_lock:
+            with self._lock:
+                self._ensure_loaded()
+                previous = self._families
+            rescanned = 0
+            current = {}
+            for family in self._reader.subkeys(FAMILIES_KEY):
+                version = self._family_version(family)
+                cached = previous.get(family)
+                if cached is not None and version is not None and cached[0] == version:
+                    current[family] = cached
+                    continue
+                current[family] = (version, self._scan_family(family))
+                rescanned += 1
+            changed = rescanned or len(current) != len(previous)
+            by_key = self._build_lookup(current) if changed else None
+            with self._lock:
+                self._families = current
+                if by_key is not None:
+                    self._by_key = by_key
+                    self._lookups = {}
+                self.refreshes += 1
+                self.families_rescanned += rescanned
+            if changed:
+                self.save()
+            self._ready.set()
+            return rescanned
+
+    @staticmethod
+    def _build_lookup(families) -> Dict[str, UwpPackage]:
+        by_key = {}
+        for _, packages in families.values():
+            for pkg in packages:
+                by_key.setdefault(pkg.family.lower(), pkg)
+                by_key.setdefault(pkg.package.lower(), pkg)
+                by_key.setdefault(pkg.package.split('_', 1)[0].lower(), pkg)
+        return by_key
+
+    def refresh_in_background(self) -> threading.Thread:
+        """在后台线程刷新（已在刷新时返回现有线程）"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self._thread
+
+            def run():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    log.error(f"刷新 UWP 索引失败: {e}")
+
+            self._thread = threading.Thread(target=run, name="UwpIndexRefresh", daemon=True)
+            self._thread.start()
+            return self._thread
+
+    # ====================== 磁盘缓存 ======================
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def load(self) -> int:
+        """加载磁盘缓存，返回包系列数；缓存缺失或损坏时从空索引开始"""
+        with self._lock:
+            self._loaded = True
+            if not self.cache_path:
+                return 0
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') != INDEX_FORMAT or data.get('apps_root') != self.apps_root:
+                    return 0
+                families = {}
+                for family, raw in (data.get('families') or {}).items():
+                    packages = tuple(UwpPackage(**pkg) for pkg in raw.get('packages', ()))
+                    families[family] = (raw.get('version'), packages)
+                self._families = families
+                self._by_key = self._build_lookup(families)
+                self._lookups = {}
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                log.error(f"读取 UWP 索引缓存失败，将重建: {e}")
+            return len(self._families)
+
+    def save(self) -> bool:
+        """原子写入磁盘缓存（只在复制索引时持有锁）"""
+        if not self.cache_path:
+            return False
+        with self._lock:
+            families = self._families
+        data = {
+            'format': INDEX_FORMAT,
+            'apps_root': self.apps_root,
+            'families': {
+                family: {'version': version, 'packages': [asdict(pkg) for pkg in packages]}
+                for family, (version, packages) in families.items()
+            },
+        }
+        with self._save_lock:
+            directory = os.path.dirname(self.cache_path) or '.'
+            tmp_path = None
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix='uwp_index.', suffix='.tmp', dir=directory)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_path)
+                return True
+            except Exception as e:
+                log.error(f"写入 UWP 索引缓存失败: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                return False
+
+    # ====================== 查询 ======================
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def find(self, app_id: str) -> Optional[UwpPackage]:
+        """
+        按包系列名、包全名或包名查找；没有精确匹配时按子串匹配（与原实现一致），结果会被记住
+
+        索引尚未构建过（无缓存且后台刷新未完成）时同步刷新一次。
+        """
+        if not app_id:
+            return None
+        key = app_id.lower()
+        with self._lock:
+            self._ensure_loaded()
+            building = not self._families and not self._ready.is_set()
+        if building:
+            self.refresh()
+        with self._lock:
+            pkg = self._by_key.get(key)
+            if pkg is None:
+                if key in self._lookups:
+                    pkg = self._lookups[key]
+                else:
+                    pkg = self._match(key)
+                    self._lookups[key] = pkg
+            if pkg is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return pkg
+
+    def _match(self, key: str) -> Optional[UwpPackage]:
+        for family, (_, packages) in self._families.items():
+            if key not in family.lower():
+                continue
+            for pkg in packages:
+                if key in pkg.package.lower():
+                    return pkg
+        return None
+
+    def packages(self) -> List[UwpPackage]:
+        with self._lock:
+            return [pkg for _, packages in self._families.values() for pkg in packages]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'families': len(self._families),
+                'packages': sum(len(packages) for _, packages in self._families.values()),
+                'refreshes': self.refreshes,
+                'families_rescanned': self.families_rescanned,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_shared_index: Optional[UwpIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_index() -> Optional[UwpIndex]:
+    """进程内共享的 UWP 索引（使用真实注册表与默认缓存路径）；winreg 不可用时返回 None"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None and WINREG_AVAILABLE:
+            _shared_index = UwpIndex(WinRegReader(), cache_path=default_cache_path())
+        return _shared_index
@@ -0,0 +1,313 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .window_snapshot import WindowBackend, WindowInfo, WindowSnapshot
+
+
+class WindowEventType(IntEnum):
+    """窗口事件类型"""
+    CREATE = 1
+    DESTROY = 2
+    SHOW = 3
+    HIDE = 4
+    FOREGROUND = 5
+    LOCATION = 6   # 移动或改变大小
+    NAME = 7       # 标题变化
+
+
+@dataclass(frozen=True)
+class WindowEvent:
+    """单个窗口事件"""
+    type: WindowEventType
+    hwnd: int
+    timestamp: float  # time.monotonic()
+
+
+# ====================== 事件源 ======================
+
+class WindowEventSource:
+    """窗口事件源接口：start 后通过回调推送 WindowEvent"""
+
+    def start(self, callback: Callable[[WindowEvent], None]) -> bool:
+        """开始推送事件，成功返回 True"""
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+    @property
+    def is_live(self) -> bool:
+        return False
+
+
+class WinEventHookSource(WindowEventSource):
+    """
+    基于 SetWinEventHook 的事件源（WINEVENT_OUTOFCONTEXT）
+
+    回调在安装钩子的线程的消息循环中执行，因此需在 Qt 主线程上 start。
+    """
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_CREATE = 0x8000
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_SHOW = 0x8002
+    EVENT_OBJECT_HIDE = 0x8003
+    EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    CHILDID_SELF = 0
+    GA_ROOT = 2
+
+    _EVENT_MAP = {
+        EVENT_OBJECT_CREATE: WindowEventType.CREATE,
+        EVENT_OBJECT_DESTROY: WindowEventType.DESTROY,
+        EVENT_OBJECT_SHOW: WindowEventType.SHOW,
+        EVENT_OBJECT_HIDE: WindowEventType.HIDE,
+        EVENT_SYSTEM_FOREGROUND: WindowEventType.FOREGROUND,
+        EVENT_OBJECT_LOCATIONCHANGE: WindowEventType.LOCATION,
+        EVENT_OBJECT_NAMECHANGE: WindowEventType.NAME,
+    }
+
+    def __init__(self):
+        self._hooks: List[int] = []
+        self._proc = None  # 保持 WINFUNCTYPE 引用，避免被回收
+        self._callback: Optional[Callable[[WindowEvent], None]] = None
+
+    @property
+    def is_live(self) -> bool:
+        return bool(self._hooks)
+
+    def start(self, callback: Callable[[WindowEvent], None]) -> bool:
+        if sys.platform != 'win32':
+            return False
+        if self._hooks:
+            return True
+        try:
+            import ctypes
+            from ctypes import wintypes
+            user32 = ctypes.windll.user32
+
+            WinEventProcType = ctypes.WINFUNCTYPE(
+                None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+            )
+            user32.SetWinEventHook.restype = wintypes.HANDLE
+            user32.GetAncestor.restype = wintypes.HWND
+
+            def _on_event(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+                try:
+                    if not hwnd or id_object != self.OBJID_WINDOW or id_child != self.CHILDID_SELF:
+                        return
+                    # 销毁事件发生时窗口已无法查询祖先，其余事件仅关注顶层窗口
+                    if event != self.EVENT_OBJECT_DESTROY and user32.GetAncestor(hwnd, self.GA_ROOT) != hwnd:
+                        return
+                    event_type = self._EVENT_MAP.get(event)
+                    if event_type is not None and self._callback:
+                        self._callback(WindowEvent(event_type, int(hwnd), time.monotonic()))
+                except Exception:
+                    pass
+
+            self._proc = WinEventProcType(_on_event)
+            self._callback = callback
+            flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+            ranges = [
+                (self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND),
+                (self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_HIDE),
+                (self.EVENT_OBJECT_LOCATIONCHANGE, self.EVENT_OBJECT_NAMECHANGE),
+            ]
+            for event_min, event_max in ranges:
+                hook = user32.SetWinEventHook(event_min, event_max, 0, self._proc, 0, 0, flags)
+                if hook:
+                    self._hooks.append(hook)
+            if not self._hooks:
+                self._callback = None
+                return False
+            return True
+        except Exception:
+            self.stop()
+            return False
+
+    def stop(self) -> None:
+        try:
+            import ctypes
+            for hook in self._hooks:
+                ctypes.windll.user32.UnhookWinEvent(hook)
+        except Exception:
+            pass
+        self._hooks = []
+        self._callback = None
+
+
+class ScriptedEventSource(WindowEventSource):
+    """脚本化的假事件源，由测试代码显式推送事件"""
+
+    def __init__(self):
+        self._callback: Optional[Callable[[WindowEvent], None]] = None
+        self.emitted = 0
+
+    @property
+    def is_live(self) -> bool:
+        return self._callback is not None
+
+    def start(self, callback: Callable[[WindowEvent], None]) -> bool:
+        self._callback = callback
+        return True
+
+    def stop(self) -> None:
+        self._callback = None
+
+    def emit(self, event_type: WindowEventType, hwnd: int) -> None:
+        if self._callback:
+            self.emitted += 1
+            self._callback(WindowEvent(event_type, hwnd, time.monotonic()))
+
+    def play(self, script: Iterable) -> None:
+        """依次推送 (事件类型, hwnd) 序列"""
+        for event_type, hwnd in script:
+            self.emit(event_type, hwnd)
+
+
+def default_event_source() -> Optional[WindowEventSource]:
+    """当前平台可用的事件源，不支持时返回 None（退回轮询）"""
+    if sys.platform == 'win32':
+        return WinEventHookSource()
+    return None
+
+
+# ====================== 窗口状态跟踪 ======================
+
+class WindowTracker:
+    """
+    由窗口事件增量维护的窗口状态
+
+    事件到达时只查询对应的单个窗口；reconcile() 做一次完整枚举用于校正漏掉的事件。
+    snapshot() 生成的 WindowSnapshot 可直接替代一次全量枚举。
+    """
+
+    def __init__(self, backend: WindowBackend, on_change: Optional[Callable[[WindowEvent], None]] = None):
+        self._backend = backend
+        self._on_change = on_change
+        self._source: Optional[WindowEventSource] = None
+        self._windows: 'OrderedDict[int, WindowInfo]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.foreground_hwnd: Optional[int] = None
+        self.events_received = 0
+        self.events_applied = 0
+        self.reconcile_count = 0
+        self.reconcile_corrections = 0
+        self.moves_applied = 0
+        self._latency_total = 0.0
+        self.last_latency = 0.0
+
+    @property
+    def is_live(self) -> bool:
+        return self._source is not None and self._source.is_live
+
+    def start(self, source: Optional[WindowEventSource]) -> bool:
+        """绑定事件源并做首次全量枚举；事件源不可用时返回 False"""
+        if source is None:
+            return False
+        self.reconcile()
+        if not source.start(self.handle_event):
+            return False
+        self._source = source
+        return True
+
+    def stop(self) -> None:
+        if self._source is not None:
+            self._source.stop()
+            self._source = None
+
+    def handle_event(self, event: WindowEvent) -> None:
+        """应用单个事件，状态变化时通知 on_change"""
+        with self._lock:
+            self.events_received += 1
+            changed = False
+            if event.type == WindowEventType.LOCATION:
+                changed = self._apply_location(event.hwnd)
+            elif event.type in (WindowEventType.DESTROY, WindowEventType.HIDE):
+                changed = self._windows.pop(event.hwnd, None) is not None
+                if self.foreground_hwnd == event.hwnd:
+                    self.foreground_hwnd = None
+            else:
+                info = self._backend.query(event.hwnd)
+                if info is None or not info.visible:
+                    changed = self._windows.pop(event.hwnd, None) is not None
+                else:
+                    known = event.hwnd in self._windows
+                    changed = self._windows.get(event.hwnd) != info
+                    self._windows[event.hwnd] = info
+                    if event.type == WindowEventType.FOREGROUND:
+                        changed = changed or self.foreground_hwnd != event.hwnd
+                        self.foreground_hwnd = event.hwnd
+                    # 新建/显示的窗口与前台窗口位于 Z 序顶部；改名只更新内容，保持原有位置
+                    if (event.type in (WindowEventType.CREATE, WindowEventType.SHOW, WindowEventType.FOREGROUND)
+                            or not known):
+                        self._windows.move_to_end(event.hwnd, last=False)
+            if not changed:
+                return
+            self.events_applied += 1
+        if self._on_change:
+            self._on_change(event)
+        latency = time.monotonic() - event.timestamp
+        self.last_latency = latency
+        self._latency_total += latency
+
+    def _apply_location(self, hwnd: int) -> bool:
+        """
+        移动/改变大小：只读取矩形，不重新解析进程；返回是否需要通知 on_change
+
+        未跟踪的窗口忽略（显示时由 SHOW 事件加入）。拖动窗口产生的纯移动只更新矩形而不通知，
+        大小变化（如进入或退出全屏）才通知。
+        """
+        info = self._windows.get(hwnd)
+        if info is None:
+            return False
+        rect = self._backend.window_rect(hwnd)
+        if rect is None or rect == info.rect:
+            return False
+        self._windows[hwnd] = replace(info, rect=rect)
+        old, new = info.rect, rect
+        if (old[2] - old[0], old[3] - old[1]) == (new[2] - new[0], new[3] - new[1]):
+            self.moves_applied += 1
+            return False
+        return True
+
+    def reconcile(self) -> int:
+        """全量枚举并校正状态，返回修正的窗口数量（即漏掉的事件数）"""
+        windows = self._backend.collect()
+        with self._lock:
+            fresh = OrderedDict((info.hwnd, info) for info in windows if info.visible)
+            corrections = 0
+            if self.reconcile_count > 0:
+                for hwnd in set(fresh) | set(self._windows):
+                    if fresh.get(hwnd) != self._windows.get(hwnd):
+                        corrections += 1
+            self._windows = fresh
+            self.reconcile_count += 1
+            self.reconcile_corrections += corrections
+            return corrections
+
+    def snapshot(self) -> WindowSnapshot:
+        with self._lock:
+            return WindowSnapshot(list(self._windows.values()))
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            applied = self.events_applied
+            return {
+                'events_received': self.events_received,
+                'events_applied': applied,
+                'moves_applied': self.moves_applied,
+                'reconcile_count': self.reconcile_count,
+                'reconcile_corrections': self.reconcile_corrections,
+                'avg_latency_ms': (self._latency_total / applied * 1000.0) if applied else 0.0,
+                'last_latency_ms': self.last_latency * 1000.0,
+            }
@@ -0,0 +1,193 @@
+import fnmatch
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+REGEX_PREFIX = "re:"
+GLOB_CHARS = frozenset("*?[")
+
+# 常见系统窗口类名（桌面、任务栏、开始菜单、输入法等）
+DEFAULT_SYSTEM_CLASSES = (
+    "Progman",           # 程序管理器（桌面）
+    "WorkerW",           # Worker窗口（桌面背景）
+    "Shell_TrayWnd",     # 任务栏
+    "Windows.UI.Core.CoreWindow",  # Windows核心UI窗口
+    "EdgeUiInputWndClass",  # Windows边缘UI
+    "ImmersiveLauncher", # 沉浸式启动器（开始菜单）
+    "ApplicationFrameWindow",  # UWP应用框架
+    "MsgrHTMLWndClass",  # Messenger HTML窗口
+    "Internet Explorer_Hidden",  # IE隐藏窗口
+    "MSCTFIME UI",       # 输入法UI
+    "TrayNotifyWnd",     # 通知区域
+    "DV2ControlHost",    # 桌面窗口管理器控制主机
+    "NativeHWNDHost",    # 原生HWND主机
+    "ToolbarWindow32",   # 工具栏窗口
+    "ReBarWindow32",     # ReBar窗口
+    "MSTaskSwWClass",    # 任务切换窗口
+    "Shell_SecondaryTrayWnd",  # 副显示器任务栏
+    "SysListView32",     # 系统列表视图（桌面图标）
+    "DirectUIHWND",      # DirectUI窗口
+    "Breadcrumb Parent", # 面包屑导航父窗口
+    "Search Box",        # 搜索框
+    "SearchEditBox",     # 搜索编辑框
+    "SearchDialog",      # 搜索对话框
+)
+
+# 常见系统窗口标题（通配符，* 表示任意字符）
+DEFAULT_SYSTEM_TITLES = (
+    "*Program Manager*",
+    "*Windows Shell Experience Host*",
+    "*Start*",
+    "*Settings*",
+    "*Microsoft Text Input Application*",
+    "*Cortana*",
+    "*Search*",
+    "*通知*",
+    "*Action Center*",
+    "*Windows Explorer*",
+)
+
+# 输入法相关窗口类名：进程只有这些窗口时不视为运行中的应用
+DEFAULT_IGNORED_CLASSES = (
+    "MSCTFIME UI",
+    "IAIMETIPWndClass",
+    "TIPBand",
+    "Candidate",
+)
+
+
+class RuleError(ValueError):
+    """规则无法编译（如正则表达式语法错误）"""
+
+
+def normalize_process_rule(rule: str) -> str:
+    """进程名规则规范化：小写；未写扩展名的名称/通配符自动补 .exe，正则保持原样"""
+    rule = str(rule).strip()
+    if not rule or rule.startswith(REGEX_PREFIX):
+        return rule
+    rule = rule.lower()
+    if '.' not in rule:
+        rule = rule + '.exe'
+    return rule
+
+
+class RuleSet:
+    """
+    一组名称规则，编译为 精确名称集合 + 单个合并正则
+
+    规则写法：
+    - 普通字符串：精确匹配
+    - 含 * ? [ 的字符串：通配符（fnmatch 语法），匹配整个名称
+    - "re:" 前缀：正则表达式，在名称中搜索
+    """
+
+    def __init__(self, rules: Iterable[str] = (), ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self.rules: Tuple[str, ...] = tuple(r for r in (str(x).strip() for x in rules or ()) if r)
+        exact = set()
+        patterns: List[str] = []
+        for rule in self.rules:
+            if rule.startswith(REGEX_PREFIX):
+                pattern = rule[len(REGEX_PREFIX):]
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise RuleError(f"无效的正则规则 {rule!r}: {e}")
+                patterns.append(pattern)
+            elif GLOB_CHARS & set(rule):
+                patterns.append(r'\A' + fnmatch.translate(rule.lower() if ignore_case else rule))
+            else:
+                exact.add(rule.lower() if ignore_case else rule)
+        self.exact: FrozenSet[str] = frozenset(exact)
+        flags = re.IGNORECASE if ignore_case else 0
+        self.pattern = re.compile('|'.join(f'(?:{p})' for p in patterns), flags) if patterns else None
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def matches(self, name: str) -> bool:
+        if not name:
+            return False
+        key = name.lower() if self.ignore_case else name
+        if key in self.exact:
+            return True
+        return self.pattern is not None and self.pattern.search(key) is not None
+
+
+class WindowRules:
+    """
+    排除进程与系统窗口规则，编译后不可变
+
+    规则更新时构造新实例并整体替换（热更新），判定缓存随旧实例一起丢弃。
+    """
+
+    def __init__(self, except_processes: Iterable[str] = (),
+                 system_classes: Iterable[str] = DEFAULT_SYSTEM_CLASSES,
+                 system_titles: Iterable[str] = DEFAULT_SYSTEM_TITLES,
+                 ignored_classes: Iterable[str] = DEFAULT_IGNORED_CLASSES,
+                 cache_size: int = 4096):
+        self.except_processes = RuleSet(
+            [normalize_process_rule(r) for r in except_processes or ()], ignore_case=True
+        )
+        self.system_classes = RuleSet(system_classes)
+        self.system_titles = RuleSet(system_titles)
+        self.ignored_classes = RuleSet(ignored_classes)
+        self._process_verdict = lru_cache(maxsize=cache_size)(self.except_processes.matches)
+        self._window_verdict = lru_cache(maxsize=cache_size)(self._is_system_window)
+        self._ignored_verdict = lru_cache(maxsize=256)(self.ignored_classes.matches)
+
+    @classmethod
+    def from_config(cls, dock_config: Optional[Dict[str, Any]]) -> 'WindowRules':
+        """从 settings.json 的 dock 配置构建；未配置的类别使用内置默认规则"""
+        dock_config = dock_config or {}
+        rules = dock_config.get('window_rules') or {}
+        return cls(
+            except_processes=dock_config.get('except_processes') or (),
+            system_classes=rules.get('system_classes', DEFAULT_SYSTEM_CLASSES),
+            system_titles=rules.get('system_titles', DEFAULT_SYSTEM_TITLES),
+            ignored_classes=rules.get('ignored_classes', DEFAULT_IGNORED_CLASSES),
+        )
+
+    def with_except_processes(self, except_processes: Iterable[str]) -> 'WindowRules':
+        """替换排除进程规则，其余类别不变"""
+        return WindowRules(
+            except_processes=except_processes,
+            system_classes=self.system_classes.rules,
+            system_titles=self.system_titles.rules,
+            ignored_classes=self.ignored_classes.rules,
+        )
+
+    def to_config(self) -> Dict[str, List[str]]:
+        """dock.window_rules 配置项"""
+        return {
+            'system_classes': list(self.system_classes.rules),
+            'system_titles': list(self.system_titles.rules),
+            'ignored_classes': list(self.ignored_classes.rules),
+        }
+
+    def _is_system_window(self, class_name: str, title: str) -> bool:
+        return self.system_classes.matches(class_name) or self.system_titles.matches(title)
+
+    def is_excluded_process(self, process_name: str) -> bool:
+        """进程名是否在排除规则中（不区分大小写）"""
+        return self._process_verdict(process_name or '')
+
+    def is_system_class_or_title(self, class_name: str, title: str) -> bool:
+        """按 (类名, 标题) 判断是否为系统窗口，结果缓存"""
+        return self._window_verdict(class_name or '', title or '')
+
+    def is_system_window(self, info) -> bool:
+        """窗口（WindowInfo）是否为系统窗口或属于排除进程"""
+        return (self.is_system_class_or_title(info.class_name, info.title)
+                or self.is_excluded_process(info.process_name))
+
+    def is_ignored_class(self, class_name: str) -> bool:
+        """是否为不代表应用窗口的类名（输入法等）"""
+        return self._ignored_verdict(class_name or '')
+
+    def cache_info(self) -> Dict[str, Any]:
+        return {
+            'process': self._process_verdict.cache_info(),
+            'window': self._window_verdict.cache_info(),
+            'ignored': self._ignored_verdict.cache_info(),
+        }
@@ -0,0 +1,271 @@
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 可选依赖（非Windows环境下仅可使用 FakeWindowBackend）
+try:
+    import win32gui
+    import win32process
+    PYWIN32_AVAILABLE = True
+except ImportError:
+    PYWIN32_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def normalize_path(path) -> str:
+    """规范化可执行文件路径（绝对路径 + 小写），用作索引键"""
+    if not path:
+        return ''
+    try:
+        return os.path.abspath(path).lower()
+    except Exception:
+        return str(path).lower()
+
+
+@dataclass(frozen=True)
+class WindowInfo:
+    """单个顶层窗口的不可变描述"""
+    hwnd: int
+    pid: int
+    title: str
+    class_name: str
+    visible: bool
+    rect: Tuple[int, int, int, int]
+    exe: str = ''                # 进程可执行文件路径（无法访问时为空）
+    process_name: str = ''       # 进程名（保留原始大小写）
+
+    @property
+    def exe_norm(self) -> str:
+        return normalize_path(self.exe)
+
+    @property
+    def has_title(self) -> bool:
+        return bool(self.title and self.title.strip())
+
+
+class WindowSnapshot:
+    """
+    某一时刻全部顶层窗口的快照
+
+    每个监控周期只构建一次，所有查询（运行状态、未固定运行应用、全屏检测）都读取同一份快照，
+    使一次检查的开销与配置的应用数量无关。
+    """
+
+    def __init__(self, windows: Iterable[WindowInfo], taken_at: Optional[float] = None):
+        self.windows: Tuple[WindowInfo, ...] = tuple(windows)
+        self.taken_at = taken_at if taken_at is not None else time.monotonic()
+        self._by_hwnd: Dict[int, WindowInfo] = {}
+        self._by_pid: Dict[int, List[WindowInfo]] = {}
+        self._by_exe: Dict[str, List[WindowInfo]] = {}
+        for info in self.windows:
+            self._by_hwnd[info.hwnd] = info
+            self._by_pid.setdefault(info.pid, []).append(info)
+            exe_norm = info.exe_norm
+            if exe_norm:
+                self._by_exe.setdefault(exe_norm, []).append(info)
+
+    def __len__(self):
+        return len(self.windows)
+
+    def __iter__(self):
+        return iter(self.windows)
+
+    def get(self, hwnd: int) -> Optional[WindowInfo]:
+        return self._by_hwnd.get(hwnd)
+
+    def pids(self) -> List[int]:
+        return list(self._by_pid.keys())
+
+    def windows_for_pid(self, pid: int) -> List[WindowInfo]:
+        return list(self._by_pid.get(pid, ()))
+
+    def windows_for_exe(self, exe_path: str) -> List[WindowInfo]:
+        """按可执行文件路径查询窗口（路径会先规范化）"""
+        return list(self._by_exe.get(normalize_path(exe_path), ()))
+
+    def visible_titled_windows(self, exe_path: str) -> List[WindowInfo]:
+        """指定应用的可见且有标题的窗口"""
+        return [w for w in self._by_exe.get(normalize_path(exe_path), ()) if w.visible and w.has_title]
+
+    def signature(self) -> Tuple:
+        """快照内容签名，用于判断两次快照之间是否发生变化"""
+        return tuple((w.hwnd, w.pid, w.title, w.visible, w.rect) for w in self.windows)
+
+
+# ====================== 后端 ======================
+
+class WindowBackend:
+    """窗口枚举后端接口"""
+
+    def collect(self) -> List[WindowInfo]:
+        """枚举全部顶层窗口并返回描述列表"""
+        raise NotImplementedError
+
+    def query(self, hwnd: int) -> Optional[WindowInfo]:
+        """查询单个窗口，窗口不存在时返回 None"""
+        raise NotImplementedError
+
+    def window_rect(self, hwnd: int) -> Optional[Tuple[int, int, int, int]]:
+        """只查询窗口矩形（不解析进程），窗口不存在时返回 None"""
+        info = self.query(hwnd)
+        return info.rect if info is not None else None
+
+    def foreground(self) -> Optional[int]:
+        """当前前台窗口句柄，不可用时返回 None"""
+        return None
+
+    def snapshot(self) -> WindowSnapshot:
+        return WindowSnapshot(self.collect())
+
+
+class Win32WindowBackend(WindowBackend):
+    """基于 EnumWindows 的 Windows 后端，同一进程的 exe 只解析一次"""
+
+    def __init__(self, visible_only: bool = True, process_cache=None):
+        if not PYWIN32_AVAILABLE:
+            raise RuntimeError("pywin32 未安装，无法使用 Win32WindowBackend")
+        self.visible_only = visible_only
+        # 跨周期的进程信息缓存（core.process_cache.ProcessInfoCache），为空时每周期重新解析
+        self.process_cache = process_cache
+        try:
+            from ctypes import windll
+            windll.user32.SetProcessDPIAware()
+        except Exception:
+            pass
+
+    def _resolve_process(self, pid: int, cache: Dict[int, Tuple[str, str]]) -> Tuple[str, str]:
+        if pid in cache:
+            return cache[pid]
+        exe, name = '', ''
+        if self.process_cache is not None:
+            info = self.process_cache.get(pid)
+            if info is not None:
+                exe, name = info.exe, info.name
+        elif PSUTIL_AVAILABLE:
+            try:
+                proc = psutil.Process(pid)
+                name = proc.name()
+                exe = proc.exe()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+            except Exception:
+                pass
+        cache[pid] = (exe, name)
+        return exe, name
+
+    def _describe(self, hwnd: int, cache: Dict[int, Tuple[str, str]]) -> Optional[WindowInfo]:
+        try:
+            visible = bool(win32gui.IsWindowVisible(hwnd))
+            if self.visible_only and not visible:
+                return None
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            try:
+                rect = tuple(win32gui.GetWindowRect(hwnd))
+            except Exception:
+                rect = (0, 0, 0, 0)
+            exe, name = self._resolve_process(pid, cache)
+            return WindowInfo(
+                hwnd=hwnd,
+                pid=pid,
+                title=win32gui.GetWindowText(hwnd),
+                class_name=win32gui.GetClassName(hwnd),
+                visible=visible,
+                rect=rect,
+                exe=exe,
+                process_name=name,
+            )
+        except Exception:
+            return None
+
+    def collect(self) -> List[WindowInfo]:
+        hwnds = []
+        try:
+            win32gui.EnumWindows(lambda hwnd, param: param.append(hwnd) or True, hwnds)
+        except Exception:
+            pass
+        cache: Dict[int, Tuple[str, str]] = {}
+        windows = []
+        for hwnd in hwnds:
+            info = self._describe(hwnd, cache)
+            if info is not None:
+                windows.append(info)
+        if self.process_cache is not None:
+            self.process_cache.retain(cache.keys())
+        return windows
+
+    def query(self, hwnd: int) -> Optional[WindowInfo]:
+        try:
+            if not win32gui.IsWindow(hwnd):
+                return None
+        except Exception:
+            return None
+        return self._describe(hwnd, {})
+
+    def window_rect(self, hwnd: int) -> Optional[Tuple[int, int, int, int]]:
+        try:
+            return tuple(win32gui.GetWindowRect(hwnd))
+        except Exception:
+            return None
+
+    def foreground(self) -> Optional[int]:
+        try:
+            return win32gui.GetForegroundWindow() or None
+        except Exception:
+            return None
+
+
+class FakeWindowBackend(WindowBackend):
+    """脚本化的假后端，用于在非Windows环境下测试与基准"""
+
+    def __init__(self, windows: Optional[Iterable[WindowInfo]] = None):
+        self._windows: Dict[int, WindowInfo] = {}
+        self.foreground_hwnd: Optional[int] = None
+        self.collect_count = 0
+        self.query_count = 0
+        self.rect_count = 0
+        for info in windows or ():
+            self.add_window(info)
+
+    def add_window(self, info: WindowInfo) -> None:
+        self._windows[info.hwnd] = info
+
+    def remove_window(self, hwnd: int) -> None:
+        self._windows.pop(hwnd, None)
+
+    def update_window(self, hwnd: int, **changes) -> None:
+        info = self._windows.get(hwnd)
+        if info is None:
+            return
+        self._windows[hwnd] = replace(info, **changes)
+
+    def set_windows(self, windows: Iterable[WindowInfo]) -> None:
+        self._windows = {info.hwnd: info for info in windows}
+
+    def collect(self) -> List[WindowInfo]:
+        self.collect_count += 1
+        return list(self._windows.values())
+
+    def query(self, hwnd: int) -> Optional[WindowInfo]:
+        self.query_count += 1
+        return self._windows.get(hwnd)
+
+    def window_rect(self, hwnd: int) -> Optional[Tuple[int, int, int, int]]:
+        self.rect_count += 1
+        info = self._windows.get(hwnd)
+        return info.rect if info is not None else None
+
+    def foreground(self) -> Optional[int]:
+        return self.foreground_hwnd
+
+
+def default_backend(process_cache=None) -> WindowBackend:
+    """当前平台的默认后端"""
+    if PYWIN32_AVAILABLE:
+        return Win32WindowBackend(process_cache=process_cache)
+    return FakeWindowBackend()
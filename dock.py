@@ -1,22 +1,37 @@
 import gc
+import multiprocessing
 import os
 import sys
 import hashlib
+import time
 from typing import Dict, List, Any
 import subprocess
 
-import psutil
 import win32con
 import win32gui
-import win32process
 from PySide6.QtCore import QEasingCurve, QPropertyAnimation, QThread, Qt, QSize, QTimer, QRect, QEvent, QPoint
-from PySide6.QtGui import QIcon, QPixmap, QPainter, QColor, QPen
+from PySide6.QtGui import QIcon, QPainter, QColor, QPen
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton, QFileDialog, QVBoxLayout, QHBoxLayout,
                                QDialog, QLabel, QInputDialog, QPlainTextEdit)
 # 添加获取任务栏固定程序所需的库
 from win32com.shell import shell  # type: ignore
-from core.custom_ui import IconHoverFilter, ContextPopup, ShutdownDialog
+from core.custom_ui import IconHoverFilter, ContextPopup, ShutdownDialog, DockButton, DockButtonTheme, OverflowPopup
 from core.process_manager import ProcessManager
+from core.icon_loader import IconLoader
+from core.icon_cache import IconCacheMaintainer
+from core.icon_pool import IconProcessPool
+from core.pixmap_cache import shared_pixmap_cache
+from core.icon_atlas import AtlasBuilder, AtlasStore
+from core.uwp_index import get_shared_index as shared_uwp_index
+from core.app_registry import AppRegistry
+from core.dock_reconciler import ReconcileResult, SectionReconciler
+from core.window_rules import WindowRules, RuleError
+from core.window_snapshot import normalize_path
+from core import window_events
+from core import process_monitor
+from core.monitor_scheduler import MonitorScheduler
+from core import update_scheduler
+from core.update_scheduler import UpdateScheduler
 import core.skills.sys32 as sys32
 import core.log_maker as log_maker
 import core.config_manager as Config
@@ -39,11 +54,28 @@ class DockConstants:
     BUTTON_SIZE = 60
     ICON_SIZE = 48
     BORDER_RADIUS = 16
+    BUTTON_BORDER_WIDTH = 2
     WINDOW_BORDER_RADIUS = 18
     BUTTON_SPACING = 10
     WINDOW_MARGIN = 0
     SEPARATOR_WIDTH = 2
-    PROCESS_CHECK_INTERVAL = 1400  # 进程检查间隔（毫秒）
+    MONITOR_MIN_INTERVAL = 1000  # 进程检查最短间隔（毫秒），可在 settings.json 的 dock.monitor_min_interval 覆盖
+    MONITOR_MAX_INTERVAL = 8000  # 无变化时退避到的最长间隔（毫秒），对应 dock.monitor_max_interval
+    MONITOR_BOOST_DURATION = 5000  # 点击/结束进程后保持最快节奏的时长（毫秒）
+    PROCESS_RECONCILE_INTERVAL = 15000  # 事件驱动时的兜底全量校正间隔（毫秒）
+    WINDOW_EVENT_DEBOUNCE = 50  # 窗口事件合并时间（毫秒）
+    WINDOW_RESIZE_SETTLE = 250  # 窗口大小停止变化多久后才检查（毫秒），拖动调整大小时只检查一次
+    ICON_WORKERS = 2  # 异步图标提取线程数（启用进程隔离时也是工作进程数）
+    ICON_RETRY_INTERVAL = 5 * 60 * 1000  # 提取失败的图标多久后才允许重试（毫秒），文件被修改时立即重试
+    ICON_POOL_JOB_TIMEOUT = 10000  # 工作进程提取单个图标的超时（毫秒），超时则结束该进程
+    ICON_POOL_MAX_JOBS = 50  # 每个图标工作进程处理多少个图标后回收，限制句柄泄漏
+    LAST_RUNNING_LIMIT = 32  # 退出时最多记录多少个运行中的应用（下次启动预热图标）
+    ICON_CACHE_MAX_MB = 64  # 图标磁盘缓存上限（MB），对应 dock.icon_cache_max_mb
+    ICON_CACHE_MAX_ENTRIES = 1000  # 图标磁盘缓存条目上限，对应 dock.icon_cache_max_entries
+    ICON_CACHE_PRUNE_INTERVAL = 30 * 60 * 1000  # 图标缓存清理间隔（毫秒）
+    PIXMAP_CACHE_MAX_MB = 16  # 已解码图标的内存缓存上限（MB），按钮之间共享
+    OVERFLOW_COLUMNS = 6  # 溢出网格弹窗每行的按钮数
+    ATLAS_REBUILD_DELAY = 3000  # 图标集合变化后延迟重建图标图集（毫秒），期间的多次变化只重建一次
     
     # 颜色常量
     COLOR_BACKGROUND = "#ECECEC"
@@ -57,31 +89,7 @@ class DockConstants:
     COLOR_WINDOW_BORDER = "#000000"
     COLOR_TOOLTIP= "#008566"
     
-    # 样式表模板
-    BUTTON_STYLE_RUNNING = f"""
-        QPushButton {{
-            border: 2px solid {COLOR_BORDER_ACTIVE};
-            border-radius: {BORDER_RADIUS}px;
-            background-color: {COLOR_BG_ACTIVE};
-        }}
-        QPushButton:hover {{
-            border: 2px solid {COLOR_BORDER_ACTIVE};
-            background-color: {COLOR_BG_HOVER_ACTIVE};
-        }}
-    """
-    
-    BUTTON_STYLE_INACTIVE = f"""
-        QPushButton {{
-            border: 2px solid {COLOR_BORDER_INACTIVE};
-            border-radius: {BORDER_RADIUS}px;
-            background-color: {COLOR_BACKGROUND};
-        }}
-        QPushButton:hover {{
-            border: 2px solid {COLOR_BORDER_ACTIVE};
-            background-color: {COLOR_BG_HOVER_INACTIVE};
-        }}
-    """
-    
+    # 样式表模板（图标按钮为自绘的 DockButton，不使用样式表）
     CONTAINER_STYLE = f"""
         QWidget {{
             background-color: {COLOR_BACKGROUND};
@@ -116,6 +124,7 @@ class DockConstants:
 
 class DockApp(QMainWindow):
     def __init__(self):
+        self._startup_started = time.perf_counter()
         super().__init__()
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
         self.settings_file = os.path.join(self.script_dir, "settings.json")
@@ -126,35 +135,92 @@ class DockApp(QMainWindow):
         self.pinned_app_buttons: Dict[str, QPushButton] = {}
         self.running_app_buttons: Dict[str, QPushButton] = {}
         
-        # 应用列表
-        self.pinned_apps: List[Dict[str, Any]] = []
-        self.apps: List[Dict[str, Any]] = []
-        self.running_apps_list: List[Dict[str, Any]] = []
+        # 应用列表（由 AppRegistry 统一索引，pinned_apps / apps / running_apps_list 为其分区视图）
+        self.registry = AppRegistry()
         
         # UI组件
         self.icon_hover_filter = IconHoverFilter(self)
         self.process_manager = ProcessManager()
         self.geometry_anim = None
         
+        # 异步图标加载：按钮先显示占位图标，提取完成后替换
+        self.icon_loader = IconLoader(
+            self.process_manager.extract_icon,
+            max_workers=DockConstants.ICON_WORKERS,
+            retry_interval=DockConstants.ICON_RETRY_INTERVAL / 1000.0,
+        )
+        self.icon_loader.icon_ready.connect(self._on_icon_ready, Qt.QueuedConnection)
+        self._placeholder_icon = None
+        # 已解码图标在所有按钮之间共享，重建分区时不再重复读取/解码 PNG
+        self.pixmap_cache = shared_pixmap_cache()
+        # 所有图标按钮共享的配色（预先生成的 QPen/QBrush）
+        self.button_theme = DockButtonTheme(
+            radius=DockConstants.BORDER_RADIUS,
+            border_width=DockConstants.BUTTON_BORDER_WIDTH,
+            border_active=DockConstants.COLOR_BORDER_ACTIVE,
+            border_inactive=DockConstants.COLOR_BORDER_INACTIVE,
+            bg_active=DockConstants.COLOR_BG_ACTIVE,
+            bg_inactive=DockConstants.COLOR_BACKGROUND,
+            bg_hover_active=DockConstants.COLOR_BG_HOVER_ACTIVE,
+            bg_hover_inactive=DockConstants.COLOR_BG_HOVER_INACTIVE,
+        )
+        self.pixmap_cache.set_max_bytes(DockConstants.PIXMAP_CACHE_MAX_MB * 1024 * 1024)
+        # 图标图集：启动时映射上次打包的预乘 RGBA 像素，按钮图标无需逐个解码 PNG；
+        # 图标集合变化后在后台重建，图集中没有的图标仍从 PNG 加载
+        atlas_dir = os.path.join(self.process_manager.icon_cache.cache_dir, 'atlas')
+        self.icon_atlas = AtlasStore(atlas_dir)
+        self.icon_atlas.open_latest()
+        self.pixmap_cache.atlas = self.icon_atlas
+        self.atlas_builder = AtlasBuilder(atlas_dir)
+        self.atlas_builder.built.connect(self._on_atlas_built, Qt.QueuedConnection)
+        self._atlas_timer = QTimer(self)
+        self._atlas_timer.setSingleShot(True)
+        self._atlas_timer.timeout.connect(self._refresh_icon_atlas)
+
+        # 各处触发的刷新按帧合并：一帧内多次请求只做一次按钮协调和一次布局/动画
+        self.update_scheduler = UpdateScheduler(self)
+        self.update_scheduler.register(update_scheduler.PROCESSES, self.check_running_processes)
+        self.update_scheduler.register(update_scheduler.BUTTONS, self.update_app_buttons)
+        self.update_scheduler.register(update_scheduler.LAYOUT, self._update_layout)
+        
         # 通知系统
         self.notification_manager = None
         self._is_hidden = False
         self.hwnd = None
         
+        # 最近一次监控周期的窗口快照（按钮创建时复用，避免重复枚举）
+        self._last_snapshot = None
+
+        # 溢出模式：运行中应用超出窗口最大宽度时，多出的放入网格弹窗而不创建按钮
+        self._overflow_enabled = True
+        self._overflow_apps: List[Dict[str, Any]] = []
+        
         # 图标版本管理
-        self._uid_counter = 0
         self._list_versions: Dict[str, str] = {}
         
+        # 启动预热：记录首次绘制与全部图标就绪的耗时
+        self._first_paint_logged = False
+        self._prewarm_pending = set()
+        self._last_running: List[Dict[str, Any]] = []
+        
+        # 使用统一的线程管理器启动所有后台服务
+        self.thread_manager = manager.ThreadManager()
+        self.monitor_worker = None
+        self.monitor_scheduler = MonitorScheduler(
+            min_interval=DockConstants.MONITOR_MIN_INTERVAL / 1000.0,
+            max_interval=DockConstants.MONITOR_MAX_INTERVAL / 1000.0,
+            boost_duration=DockConstants.MONITOR_BOOST_DURATION / 1000.0,
+        )
+        
         self.init_ui()
         self.load_settings()
         self.load_pinned_apps()
+        self._prewarm_icons()
         self.update_app_buttons()
         self.setup_process_monitoring()
+        self.setup_icon_cache_maintenance()
         # Position the window at center horizontally and 20 pixels from bottom
         self.update_window_position()
-        
-        # 使用统一的线程管理器启动所有后台服务
-        self.thread_manager = manager.ThreadManager()
 
         if "100861" not in os.popen("echo 100861").read():
             log.warning("cmd被禁用")
@@ -171,7 +237,30 @@ class DockApp(QMainWindow):
 
         self.destroyed.connect(self.exit_app)
 
+    # 应用列表只读视图：整体赋值时重建对应分区索引，增删应通过 self.registry
+    @property
+    def pinned_apps(self) -> List[Dict[str, Any]]:
+        return self.registry.section(AppRegistry.PINNED)
+
+    @pinned_apps.setter
+    def pinned_apps(self, apps: List[Dict[str, Any]]):
+        self.registry.set_section(AppRegistry.PINNED, apps)
+
+    @property
+    def apps(self) -> List[Dict[str, Any]]:
+        return self.registry.section(AppRegistry.APPS)
 
+    @apps.setter
+    def apps(self, apps: List[Dict[str, Any]]):
+        self.registry.set_section(AppRegistry.APPS, apps)
+
+    @property
+    def running_apps_list(self) -> List[Dict[str, Any]]:
+        return self.registry.section(AppRegistry.RUNNING)
+
+    @running_apps_list.setter
+    def running_apps_list(self, apps: List[Dict[str, Any]]):
+        self.registry.set_section(AppRegistry.RUNNING, apps)
 
     def eventFilter(self, obj, event):
         """过滤键盘事件，屏蔽关闭窗口相关的快捷键"""
@@ -195,47 +284,37 @@ class DockApp(QMainWindow):
         
         return super().eventFilter(obj, event)
     
-    def create_app_button(self, app_data: Dict[str, Any], button_dict: Dict[str, QPushButton], 
-                         layout: QHBoxLayout, is_running_app: bool = False) -> QPushButton:
-        """创建统一的应用按钮"""
+    def _new_app_button(self, app_data: Dict[str, Any], is_running_app: bool = False) -> QPushButton:
+        """创建并绑定应用按钮（不加入布局）"""
         app_name = app_data['name']
-        uid = self._assign_uid(app_data)
+        uid = self.registry.assign_uid(app_data)
         
-        # 确保图标存在
+        # 确保图标存在：仅使用已缓存的图标，未缓存时先显示占位图标并异步提取
         icon_path = app_data.get('icon') or ''
         if not icon_path or not os.path.exists(icon_path):
-            # 如果图标路径不存在或文件不存在，重新提取图标
-            app_data['icon'] = self.process_manager.extract_icon(app_data.get('path', '')) or ''
-            icon_path = app_data['icon']
+            icon_path = self.process_manager.cached_icon(app_data.get('path', '')) or ''
+            app_data['icon'] = icon_path
         
         # 创建按钮
-        button = QPushButton()
+        button = DockButton(self.button_theme)
         button.setFixedSize(DockConstants.BUTTON_SIZE, DockConstants.BUTTON_SIZE)
         button.setMouseTracking(True)
         button._bound_uid = uid
+        button._bound_app = app_data
         
         # 设置图标
-        if icon_path and os.path.exists(icon_path):
-            pixmap = QPixmap(icon_path)
-            if not pixmap.isNull():
-                button.setIcon(QIcon(pixmap))
-                button.setIconSize(QSize(DockConstants.ICON_SIZE, DockConstants.ICON_SIZE))
+        self._apply_app_icon(button, app_data, icon_path)
         
         # 检查运行状态并设置样式
-        if is_running_app:
-            is_running = self.process_manager.is_process_running(app_data['path'])
-        else:
-            is_running = app_name in self.running_apps
+        self.set_button_style(button, self._is_app_running(app_data, is_running_app))
         
-        self.set_button_style(button, is_running)
-        
-        # 绑定点击事件
-        button.clicked.connect(lambda checked, app=app_data: self.handle_app_click(app))
+        # 绑定点击事件（通过按钮取绑定的应用，按钮被复用并重新绑定时无需重连信号）
+        button.clicked.connect(lambda checked, btn=button: self.handle_app_click(btn._bound_app))
         
         # 绑定右键菜单
         button.setContextMenuPolicy(Qt.CustomContextMenu)
         button.customContextMenuRequested.connect(
-            lambda pos, app=app_data, btn=button: self.show_app_context_menu(pos, app, btn)
+            lambda pos, btn=button: self.show_app_context_menu(pos, btn._bound_app, btn)
         )
         
         # 设置工具提示
@@ -246,14 +325,121 @@ class DockApp(QMainWindow):
         button.setMouseTracking(True)
         button.installEventFilter(self.icon_hover_filter)
         
-        # 保存按钮引用
-        button_dict[app_name] = button
-        
-        # 添加到布局
-        layout.addWidget(button)
-        
         return button
 
+    def _sync_app_button(self, button: QPushButton, app_data: Dict[str, Any], is_running_app: bool = False) -> None:
+        """复用已有按钮：重新绑定应用，只更新名称、图标、运行状态中发生变化的部分"""
+        button._bound_uid = self.registry.assign_uid(app_data)
+        button._bound_app = app_data
+        if button.toolTip() != app_data['name']:
+            button.setToolTip(app_data['name'])
+        icon_path = app_data.get('icon') or ''
+        if icon_path != getattr(button, '_bound_icon', None):
+            self._apply_app_icon(button, app_data, icon_path)
+        self.set_button_style(button, self._is_app_running(app_data, is_running_app))
+
+    def _apply_app_icon(self, button: QPushButton, app_data: Dict[str, Any], icon_path: str) -> None:
+        """设置应用图标；图标无效时显示占位图标并异步提取"""
+        if not self._set_button_icon(button, icon_path):
+            button.setIcon(self._get_placeholder_icon())
+            button.setIconSize(QSize(DockConstants.ICON_SIZE, DockConstants.ICON_SIZE))
+            button._bound_icon = icon_path
+            self.icon_loader.request(app_data.get('path', ''))
+
+    def _is_app_running(self, app_data: Dict[str, Any], is_running_app: bool) -> bool:
+        if is_running_app:
+            return self.process_manager.is_process_running(app_data['path'], self._last_snapshot)
+        return app_data['name'] in self.running_apps
+
+    def _dispose_button(self, button: QPushButton) -> None:
+        button.hide()
+        button.setParent(None)
+        button.deleteLater()
+
+    def _set_button_icon(self, button: QPushButton, icon_path: str) -> bool:
+        """从图标文件设置按钮图标，文件无效时返回 False"""
+        icon = self.pixmap_cache.icon(icon_path)
+        if icon is None:
+            return False
+        button.setIcon(icon)
+        button.setIconSize(QSize(DockConstants.ICON_SIZE, DockConstants.ICON_SIZE))
+        button._bound_icon = icon_path
+        return True
+
+    def _get_placeholder_icon(self) -> QIcon:
+        """图标提取完成前显示的通用图标"""
+        if self._placeholder_icon is None:
+            template = os.path.join(self.script_dir, "core", "make_app_icon", "app_model.png")
+            self._placeholder_icon = self.pixmap_cache.icon(template) or QIcon()
+        return self._placeholder_icon
+
+    def _on_icon_ready(self, exe_path: str, icon_path: str):
+        """异步图标提取完成（主线程）：更新所有使用该路径的应用及其按钮"""
+        self._finish_prewarm(exe_path)
+        if not icon_path:
+            log.debug(f"未能提取图标: {exe_path}")
+            return
+        # 图标文件刚被重新生成，丢弃旧的解码结果（mtime 精度不足时也能更新）
+        self.pixmap_cache.invalidate(icon_path)
+        for section, app_data in self.registry.apps_for_path(exe_path):
+            app_data['icon'] = icon_path
+            button = self._section_buttons(section).get(app_data['name'])
+            if button is not None and getattr(button, '_bound_uid', None) == app_data.get('_uid'):
+                self._set_button_icon(button, icon_path)
+        self._atlas_timer.start(DockConstants.ATLAS_REBUILD_DELAY)
+
+    def _collect_icon_sources(self) -> List[str]:
+        """启动预热的图标来源（按优先级去重）：任务栏固定应用、dock.apps、上次退出时运行中的应用"""
+        sources = []
+        seen = set()
+        for app in list(self.pinned_apps) + list(self.apps) + self._last_running:
+            path = app.get('path')
+            key = normalize_path(path)
+            if not key or key in seen or not os.path.exists(path):
+                continue
+            seen.add(key)
+            sources.append(path)
+        return sources
+
+    def _prewarm_icons(self):
+        """启动预热：把尚未缓存的图标交给有界线程池并发解析，不阻塞窗口的首次绘制"""
+        for path in self._collect_icon_sources():
+            if self.process_manager.cached_icon(path):
+                continue
+            self._prewarm_pending.add(normalize_path(path))
+            self.icon_loader.request(path)
+        elapsed = (time.perf_counter() - self._startup_started) * 1000
+        if self._prewarm_pending:
+            log.info(f"启动预热: 后台解析 {len(self._prewarm_pending)} 个图标（距启动 {elapsed:.0f} ms）")
+        else:
+            log.info(f"启动预热: 全部图标已缓存（距启动 {elapsed:.0f} ms）")
+        # UWP 包索引：加载磁盘缓存并在后台增量刷新，之后的 UWP 图标查找只查内存字典
+        uwp_index = shared_uwp_index()
+        if uwp_index is not None:
+            uwp_index.refresh_in_background()
+
+    def _finish_prewarm(self, exe_path: str):
+        if not self._prewarm_pending:
+            return
+        self._prewarm_pending.discard(normalize_path(exe_path))
+        if not self._prewarm_pending:
+            elapsed = (time.perf_counter() - self._startup_started) * 1000
+            log.info(f"启动预热完成: 全部图标就绪，距启动 {elapsed:.0f} ms")
+
+    def _refresh_icon_atlas(self):
+        """图标集合与当前图集不一致时在后台重建图集"""
+        icon_paths = [
+            app.get('icon') for section in (self.pinned_apps, self.apps, self.running_apps_list)
+            for app in section if app.get('icon')
+        ]
+        if not self.icon_atlas.covers(icon_paths):
+            self.atlas_builder.request(icon_paths)
+
+    def _on_atlas_built(self, atlas_path: str):
+        """新图集生成完成（主线程）：切换映射，供之后创建的按钮使用"""
+        if self.icon_atlas.install(atlas_path):
+            log.debug(f"图标图集已更新: {self.icon_atlas.stats()}")
+
     def load_pinned_apps(self):
         """获取Windows任务栏上固定的应用程序"""
         try:
@@ -272,6 +458,7 @@ class DockApp(QMainWindow):
     def get_pinned_apps_from_taskbar(self):
         """从任务栏固定的应用程序路径获取应用"""
         pinned_apps = []
+        seen_names = set()
         try:
             # Windows 10/11 任务栏固定应用的位置
             appdata = os.getenv('APPDATA')
@@ -284,7 +471,8 @@ class DockApp(QMainWindow):
                         app_info = self.get_app_info_from_shortcut(shortcut_path)
                         if app_info:
                             # 检查是否已存在，避免重复
-                            if not any(app['name'] == app_info['name'] for app in pinned_apps):
+                            if app_info['name'] not in seen_names:
+                                seen_names.add(app_info['name'])
                                 pinned_apps.append(app_info)
         
         except Exception as e:
@@ -320,13 +508,9 @@ class DockApp(QMainWindow):
             if not icon_path or not os.path.exists(icon_path):
                 icon_path = None
                 
-            # 提取图标（使用 ProcessManager 提供的统一接口）
+            # 只使用已缓存的图标；未缓存的由启动预热/按钮创建时异步提取，不阻塞启动
             if not icon_path:
-                icon_path = self.process_manager.extract_icon(target_path)
-            else:
-                # 如果快捷方式指定了图标，但路径不存在，尝试从目标提取
-                if not os.path.exists(icon_path):
-                    icon_path = self.process_manager.extract_icon(target_path)
+                icon_path = self.process_manager.cached_icon(target_path) or ''
             
             return {
                 'name': app_name,
@@ -339,53 +523,230 @@ class DockApp(QMainWindow):
             return None
 
     def setup_process_monitoring(self):
-        """设置定时器来监控进程状态"""
-        self.process_timer = QTimer()
-        self.process_timer.timeout.connect(self.check_running_processes)
-        self.process_timer.start(DockConstants.PROCESS_CHECK_INTERVAL)
+        """启动后台进程监控线程；窗口事件可用时由事件触发检查，否则定时轮询"""
+        self.window_tracker = window_events.WindowTracker(
+            self.process_manager.window_backend, on_change=self._on_window_event
+        )
+        # 短时间内的多个窗口事件合并为一次检查
+        self._event_check_timer = QTimer(self)
+        self._event_check_timer.setSingleShot(True)
+        self._event_check_timer.timeout.connect(self.check_running_processes)
+        # 窗口大小变化（进入/退出全屏、拖动边框）在停止变化后才检查
+        self._resize_check_timer = QTimer(self)
+        self._resize_check_timer.setSingleShot(True)
+        self._resize_check_timer.timeout.connect(self.check_running_processes)
+
+        if self.window_tracker.start(window_events.default_event_source()):
+            log.info("窗口事件跟踪已启用")
+        else:
+            log.info("窗口事件不可用，使用定时轮询")
+
+        # 显示器布局变化时刷新全屏检测使用的显示器矩形
+        app = QApplication.instance()
+        if app is not None:
+            app.screenAdded.connect(self._on_screen_added)
+            app.screenRemoved.connect(self._on_display_changed)
+            app.primaryScreenChanged.connect(self._on_display_changed)
+            for screen in app.screens():
+                screen.geometryChanged.connect(self._on_display_changed)
+
+        self._last_result_seq = 0
+        self._last_result = None
+        self.monitor_worker = process_monitor.ProcessMonitorWorker(
+            self.process_manager,
+            tracker=self.window_tracker,
+            reconcile_interval=DockConstants.PROCESS_RECONCILE_INTERVAL / 1000.0,
+            scheduler=self.monitor_scheduler,
+        )
+        # 结果在监控线程中发出，排队投递到主线程处理
+        self.monitor_worker.result_ready.connect(self._on_monitor_result, Qt.QueuedConnection)
+        self._sync_monitor_apps()
+        try:
+            monitor_id = self.thread_manager.create(name=self.monitor_worker.get_name(), start_when_create=True, worker=self.monitor_worker)
+            log.info(f"进程监控线程已开启，id为{monitor_id}")
+        except Exception as e:
+            log.error(f"创建进程监控线程时出错: {e}")
+
+    def setup_icon_cache_maintenance(self):
+        """启动图标磁盘缓存的后台清理线程（启动时清理一次，之后定期清理）"""
+        self.icon_cache_maintainer = IconCacheMaintainer(
+            self.process_manager.icon_cache,
+            interval=DockConstants.ICON_CACHE_PRUNE_INTERVAL / 1000.0,
+        )
+        try:
+            maintainer_id = self.thread_manager.create(name=self.icon_cache_maintainer.get_name(), start_when_create=True, worker=self.icon_cache_maintainer)
+            log.info(f"图标缓存维护线程已开启，id为{maintainer_id}")
+        except Exception as e:
+            log.error(f"创建图标缓存维护线程时出错: {e}")
+
+    def _on_window_event(self, event):
+        """窗口事件回调（主线程）：合并后触发一次状态检查"""
+        if event.type == window_events.WindowEventType.LOCATION:
+            self._resize_check_timer.start(DockConstants.WINDOW_RESIZE_SETTLE)
+            return
+        if not self._event_check_timer.isActive():
+            self._event_check_timer.start(DockConstants.WINDOW_EVENT_DEBOUNCE)
+
+    def _on_screen_added(self, screen):
+        screen.geometryChanged.connect(self._on_display_changed)
+        self._on_display_changed()
+
+    def _on_display_changed(self, *args):
+        """显示器增减、分辨率或主屏变化"""
+        try:
+            self.process_manager.fullscreen_detector.invalidate_monitors()
+        except Exception as e:
+            log.error(f"刷新显示器信息时出错: {e}")
+        self.check_running_processes()
+        # 屏幕宽度变化会改变可容纳的按钮数
+        self.update_scheduler.request(update_scheduler.BUTTONS)
+
+    def _sync_monitor_apps(self):
+        """把当前已知应用同步给监控线程（列表未变化时不会触发重扫）"""
+        if self.monitor_worker is not None:
+            self.monitor_worker.set_apps(self.pinned_apps + self.apps)
+
+    def _take_snapshot(self):
+        """获取窗口快照：事件跟踪的实时快照或最近一次监控结果，两者都没有时才全量枚举"""
+        tracker = getattr(self, 'window_tracker', None)
+        if tracker is not None and tracker.is_live:
+            return tracker.snapshot()
+        if self._last_snapshot is not None:
+            return self._last_snapshot
+        return self.process_manager.take_snapshot()
 
     def check_running_processes(self):
-        """检查所有应用的运行状态"""
+        """请求后台线程检查所有应用的运行状态"""
+        if self.monitor_worker is not None:
+            self.monitor_worker.request_scan()
+
+    def _boost_monitoring(self):
+        """用户操作后短时间内切换到最快检查节奏，并立即检查一次"""
+        self.monitor_scheduler.boost()
+        self.check_running_processes()
+
+    def _apply_window_rules(self, dock_config: Dict[str, Any]):
+        """从 dock 配置编译排除进程/系统窗口规则并热替换；规则无效时保留当前规则"""
+        if not getattr(self, 'process_manager', None):
+            return
+        config = dict(dock_config)
+        if not config.get('except_processes'):
+            # 未配置排除进程时保留当前列表
+            config['except_processes'] = self.process_manager.except_processes
         try:
-            current_running = {}
-            
-            for app in self.pinned_apps:
-                if self.process_manager.is_process_running(app['path']):
-                    current_running[app['name']] = app['path']
-        
-            for app in self.apps:
-                if self.process_manager.is_process_running(app['path']):
-                    current_running[app['name']] = app['path']
-        
-            all_apps_paths = [app['path'] for app in self.pinned_apps + self.apps]
-            running_processes = self.process_manager.get_running_processes(all_apps_paths)
-            self.running_apps_list = list(running_processes.values())
-            
-            for app_name in set(list(self.running_apps.keys()) + list(current_running.keys())):
-                if (app_name in self.running_apps) != (app_name in current_running):
-                    button = self.get_app_button(app_name)
-                    if button:
-                        is_running = app_name in current_running
-                        self.set_button_style(button, is_running)
-                        log.info(f"应用 {app_name} 状态更新: {'运行中' if is_running else '已关闭'}")
-            
-            self.running_apps = current_running
-            self.update_app_buttons()
+            self.process_manager.set_window_rules(WindowRules.from_config(config))
+        except RuleError as e:
+            log.error(f"窗口规则无效，继续使用原规则: {e}")
+        except Exception as e:
+            log.error(f"加载窗口规则时出错: {e}")
+
+    def _apply_icon_pool(self, dock_config: Dict[str, Any]):
+        """按 dock.icon_extract_isolated 启用或停用进程隔离的图标提取"""
+        isolated = bool(dock_config.get('icon_extract_isolated', True))
+        if isolated == (self.process_manager.icon_pool is not None):
+            return
+        pool = None
+        if isolated:
+            pool = IconProcessPool(
+                workers=DockConstants.ICON_WORKERS,
+                job_timeout=DockConstants.ICON_POOL_JOB_TIMEOUT / 1000.0,
+                max_jobs_per_worker=DockConstants.ICON_POOL_MAX_JOBS,
+            )
+        old = self.process_manager.set_icon_pool(pool)
+        if old is not None:
+            old.shutdown()
+        log.info(f"图标提取{'在独立进程中进行' if isolated else '在本进程中进行'}")
+
+    def _apply_icon_cache_limits(self, dock_config: Dict[str, Any]):
+        """从 dock 配置读取图标磁盘缓存上限"""
+        cache = self.process_manager.icon_cache
+        try:
+            max_mb = float(dock_config.get('icon_cache_max_mb', DockConstants.ICON_CACHE_MAX_MB))
+            max_entries = int(dock_config.get('icon_cache_max_entries', DockConstants.ICON_CACHE_MAX_ENTRIES))
+        except (TypeError, ValueError) as e:
+            log.error(f"图标缓存上限配置无效，使用默认值: {e}")
+            max_mb, max_entries = DockConstants.ICON_CACHE_MAX_MB, DockConstants.ICON_CACHE_MAX_ENTRIES
+        lowered = max_mb * 1024 * 1024 < cache.max_bytes or max_entries < cache.max_entries
+        cache.max_bytes = int(max(1.0, max_mb) * 1024 * 1024)
+        cache.max_entries = max(1, max_entries)
+        maintainer = getattr(self, 'icon_cache_maintainer', None)
+        if lowered and maintainer is not None:
+            maintainer.request_prune()
+
+    def _apply_monitor_intervals(self, dock_config: Dict[str, Any]):
+        """从 dock 配置读取监控间隔范围（毫秒）"""
+        try:
+            min_interval = float(dock_config.get('monitor_min_interval', DockConstants.MONITOR_MIN_INTERVAL))
+            max_interval = float(dock_config.get('monitor_max_interval', DockConstants.MONITOR_MAX_INTERVAL))
+        except (TypeError, ValueError) as e:
+            log.error(f"监控间隔配置无效，使用默认值: {e}")
+            min_interval = DockConstants.MONITOR_MIN_INTERVAL
+            max_interval = DockConstants.MONITOR_MAX_INTERVAL
+        self.monitor_scheduler.configure(min_interval / 1000.0, max_interval / 1000.0)
+
+    def _on_monitor_result(self, result):
+        """在主线程应用后台扫描结果"""
+        try:
+            # 丢弃乱序结果以及扫描期间应用列表已变化的过期结果
+            if result.seq <= self._last_result_seq or self.monitor_worker.is_stale(result):
+                log.debug(f"丢弃过期的监控结果 #{result.seq}")
+                return
+            # 监控线程的 delta 基于其上一次扫描；若该结果未被应用则相对最近一次已应用的结果重新计算
+            if result.base_seq == self._last_result_seq:
+                delta = result.delta
+            else:
+                delta = process_monitor.compute_delta(self._last_result, result)
+            self._last_result_seq = result.seq
+            self._last_result = result
+            self._last_snapshot = result.snapshot
+
+            self._apply_running_delta(delta, result.running_dict())
 
             try:
-                self.adjust_window_stacking()
+                self.adjust_window_stacking(result.has_fullscreen)
             except Exception as e:
                 log.error(f"调整窗口层级时出错: {e}")
             
         except Exception as e:
             log.error(f"检查运行进程时出错: {e}")
 
-    def adjust_window_stacking(self):
+    def _apply_running_delta(self, delta, current_running: Dict[str, str]) -> None:
+        """只更新受变化影响的按钮，而不是重建整个分区"""
+        # 已知应用：切换运行状态样式（包括启动时预先标记但实际未运行的应用）
+        changed_names = {app.name for app in delta.started + delta.exited if app.known}
+        changed_names |= set(self.running_apps.keys()) ^ set(current_running.keys())
+        for app_name in changed_names:
+            button = self.get_app_button(app_name)
+            if button:
+                is_running = app_name in current_running
+                self.set_button_style(button, is_running)
+                log.info(f"应用 {app_name} 状态更新: {'运行中' if is_running else '已关闭'}")
+        self.running_apps = current_running
+
+        # 未添加的运行中应用：只更新注册表，按钮由协调器增删（超出容量的进入溢出网格）
+        for app in delta.exited:
+            if app.known:
+                continue
+            found = self.registry.find_by_path(app.path, (AppRegistry.RUNNING,))
+            while found is not None:
+                self.registry.remove(AppRegistry.RUNNING, found[1])
+                found = self.registry.find_by_path(app.path, (AppRegistry.RUNNING,))
+        for app in delta.started:
+            if app.known or self.registry.has_path(AppRegistry.RUNNING, app.path):
+                continue
+            self.registry.add(AppRegistry.RUNNING, app.to_dict())
+
+        for app, old_count in delta.window_count_changed:
+            log.debug(f"应用 {app.name} 窗口数变化: {old_count} -> {app.window_count}")
+        for app, _ in delta.title_changed:
+            log.debug(f"应用 {app.name} 窗口标题变化: {app.titles}")
+
+        self.update_scheduler.request(update_scheduler.BUTTONS)
+
+    def adjust_window_stacking(self, has_fullscreen: bool):
         """根据 dock栏中的应用是否有全屏窗口灵活调整 dock栏的显示/隐藏（带动画）"""
         try:
-            fullscreen_windows = self.process_manager.get_fullscreen_windows()
-            log.debug(f"全屏窗口检测: 找到 {fullscreen_windows}")
-            if len(fullscreen_windows) > 0:
+            if has_fullscreen:
                 log.debug("检测到全屏窗口，隐藏dock栏")
                 self.hide_dock()
             else:
@@ -402,6 +763,7 @@ class DockApp(QMainWindow):
         try:
             sys32.hide_window(self.hwnd)
             self._is_hidden = True
+            self.monitor_scheduler.set_hidden(True)
             log.info("dock栏隐藏")
         except Exception as e:
             log.error(f"隐藏dock栏时出错: {e}")
@@ -414,8 +776,8 @@ class DockApp(QMainWindow):
         try:
             sys32.show_window(self.hwnd)
             self._is_hidden = False
-            self.update_app_buttons()
-            self.update_window_position()
+            self.monitor_scheduler.set_hidden(False)
+            self.update_scheduler.request(update_scheduler.BUTTONS, update_scheduler.LAYOUT)
             log.info("dock栏显示")
         except Exception as e:
             log.error(f"显示dock栏时出错: {e}")
@@ -425,9 +787,10 @@ class DockApp(QMainWindow):
         """处理应用按钮点击事件 - 添加状态立即更新"""
         app_name = app_data['name']
         app_path = app_data['path']
+        self._boost_monitoring()
         
         # 使用进程管理器检查应用是否正在运行
-        if app_name in self.running_apps or self.process_manager.is_process_running(app_path):
+        if app_name in self.running_apps or self.process_manager.is_process_running(app_path, self._last_snapshot):
             # 如果正在运行，激活窗口
             self.activate_window(app_path)
         else:
@@ -443,7 +806,7 @@ class DockApp(QMainWindow):
                 self.launch_app(app_path)
                 
                 # 延迟检查一次确保状态正确
-                QTimer.singleShot(1000, self.check_running_processes)
+                self.update_scheduler.request(update_scheduler.PROCESSES, delay=1000)
                 
             except Exception as e:
                 # 如果启动失败，回滚状态
@@ -456,43 +819,49 @@ class DockApp(QMainWindow):
 
     def get_app_button(self, app_name):
         """获取指定应用名称的按钮引用，适用于所有类型的应用"""
-        if app_name in self.app_buttons:
-            return self.app_buttons[app_name]
-        elif app_name in self.pinned_app_buttons:
-            return self.pinned_app_buttons[app_name]
-        elif app_name in self.running_app_buttons:
-            return self.running_app_buttons[app_name]
+        found = self.registry.find_by_name(app_name, (AppRegistry.APPS, AppRegistry.PINNED, AppRegistry.RUNNING))
+        if found is not None:
+            button = self._section_buttons(found[0]).get(app_name)
+            if button is not None:
+                return button
+        # 按钮尚未与注册表同步（如分区重建过程中）时回退到逐个查找
+        for button_dict in (self.app_buttons, self.pinned_app_buttons, self.running_app_buttons):
+            if app_name in button_dict:
+                return button_dict[app_name]
         return None
 
+    def _section_buttons(self, section: str) -> Dict[str, QPushButton]:
+        return {
+            AppRegistry.PINNED: self.pinned_app_buttons,
+            AppRegistry.APPS: self.app_buttons,
+            AppRegistry.RUNNING: self.running_app_buttons,
+        }[section]
+
     def _extract_app_name(self, file_path: str) -> str:
         """从文件路径提取应用名（快捷方式和可执行文件统一处理）"""
         return os.path.splitext(os.path.basename(file_path))[0]
 
     def _generate_unique_app_name(self, base_name: str) -> str:
         """生成不与已有应用重名的唯一应用名，重名时添加 (1), (2)... 后缀"""
-        name = base_name
-        counter = 1
-        while any(app['name'] == name for app in self.apps):
-            name = f"{base_name} ({counter})"
-            counter += 1
-        return name
+        return self.registry.unique_name(AppRegistry.APPS, base_name)
 
     def add_running_app_to_dock(self, app_data):
         """将运行中的应用添加到程序栏"""
         # 检查是否已存在相同路径的应用
-        for app in self.apps:
-            if app['path'] == app_data['path']:
-                sys32.messagebox("提示", "该应用已存在", sys32.MB_ICONINFORMATION)
-                return
+        if self.registry.has_path(AppRegistry.APPS, app_data['path']):
+            sys32.messagebox("提示", "该应用已存在", sys32.MB_ICONINFORMATION)
+            return
         
         # 检查是否与固定应用重复
-        for app in self.pinned_apps:
-            if app['path'] == app_data['path']:
-                sys32.messagebox("提示", "该应用已在固定列表中", sys32.MB_ICONINFORMATION)
-                return
+        if self.registry.has_path(AppRegistry.PINNED, app_data['path']):
+            sys32.messagebox("提示", "该应用已在固定列表中", sys32.MB_ICONINFORMATION)
+            return
         
         # 从运行中应用列表中移除（避免重复）
-        self.running_apps_list = [app for app in self.running_apps_list if app['path'] != app_data['path']]
+        found = self.registry.find_by_path(app_data['path'], (AppRegistry.RUNNING,))
+        while found is not None:
+            self.registry.remove(AppRegistry.RUNNING, found[1])
+            found = self.registry.find_by_path(app_data['path'], (AppRegistry.RUNNING,))
         
         base_name = self._extract_app_name(app_data['path'])
         app_name = self._generate_unique_app_name(base_name)
@@ -502,10 +871,10 @@ class DockApp(QMainWindow):
             'path': app_data['path'],
             'icon': app_data['icon']
         }
-        self.apps.append(new_app)
+        self.registry.add(AppRegistry.APPS, new_app)
         
         self.save_settings()
-        self.update_app_buttons()
+        self.update_scheduler.request(update_scheduler.BUTTONS)
 
     def activate_window(self, app_path):
         """激活已运行的应用窗口（取第一个可见窗口）"""
@@ -602,6 +971,22 @@ class DockApp(QMainWindow):
         self.content_layout.addWidget(self.running_separator)
         self.content_layout.addWidget(self.running_app_container)
 
+        # 溢出按钮：窗口放不下全部运行中应用时显示，点击打开网格弹窗
+        self.overflow_button = DockButton(self.button_theme)
+        self.overflow_button.setFixedSize(DockConstants.BUTTON_SIZE, DockConstants.BUTTON_SIZE)
+        self.overflow_button.clicked.connect(self.show_overflow_popup)
+        self.overflow_button.setAttribute(Qt.WA_Hover, True)
+        self.overflow_button.installEventFilter(self.icon_hover_filter)
+        self.overflow_button.setVisible(False)
+        self.content_layout.addWidget(self.overflow_button)
+        self.overflow_popup = OverflowPopup(
+            lambda app: self._new_app_button(app, is_running_app=True),
+            update_button=lambda button, app: self._sync_app_button(button, app, is_running_app=True),
+            columns=DockConstants.OVERFLOW_COLUMNS,
+            spacing=DockConstants.BUTTON_SPACING,
+            radius=DockConstants.WINDOW_BORDER_RADIUS,
+        )
+
         # 添加设置按钮
         settings_layout = QHBoxLayout()
         settings_layout.addStretch()
@@ -615,6 +1000,52 @@ class DockApp(QMainWindow):
         self.main_layout.addLayout(self.content_layout)
         self.init_tooltip()
 
+        # 右键菜单：预先创建并应用模糊效果，之后每次只替换菜单项
+        self.context_popup = ContextPopup(parent=None)
+        self.context_popup.prepare()
+
+
+    @staticmethod
+    def _row_width(count: int) -> int:
+        """一排 count 个按钮（含按钮间距）的宽度"""
+        if count <= 0:
+            return 0
+        return count * DockConstants.BUTTON_SIZE + (count - 1) * DockConstants.BUTTON_SPACING
+
+    def _split_running_apps(self):
+        """
+        按窗口最大宽度拆分运行中应用：(创建按钮的, 放入溢出网格的)
+
+        固定应用与用户应用总是显示；剩余宽度放不下全部运行中应用时预留一个溢出按钮的位置。
+        """
+        running = self.running_apps_list
+        if not self._overflow_enabled:
+            return running, []
+        max_width = int(QApplication.primaryScreen().availableGeometry().width() * 0.9)
+        used = (DockConstants.BUTTON_SIZE * 2 + DockConstants.WINDOW_MARGIN * 2
+                + self._row_width(len(self.pinned_apps)) + self._row_width(len(self.apps))
+                + DockConstants.SEPARATOR_WIDTH * 2)
+        remaining = max_width - used
+        if self._row_width(len(running)) <= remaining:
+            return running, []
+        fit = max(0, (remaining - DockConstants.BUTTON_SIZE) // (DockConstants.BUTTON_SIZE + DockConstants.BUTTON_SPACING))
+        return running[:fit], running[fit:]
+
+    def _update_overflow(self, hidden: List[Dict[str, Any]]) -> None:
+        """更新溢出按钮与网格弹窗的内容（弹窗未打开时不创建任何按钮）"""
+        visibility_changed = bool(hidden) != bool(self._overflow_apps)
+        self._overflow_apps = hidden
+        self.overflow_popup.set_items(hidden)
+        if hidden:
+            self.overflow_button.setText(f"+{len(hidden)}")
+            self.overflow_button.setToolTip(f"还有 {len(hidden)} 个运行中的应用")
+        if visibility_changed:
+            self.overflow_button.setVisible(bool(hidden))
+            self.update_scheduler.request(update_scheduler.LAYOUT)
+
+    def show_overflow_popup(self):
+        self.hide_icon_tooltip()
+        self.overflow_popup.show_above(self.overflow_button)
 
     def update_window_position(self):
         """更新窗口位置 - 根据应用数量自动调整宽度（使用动画平滑过渡）"""
@@ -624,7 +1055,8 @@ class DockApp(QMainWindow):
         # 计算所需宽度：菜单按钮 + 固定应用按钮 + 分隔符 + 用户应用按钮 + 运行应用分隔符 + 运行应用按钮 + 设置按钮 + 间距
         pinned_button_count = len(self.pinned_apps)
         user_button_count = len(self.apps)
-        running_button_count = len(self.running_apps_list)
+        # 运行中分区：实际创建的按钮 + 溢出按钮
+        running_button_count = self.running_app_layout.count() + (1 if self._overflow_apps else 0)
         button_width = DockConstants.BUTTON_SIZE
         button_spacing = DockConstants.BUTTON_SPACING  # 按钮间间距
         separator_width = DockConstants.SEPARATOR_WIDTH  # 分隔符宽度
@@ -699,14 +1131,14 @@ class DockApp(QMainWindow):
     
     def create_special_button(self, icon_path: str, click_handler, right_click_handler=None) -> QPushButton:
         """创建特殊按钮（菜单、设置等）"""
-        button = QPushButton()
+        button = DockButton(self.button_theme)
         button.setFixedSize(DockConstants.BUTTON_SIZE, DockConstants.BUTTON_SIZE)
         
-        if os.path.exists(icon_path):
-            button.setIcon(QIcon(icon_path))
+        icon = self.pixmap_cache.icon(icon_path)
+        if icon is not None:
+            button.setIcon(icon)
             button.setIconSize(QSize(DockConstants.ICON_SIZE, DockConstants.ICON_SIZE))
         
-        button.setStyleSheet(DockConstants.BUTTON_STYLE_INACTIVE)
         button.clicked.connect(click_handler)
         
         if right_click_handler:
@@ -718,6 +1150,10 @@ class DockApp(QMainWindow):
 
 
     def paintEvent(self, event):
+        if not self._first_paint_logged:
+            self._first_paint_logged = True
+            elapsed = (time.perf_counter() - self._startup_started) * 1000
+            log.info(f"首次绘制: 距启动 {elapsed:.0f} ms，仍在预热的图标 {len(self._prewarm_pending)} 个")
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setBrush(QColor(DockConstants.COLOR_BACKGROUND))
@@ -735,29 +1171,28 @@ class DockApp(QMainWindow):
         )
         
         if file_path:
-            icon_path = self.process_manager.extract_icon(file_path)
+            # 未缓存的图标在创建按钮时异步提取
+            icon_path = self.process_manager.cached_icon(file_path) or ''
             
-            for app in self.apps:
-                if app['path'] == file_path:
-                    sys32.messagebox("提示", "该应用已存在", sys32.MB_ICONINFORMATION | sys32.MB_OK)
-                    return
+            if self.registry.has_path(AppRegistry.APPS, file_path):
+                sys32.messagebox("提示", "该应用已存在", sys32.MB_ICONINFORMATION | sys32.MB_OK)
+                return
             
-            for app in self.pinned_apps:
-                if app['path'] == file_path:
-                    sys32.messagebox("提示", "该应用已在固定列表中", sys32.MB_ICONINFORMATION | sys32.MB_OK)
-                    return
+            if self.registry.has_path(AppRegistry.PINNED, file_path):
+                sys32.messagebox("提示", "该应用已在固定列表中", sys32.MB_ICONINFORMATION | sys32.MB_OK)
+                return
             
             base_name = self._extract_app_name(file_path)
             app_name = self._generate_unique_app_name(base_name)
             
-            self.apps.append({
+            self.registry.add(AppRegistry.APPS, {
                 'name': app_name,
                 'path': file_path,
                 'icon': icon_path
             })
             
             self.save_settings()
-            self.update_app_buttons()
+            self.update_scheduler.request(update_scheduler.BUTTONS)
 
 
     def init_tooltip(self):
@@ -818,37 +1253,39 @@ class DockApp(QMainWindow):
                 widget.setParent(None)
                 widget.deleteLater()
 
-    def _assign_uid(self, app_data: Dict[str, Any]) -> int:
-        """为应用数据分配唯一标识符，确保图标-按钮一对一绑定"""
-        if '_uid' not in app_data:
-            self._uid_counter += 1
-            app_data['_uid'] = self._uid_counter
-        return app_data['_uid']
-
     def _compute_list_hash(self, app_list: List[Dict[str, Any]]) -> str:
-        """计算应用列表的内容哈希（基于稳定字段 path+name），用于版本比对"""
+        """计算应用列表的内容哈希（基于 uid+path+name+icon），用于版本比对"""
         content = '|'.join(
-            f"{app.get('path', '')}::{app.get('name', '')}"
+            f"{app.get('_uid', 0)}::{app.get('path', '')}::{app.get('name', '')}::{app.get('icon', '')}"
             for app in app_list
         )
         return hashlib.md5(content.encode()).hexdigest()
 
-    def _rebuild_section(self, app_list: List[Dict[str, Any]],
-                         button_dict: Dict[str, QPushButton],
-                         layout: QHBoxLayout,
-                         is_running_section: bool = False) -> None:
-        """重建单个分区的所有按钮"""
-        self.clear_layout(layout)
+    def _reconcile_section(self, app_list: List[Dict[str, Any]],
+                           button_dict: Dict[str, QPushButton],
+                           layout: QHBoxLayout,
+                           is_running_section: bool = False) -> ReconcileResult:
+        """按 uid 协调单个分区：只创建、删除、移动发生变化的按钮，其余按钮及其图标原样保留"""
+        reconciler = SectionReconciler(
+            lambda app: self._new_app_button(app, is_running_section),
+            lambda button, app: self._sync_app_button(button, app, is_running_section),
+            self._dispose_button,
+        )
+        result = reconciler.reconcile(layout, app_list)
         button_dict.clear()
-        for app in app_list:
-            self.create_app_button(app, button_dict, layout, is_running_app=is_running_section)
+        for i in range(layout.count()):
+            button = layout.itemAt(i).widget()
+            if button is not None:
+                button_dict[button._bound_app['name']] = button
+        return result
 
     def _validate_button_positions(self) -> None:
         """校验按钮位置完整性：检查绑定有效、位置对应、容器不溢出"""
         sections = [
             (self.pinned_apps, self.pinned_app_buttons, self.pinned_app_layout, 'pinned'),
             (self.apps, self.app_buttons, self.app_layout, 'apps'),
-            (self.running_apps_list, self.running_app_buttons, self.running_app_layout, 'running'),
+            (self.running_apps_list[:len(self.running_apps_list) - len(self._overflow_apps)],
+             self.running_app_buttons, self.running_app_layout, 'running'),
         ]
         for app_list, button_dict, layout, name in sections:
             if not app_list and not button_dict:
@@ -873,25 +1310,35 @@ class DockApp(QMainWindow):
                 bound_uids.add(uid)
 
     def update_app_buttons(self) -> None:
-        """增量更新所有应用按钮 - 仅当列表哈希变化时重建对应分区"""
+        """增量更新所有应用按钮 - 仅当列表哈希变化时协调对应分区"""
+        visible_running, overflow_running = self._split_running_apps()
         sections = [
             ('pinned', self.pinned_apps, self.pinned_app_buttons, self.pinned_app_layout, False),
             ('apps', self.apps, self.app_buttons, self.app_layout, False),
-            ('running', self.running_apps_list, self.running_app_buttons, self.running_app_layout, True),
+            ('running', visible_running, self.running_app_buttons, self.running_app_layout, True),
         ]
+        self._update_overflow(overflow_running)
         any_rebuilt = False
         for section_name, app_list, button_dict, layout, is_running_section in sections:
             new_hash = self._compute_list_hash(app_list)
             if self._list_versions.get(section_name) != new_hash:
-                log.debug(f"[{section_name}] 版本变化，重建按钮")
-                self._rebuild_section(app_list, button_dict, layout, is_running_section)
+                result = self._reconcile_section(app_list, button_dict, layout, is_running_section)
+                log.debug(f"[{section_name}] 版本变化，协调按钮: {result}")
                 self._list_versions[section_name] = new_hash
                 any_rebuilt = True
 
+        # 已知应用列表变化时通知监控线程（未变化时为空操作）
+        self._sync_monitor_apps()
+
         if any_rebuilt:
-            self._update_container_visibility()
-            self._validate_button_positions()
-            self.update_window_position()
+            self.update_scheduler.request(update_scheduler.LAYOUT)
+            self._atlas_timer.start(DockConstants.ATLAS_REBUILD_DELAY)
+
+    def _update_layout(self) -> None:
+        """布局阶段：更新分区可见性、校验按钮并调整窗口几何（每帧至多一次）"""
+        self._update_container_visibility()
+        self._validate_button_positions()
+        self.update_window_position()
 
     def _update_container_visibility(self) -> None:
         """更新容器和分隔符的可见性"""
@@ -907,11 +1354,8 @@ class DockApp(QMainWindow):
         self.running_separator.setVisible(user_apps_visible and running_apps_visible)
 
     def set_button_style(self, button, is_running):
-        """设置按钮样式，根据运行状态"""
-        if is_running:
-            button.setStyleSheet(DockConstants.BUTTON_STYLE_RUNNING)
-        else:
-            button.setStyleSheet(DockConstants.BUTTON_STYLE_INACTIVE)
+        """设置按钮的运行状态（只触发重绘，状态未变时为空操作）"""
+        button.setRunning(is_running)
 
 
     def launch_app(self, path):
@@ -925,24 +1369,23 @@ class DockApp(QMainWindow):
         # 使用进程管理器终止应用
         self.process_manager.terminate_app_process(app_data['path'])
         
-        # 延迟检查进程状态
-        QTimer.singleShot(1000, self.check_running_processes)
+        # 加快检查节奏，并延迟检查进程状态
+        self._boost_monitoring()
+        self.update_scheduler.request(update_scheduler.PROCESSES, delay=1000)
 
     def show_app_context_menu(self, pos, app_data, sender=None):
         # sender 必须显式传入（来自 lambda），用于精确计算图标全局矩形
+        started = time.perf_counter()
         try:
             self.hide_icon_tooltip()
         except Exception as e:
             log.debug(f"隐藏图标提示时出错: {e}")
 
-        # 构建动作列表
+        # 构建动作列表（只查询已有快照，点击路径上不枚举窗口）
         actions = []
-        is_running_app = any(app['path'] == app_data['path'] for app in self.running_apps_list)
-        try:
-            is_running = self.process_manager.is_process_running(app_data.get('path', ''))
-        except Exception:
-            is_running = False
-        visible_windows = self.process_manager.get_app_visible_windows(app_data.get('path', ''))
+        is_running_app = self.registry.has_path(AppRegistry.RUNNING, app_data['path'])
+        visible_windows = self.process_manager.get_app_visible_windows(app_data.get('path', ''), self._take_snapshot())
+        is_running = bool(visible_windows) or app_data['name'] in self.running_apps
         if is_running:
             if visible_windows:
                 for hwnd, title in visible_windows:
@@ -965,38 +1408,16 @@ class DockApp(QMainWindow):
                 actions.append(("关闭窗口", lambda: self.close_app_window(app_data), True))
             actions.append(("关闭应用", lambda: self.terminate_app_process(app_data), True))
 
-        # 创建并显示自定义弹窗，使用传入的 sender 作为锚点（始终居中在图标上方）
-        popup = ContextPopup(actions, parent=None)
-        popup.show_at_position(pos, sender)
+        # 复用预先创建的弹窗，使用传入的 sender 作为锚点（始终居中在图标上方）
+        self.context_popup.set_actions(actions)
+        self.context_popup.show_at_position(pos, sender, started=started)
 
     def close_app_window(self, app_data):
         """关闭应用窗口"""
-        app_path = app_data['path']
-        app_filename = os.path.basename(app_path)
-        
-        def enum_windows_proc(hwnd, param):
-            if win32gui.IsWindowVisible(hwnd):
-                try:
-                    # 获取窗口的进程ID
-                    _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                    proc = psutil.Process(pid)
-                    
-                    # 检查进程名称是否匹配
-                    if proc.name().lower() == app_filename.lower():
-                        # 检查窗口标题是否为空（避免关闭系统窗口）
-                        window_title = win32gui.GetWindowText(hwnd)
-                        if window_title.strip() != '':
-                            # 尝试优雅地关闭窗口
-                            win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
-                            log.info(f"已发送关闭命令到窗口: {window_title}")
-                            return False  # 找到并处理了窗口，停止枚举
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    return True  # 继续枚举其他窗口
-
         try:
-            win32gui.EnumWindows(enum_windows_proc, 0)
+            self.process_manager.close_app_window(app_data['path'])
             # 延迟检查进程状态
-            QTimer.singleShot(1000, self.check_running_processes)
+            self.update_scheduler.request(update_scheduler.PROCESSES, delay=1000)
         except Exception as e:
             log.error(f"关闭窗口时出错: {e}")
 
@@ -1008,12 +1429,12 @@ class DockApp(QMainWindow):
         )
 
         if reply == sys32.IDYES:
-            self.apps.remove(app_data)
+            self.registry.remove(AppRegistry.APPS, app_data)
             # 如果应用正在运行，从运行列表中移除
             if app_data['name'] in self.running_apps:
                 del self.running_apps[app_data['name']]
             self.save_settings()
-            self.update_app_buttons()
+            self.update_scheduler.request(update_scheduler.BUTTONS)
 
     def rename_app(self, app_data):
         """修改应用名称"""
@@ -1029,7 +1450,7 @@ class DockApp(QMainWindow):
             new_name = self._generate_unique_app_name(new_name.strip())
             
             # 更新应用名称
-            app_data['name'] = new_name
+            self.registry.rename(AppRegistry.APPS, app_data, new_name)
             
             # 更新按钮引用
             if current_name in self.app_buttons:
@@ -1038,7 +1459,7 @@ class DockApp(QMainWindow):
                 self.app_buttons[new_name] = button
             
             self.save_settings()
-            self.update_app_buttons()
+            self.update_scheduler.request(update_scheduler.BUTTONS)
 
     def change_app_icon(self, app_data):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -1052,7 +1473,7 @@ class DockApp(QMainWindow):
             if os.path.exists(file_path):
                 app_data['icon'] = file_path
                 self.save_settings()
-                self.update_app_buttons()
+                self.update_scheduler.request(update_scheduler.BUTTONS)
             else:
                 sys32.messagebox("错误", "选择的图标文件不存在", sys32.MB_ICONWARNING | sys32.MB_OK)
 
@@ -1068,12 +1489,15 @@ class DockApp(QMainWindow):
     def on_settings_saved(self, config_data):
         """设置保存后的回调"""
         dock_config = config_data.get('dock', {})
-        except_list = dock_config.get('except_processes', [])
-        if except_list and hasattr(self, 'process_manager') and self.process_manager:
-            try:
-                self.process_manager.set_except_processes(except_list)
-            except Exception:
-                pass
+        self._apply_window_rules(dock_config)
+        self._apply_monitor_intervals(dock_config)
+        self._apply_icon_cache_limits(dock_config)
+        self._apply_icon_pool(dock_config)
+        overflow_enabled = bool(dock_config.get('overflow_mode', True))
+        if overflow_enabled != self._overflow_enabled:
+            self._overflow_enabled = overflow_enabled
+            self._list_versions.pop('running', None)
+            self.update_scheduler.request(update_scheduler.BUTTONS)
 
         debug_enabled = config_data.get('debug', False)
         if debug_enabled:
@@ -1089,31 +1513,34 @@ class DockApp(QMainWindow):
             # 从 dock栏配置部分获取数据
             dock_config = settings.get('dock', {})
             self.apps = dock_config.get('apps', [])
+            self._last_running = [app for app in dock_config.get('last_running', []) if isinstance(app, dict)]
+            self._overflow_enabled = bool(dock_config.get('overflow_mode', True))
             
-            # 加载 ProcessManager 的排除进程设置（如存在）
-            except_list = dock_config.get('except_processes', [])
-            if except_list and hasattr(self, 'process_manager') and self.process_manager:
-                try:
-                    self.process_manager.set_except_processes(except_list)
-                except Exception:
-                    pass
-            
-
+            # 加载 ProcessManager 的排除进程与系统窗口规则（如存在）
+            self._apply_window_rules(dock_config)
+            self._apply_monitor_intervals(dock_config)
+            self._apply_icon_cache_limits(dock_config)
+            self._apply_icon_pool(dock_config)
             
             # 确保加载设置后更新应用按钮
-            self.update_app_buttons()
+            self.update_scheduler.request(update_scheduler.BUTTONS)
             if dock_config.get('hide_taskbar', False):
                 sys32.show_window(sys32.HWND_TRAY)
         except Exception as e:
             log.exception(f"加载配置文件 {self.settings_file} 时出错")
             self.apps = []  # 出错时使用默认设置
-            self.update_app_buttons()
+            self.update_scheduler.request(update_scheduler.BUTTONS)
 
     def save_settings(self):
         try:
             config = Config.load_config(self.settings_file)
             config['dock']['apps'] = self.apps
             config['dock']['except_processes'] = getattr(self.process_manager, 'except_processes', [])
+            # 记录当前运行中的应用，下次启动时预热其图标
+            config['dock']['last_running'] = [
+                {'name': app.get('name', ''), 'path': app.get('path', '')}
+                for app in self.running_apps_list[:DockConstants.LAST_RUNNING_LIMIT]
+            ]
             Config.save_config(self.settings_file, config)
         except Exception as e:
             log.exception(f"保存配置文件 {self.settings_file} 时出错")
@@ -1130,9 +1557,9 @@ class DockApp(QMainWindow):
             ("退出", self.exit_app, True),
         ]
         
-        # 创建并显示自定义弹窗，使用菜单按钮作为锚点
-        popup = ContextPopup(actions, parent=None)
-        popup.show_at_position(pos, self.sender())
+        # 复用预先创建的弹窗，使用菜单按钮作为锚点
+        self.context_popup.set_actions(actions)
+        self.context_popup.show_at_position(pos, self.sender())
 
     def open_terminal(self):
         """打开命令提示符"""
@@ -1206,9 +1633,34 @@ class DockApp(QMainWindow):
                 except Exception as e:
                     log.error(f"停止后台服务时出错: {e}")
             
-            # 停止进程监控定时器
-            if hasattr(self, 'process_timer') and self.process_timer:
-                self.process_timer.stop()
+            # 丢弃尚未执行的界面刷新
+            if hasattr(self, 'update_scheduler'):
+                self.update_scheduler.cancel()
+                log.debug(f"界面刷新调度统计: {self.update_scheduler.stats()}，"
+                          f"右键菜单延迟: {self.context_popup.latency_stats()}")
+            
+            # 停止窗口事件跟踪（监控线程已由线程管理器停止）
+            if hasattr(self, 'window_tracker') and self.window_tracker:
+                self.window_tracker.stop()
+            
+            # 停止异步图标提取（不等待进行中的任务）
+            if hasattr(self, 'icon_loader') and self.icon_loader:
+                self.icon_loader.shutdown(wait=False)
+                log.debug(f"图标加载统计: {self.icon_loader.stats()}，"
+                          f"图标内存缓存: {self.pixmap_cache.stats()}，图标图集: {self.icon_atlas.stats()}")
+            if hasattr(self, 'atlas_builder') and self.atlas_builder:
+                self.atlas_builder.shutdown(wait=False)
+            
+            # 停止图标提取工作进程
+            if self.process_manager.icon_pool is not None:
+                log.debug(f"图标进程池统计: {self.process_manager.icon_pool.stats()}")
+                self.process_manager.set_icon_pool(None).shutdown()
+            
+            # 保存图标缓存的使用记录（供下次 LRU 清理使用）
+            try:
+                self.process_manager.icon_cache.flush()
+            except Exception as e:
+                log.error(f"保存图标缓存索引时出错: {e}")
             
             # 停止全局快捷键管理器
             if hasattr(self, 'hotkey_manager') and self.hotkey_manager:
@@ -1246,4 +1698,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 图标提取工作进程（core.icon_pool）在打包后的程序中也能正常启动
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,96 @@
+import pytest
+
+from core.fullscreen import FakeMonitorProvider, FullscreenDetector, rect_covers
+from core.window_events import ScriptedEventSource, WindowEventType, WindowTracker
+from core.window_rules import WindowRules
+from core.window_snapshot import FakeWindowBackend, WindowInfo
+
+OWN_PID = 1
+PRIMARY = (0, 0, 1920, 1080)
+SECONDARY = (1920, 0, 3840, 1080)
+
+
+def window(hwnd, rect, title='App', class_name='AppWindow', process_name='app.exe', pid=None):
+    return WindowInfo(hwnd=hwnd, pid=pid if pid is not None else 100 + hwnd, title=title,
+                      class_name=class_name, visible=True, rect=rect, process_name=process_name)
+
+
+def legacy_fullscreen_windows(windows, monitors, rules):
+    """旧实现：逐个检查全部可见窗口，跳过系统窗口与排除进程"""
+    return [w.hwnd for w in windows
+            if w.visible and w.pid != OWN_PID and not rules.is_system_window(w)
+            and any(rect_covers(w.rect, m) for m in monitors)]
+
+
+def make(windows, monitors=(PRIMARY,), except_processes=('game.exe',)):
+    backend = FakeWindowBackend(windows)
+    rules = WindowRules(except_processes=except_processes)
+    detector = FullscreenDetector(FakeMonitorProvider(monitors), rules=lambda: rules, own_pid=OWN_PID)
+    return backend, detector, rules
+
+
+def assert_parity(backend, detector, rules, monitors, snapshot=None):
+    """新检测器在假后端与假显示器上与旧的全量扫描结果一致"""
+    expected = legacy_fullscreen_windows(backend.collect(), monitors, rules)
+    if snapshot is None:
+        snapshot = backend.snapshot()
+    actual = detector.fullscreen_windows(snapshot, backend.foreground(), query=backend.query)
+    assert sorted(actual) == sorted(expected)
+
+
+DOCK = window(1, (0, 1000, 1920, 1080), pid=OWN_PID)
+DESKTOP = window(2, PRIMARY, title='Program Manager', class_name='Progman', process_name='explorer.exe')
+
+LAYOUTS = {
+    'fullscreen': [window(10, PRIMARY), DESKTOP],
+    'fullscreen_overscan': [window(10, (-8, -8, 1928, 1088)), DESKTOP],
+    'maximized': [window(10, (0, 0, 1920, 1040)), DESKTOP],
+    'desktop_only': [DOCK, DESKTOP],
+    'excluded_process': [window(10, PRIMARY, process_name='game.exe'), DESKTOP],
+    'tooltip_above_fullscreen': [window(3, (100, 100, 300, 130), title='', class_name='tooltips_class32'),
+                                 window(10, PRIMARY)],
+    'window_above_fullscreen': [window(3, (100, 100, 900, 700)), window(10, PRIMARY), DESKTOP],
+}
+
+
+@pytest.mark.parametrize('name', sorted(LAYOUTS))
+@pytest.mark.parametrize('foreground', [True, False])
+def test_layout_parity(name, foreground):
+    windows = LAYOUTS[name]
+    backend, detector, rules = make(windows)
+    backend.foreground_hwnd = windows[0].hwnd if foreground else None
+    assert_parity(backend, detector, rules, [PRIMARY])
+
+
+def test_multi_monitor_parity():
+    monitors = [PRIMARY, SECONDARY]
+    windows = [window(10, (0, 0, 800, 600)), window(11, SECONDARY)]
+    backend, detector, rules = make(windows, monitors)
+    backend.foreground_hwnd = 10
+    assert_parity(backend, detector, rules, monitors)
+
+
+def test_foreground_goes_fullscreen_before_reconcile():
+    """事件跟踪的快照中矩形滞后时，前台窗口仍以实时状态判定"""
+    backend, detector, rules = make([window(10, (100, 100, 900, 700))])
+    backend.foreground_hwnd = 10
+    tracker = WindowTracker(backend)
+    tracker.start(ScriptedEventSource())
+    stale = tracker.snapshot()
+
+    backend.update_window(10, rect=PRIMARY)
+    assert_parity(backend, detector, rules, [PRIMARY], snapshot=stale)
+
+    backend.update_window(10, rect=(100, 100, 900, 700))
+    assert_parity(backend, detector, rules, [PRIMARY], snapshot=stale)
+
+
+def test_location_event_updates_tracker():
+    backend, detector, _ = make([window(10, (100, 100, 900, 700))])
+    source = ScriptedEventSource()
+    tracker = WindowTracker(backend)
+    tracker.start(source)
+
+    backend.update_window(10, rect=PRIMARY)
+    source.emit(WindowEventType.LOCATION, 10)
+    assert detector.fullscreen_windows(tracker.snapshot()) == [10]
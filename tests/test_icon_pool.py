@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from core.icon_pool import IconProcessPool, fake_extract
+
+SIZE = 16
+
+
+@pytest.fixture
+def pool():
+    pool = IconProcessPool(workers=1, job_timeout=1.0, max_jobs_per_worker=3, extractor=fake_extract)
+    yield pool
+    pool.shutdown()
+
+
+def test_extract_returns_pixels(pool):
+    icon = pool.extract('C:/Apps/app.exe', SIZE)
+    assert icon.success
+    assert (icon.width, icon.height) == (SIZE, SIZE)
+    assert len(icon.pixels) == SIZE * SIZE * 4
+    assert icon.pixels == fake_extract('C:/Apps/app.exe', SIZE)[0]
+    assert pool.stats()['completed'] == 1
+
+
+def test_oversized_request_is_rejected_without_a_worker(pool):
+    icon = pool.extract('C:/Apps/app.exe', 1024)
+    assert not icon.success
+    assert pool.stats()['spawned'] == 0
+
+
+def test_extractor_error_keeps_worker(pool):
+    icon = pool.extract('fail:bad.exe', SIZE)
+    assert not icon.success
+    assert 'bad.exe' in icon.error
+    assert pool.extract('C:/Apps/app.exe', SIZE).worker_pid == icon.worker_pid
+    stats = pool.stats()
+    assert stats['failed'] == 1
+    assert stats['spawned'] == 1
+
+
+def test_timeout_kills_worker_and_recovers(pool):
+    started = time.monotonic()
+    icon = pool.extract('hang:bad.exe', SIZE)
+    assert time.monotonic() - started < 5
+    assert icon.timed_out
+    assert not icon.success
+    assert pool.stats()['timeouts'] == 1
+
+    after = pool.extract('C:/Apps/app.exe', SIZE)
+    assert after.success
+    assert after.worker_pid != icon.worker_pid
+
+
+def test_crash_recovers_with_new_worker(pool):
+    icon = pool.extract('crash:bad.exe', SIZE)
+    assert not icon.success
+    assert not icon.timed_out
+    assert pool.stats()['crashes'] == 1
+
+    after = pool.extract('C:/Apps/app.exe', SIZE)
+    assert after.success
+    assert after.worker_pid != icon.worker_pid
+    assert pool.stats()['spawned'] == 2
+
+
+def test_worker_recycled_after_max_jobs(pool):
+    results = [pool.extract(f'C:/Apps/app{i}.exe', SIZE) for i in range(7)]
+    assert all(r.success for r in results)
+    pids = [r.worker_pid for r in results]
+    assert pids[0] == pids[1] == pids[2]
+    assert pids[3] == pids[4] == pids[5]
+    assert len(set(pids)) == 3
+    stats = pool.stats()
+    assert stats['recycled'] == 2
+    assert stats['spawned'] == 3
+
+
+def test_extract_after_shutdown_returns(pool):
+    assert pool.extract('C:/Apps/app.exe', SIZE).success
+    pool.shutdown()
+    started = time.monotonic()
+    icon = pool.extract('C:/Apps/app.exe', SIZE)
+    assert time.monotonic() - started < 1
+    assert not icon.success
+    assert icon.error == "图标进程池已关闭"
+
+
+def test_waiting_extract_returns_after_shutdown(pool):
+    results = []
+    busy = threading.Thread(target=lambda: results.append(pool.extract('slow:500:app.exe', SIZE)))
+    busy.start()
+    time.sleep(0.2)  # 唯一的工作进程正忙，下面的调用排队等待槽位
+    waiting = threading.Thread(target=lambda: results.append(pool.extract('C:/Apps/app.exe', SIZE)))
+    waiting.start()
+    time.sleep(0.1)
+    pool.shutdown()
+    busy.join(5)
+    waiting.join(5)
+    assert not busy.is_alive()
+    assert not waiting.is_alive()
+    assert sorted(r.error or '' for r in results) == ['', "图标进程池已关闭"]
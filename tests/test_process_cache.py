@@ -0,0 +1,114 @@
+from core.process_cache import FakeProcessProvider, ProcessInfoCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make(processes, **kwargs):
+    clock = FakeClock()
+    provider = FakeProcessProvider(processes, **kwargs)
+    cache = ProcessInfoCache(provider, negative_ttl=60.0, clock=clock)
+    return cache, provider, clock
+
+
+def test_hit_after_first_lookup():
+    cache, provider, _ = make({10: (100.0, 'C:/Apps/App.exe', 'App.exe')})
+    first = cache.get(10)
+    assert first.exe == 'C:/Apps/App.exe'
+    assert first.name == 'App.exe'
+    assert cache.get(10) is first
+    assert provider.describe_calls == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_pid_reuse_evicts_stale_entry():
+    cache, provider, _ = make({10: (100.0, 'C:/Apps/Old.exe', 'Old.exe')})
+    assert cache.get(10).name == 'Old.exe'
+
+    provider.processes[10] = (200.0, 'C:/Apps/New.exe', 'New.exe')
+    info = cache.get(10)
+    assert info.name == 'New.exe'
+    assert info.create_time == 200.0
+    assert cache.stats()['stale_evictions'] == 1
+    assert provider.describe_calls == 2
+
+
+def test_exited_process_returns_none():
+    cache, provider, _ = make({10: (100.0, 'C:/Apps/App.exe', 'App.exe')})
+    cache.get(10)
+    del provider.processes[10]
+    assert cache.get(10) is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_negative_cache_expires_after_ttl():
+    cache, provider, clock = make({10: (100.0, 'C:/Windows/System.exe', 'System.exe')}, denied=[10])
+    info = cache.get(10)
+    assert info.denied
+    assert info.exe == ''
+    assert info.name == 'System.exe'
+
+    clock.now = 59.0
+    assert cache.get(10) is info
+    assert provider.describe_calls == 1
+    assert cache.stats()['negative_hits'] == 1
+
+    clock.now = 61.0
+    provider.denied.clear()
+    assert cache.get(10).exe == 'C:/Windows/System.exe'
+    assert provider.describe_calls == 2
+
+
+def test_negative_entry_dropped_on_pid_reuse():
+    cache, provider, _ = make({10: (100.0, 'C:/Windows/System.exe', 'System.exe')}, denied=[10])
+    assert cache.get(10).denied
+
+    provider.processes[10] = (200.0, 'C:/Apps/App.exe', 'App.exe')
+    provider.denied.clear()
+    assert cache.get(10).exe == 'C:/Apps/App.exe'
+
+
+def test_unknown_create_time_is_not_cached():
+    cache, provider, _ = make({10: (100.0, 'C:/Apps/Old.exe', 'Old.exe')}, denied_create_time=[10])
+    assert cache.get(10).name == 'Old.exe'
+    assert cache.stats()['entries'] == 0
+
+    provider.processes[10] = (200.0, 'C:/Apps/New.exe', 'New.exe')
+    assert cache.get(10).name == 'New.exe'
+
+
+def test_retain_drops_exited_pids():
+    processes = {
+        10: (100.0, 'C:/Apps/A.exe', 'A.exe'),
+        11: (100.0, 'C:/Apps/B.exe', 'B.exe'),
+        12: (100.0, 'C:/Windows/C.exe', 'C.exe'),
+    }
+    cache, _, _ = make(processes, denied=[12])
+    for pid in processes:
+        cache.get(pid)
+    assert cache.stats()['entries'] == 2
+    assert cache.stats()['negative_entries'] == 1
+
+    cache.retain([10])
+    stats = cache.stats()
+    assert stats['entries'] == 1
+    assert stats['negative_entries'] == 0
+    assert cache.get(10).name == 'A.exe'
+    assert cache.stats()['hits'] == 1
+
+
+def test_max_entries_evicts_least_recently_used():
+    processes = {pid: (100.0, f'C:/Apps/{pid}.exe', f'{pid}.exe') for pid in range(4)}
+    provider = FakeProcessProvider(processes)
+    cache = ProcessInfoCache(provider, max_entries=3)
+    for pid in range(3):
+        cache.get(pid)
+    cache.get(0)
+    cache.get(3)
+    cache.get(1)
+    assert provider.describe_calls == 5
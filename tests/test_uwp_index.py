@@ -0,0 +1,148 @@
+import json
+import os
+
+import pytest
+
+from core.uwp_index import FAMILIES_KEY, DictRegistryReader, UwpIndex, UwpPackage
+
+APPS_ROOT = os.path.join('C:', 'WindowsApps')
+
+
+class RecordingReader(DictRegistryReader):
+    """记录读取了哪些 Resources 键，用于确认增量刷新只重新读取变化的包系列"""
+
+    def __init__(self, tree=()):
+        super().__init__(tree)
+        self.value_paths = []
+
+    def values(self, path):
+        self.value_paths.append(path)
+        return super().values(path)
+
+
+def packages_key(family):
+    return f"{FAMILIES_KEY}\\{family}\\Packages"
+
+
+def add_package(reader, family, package, logo='Logo.png'):
+    reader.set_key(f"{packages_key(family)}\\{package}\\Resources", {'Logo': logo})
+
+
+def logo_path(package, name='Logo.scale-100.png'):
+    return os.path.join(APPS_ROOT, package, name)
+
+
+@pytest.fixture
+def reader():
+    reader = RecordingReader()
+    add_package(reader, 'Microsoft.WindowsCalculator_8wekyb3d8bbwe',
+                'Microsoft.WindowsCalculator_11.2_x64__8wekyb3d8bbwe')
+    add_package(reader, 'Microsoft.Paint_8wekyb3d8bbwe', 'Microsoft.Paint_11.1_x64__8wekyb3d8bbwe')
+    add_package(reader, 'Contoso.Notes_abc123', 'Contoso.Notes_2.0_x64__abc123')
+    return reader
+
+
+def make_index(reader, tmp_path=None):
+    cache_path = str(tmp_path / 'uwp_index.json') if tmp_path is not None else None
+    # 只有 scale-100 的 Logo 文件存在
+    return UwpIndex(reader, cache_path=cache_path, apps_root=APPS_ROOT,
+                    exists=lambda path: path.endswith('.scale-100.png'))
+
+
+def test_build_resolves_logos(reader):
+    index = make_index(reader)
+    assert index.refresh() == 3
+    assert index.wait_ready(0)
+    pkg = index.find('Microsoft.Paint_8wekyb3d8bbwe')
+    assert pkg == UwpPackage('Microsoft.Paint_8wekyb3d8bbwe', 'Microsoft.Paint_11.1_x64__8wekyb3d8bbwe',
+                             logo_path('Microsoft.Paint_11.1_x64__8wekyb3d8bbwe'))
+    assert index.stats()['packages'] == 3
+
+
+def test_find_exact_keys(reader):
+    index = make_index(reader)
+    index.refresh()
+    family = 'Microsoft.WindowsCalculator_8wekyb3d8bbwe'
+    for key in (family, 'Microsoft.WindowsCalculator_11.2_x64__8wekyb3d8bbwe', 'microsoft.windowscalculator'):
+        assert index.find(key).family == family
+    assert index.stats()['hits'] == 3
+
+
+def test_find_substring_fallback_is_remembered(reader):
+    index = make_index(reader)
+    index.refresh()
+    assert index.find('Notes').package == 'Contoso.Notes_2.0_x64__abc123'
+    assert index.find('missing') is None
+    assert index.find('') is None
+
+    reads = reader.reads
+    assert index.find('notes').family == 'Contoso.Notes_abc123'
+    assert index.find('missing') is None
+    assert reader.reads == reads
+    stats = index.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 2
+
+
+def test_find_builds_index_on_first_use(reader):
+    index = make_index(reader)
+    assert index.find('Contoso.Notes_abc123') is not None
+    assert index.stats()['refreshes'] == 1
+
+
+def test_refresh_rereads_only_changed_family(reader):
+    index = make_index(reader)
+    index.refresh()
+    reader.value_paths.clear()
+    assert index.refresh() == 0
+    assert reader.value_paths == []
+
+    add_package(reader, 'Microsoft.Paint_8wekyb3d8bbwe', 'Microsoft.Paint_11.2_x64__8wekyb3d8bbwe')
+    reader.touch(packages_key('Microsoft.Paint_8wekyb3d8bbwe'))
+    assert index.refresh() == 1
+    assert all('Microsoft.Paint_8wekyb3d8bbwe' in path for path in reader.value_paths)
+    assert len(reader.value_paths) == 2
+    assert index.find('Microsoft.Paint_11.2_x64__8wekyb3d8bbwe') is not None
+    assert index.stats()['families_rescanned'] == 4
+
+
+def test_refresh_drops_deleted_family(reader):
+    index = make_index(reader)
+    index.refresh()
+    index.find('notes')
+    reader.delete_key(f"{FAMILIES_KEY}\\Contoso.Notes_abc123")
+    assert index.refresh() == 0
+    assert index.find('Contoso.Notes_abc123') is None
+    # 模糊匹配的记忆结果随索引变化一起丢弃
+    assert index.find('notes') is None
+    assert index.stats()['families'] == 2
+
+
+def test_save_and_load_cache(reader, tmp_path):
+    index = make_index(reader, tmp_path)
+    index.refresh()
+    with open(tmp_path / 'uwp_index.json', encoding='utf-8') as f:
+        data = json.load(f)
+    assert set(data['families']) == {'Microsoft.WindowsCalculator_8wekyb3d8bbwe',
+                                     'Microsoft.Paint_8wekyb3d8bbwe', 'Contoso.Notes_abc123'}
+
+    # 从缓存加载后，未变化的包系列不再读取 Resources
+    reader.value_paths.clear()
+    cached = make_index(reader, tmp_path)
+    assert cached.load() == 3
+    assert cached.find('Contoso.Notes_abc123').logo == logo_path('Contoso.Notes_2.0_x64__abc123')
+    assert cached.refresh() == 0
+    assert reader.value_paths == []
+
+
+def test_cache_for_other_apps_root_is_ignored(reader, tmp_path):
+    make_index(reader, tmp_path).refresh()
+    other = UwpIndex(reader, cache_path=str(tmp_path / 'uwp_index.json'), apps_root='D:\\Apps')
+    assert other.load() == 0
+
+
+def test_corrupt_cache_starts_empty(reader, tmp_path):
+    (tmp_path / 'uwp_index.json').write_text('{not json', encoding='utf-8')
+    index = make_index(reader, tmp_path)
+    assert index.load() == 0
+    assert index.refresh() == 3
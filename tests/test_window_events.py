@@ -0,0 +1,139 @@
+import pytest
+
+from core.window_events import ScriptedEventSource, WindowEventType, WindowTracker
+from core.window_snapshot import FakeWindowBackend, WindowInfo
+
+
+def window(hwnd, rect=(0, 0, 800, 600), title=None, visible=True):
+    return WindowInfo(hwnd=hwnd, pid=100 + hwnd, title=title or f'Window {hwnd}', class_name='AppWindow',
+                      visible=visible, rect=rect, exe=f'C:/Apps/app{hwnd}.exe', process_name=f'app{hwnd}.exe')
+
+
+@pytest.fixture
+def setup():
+    backend = FakeWindowBackend([window(1), window(2)])
+    changes = []
+    tracker = WindowTracker(backend, on_change=changes.append)
+    source = ScriptedEventSource()
+    assert tracker.start(source)
+    return backend, tracker, source, changes
+
+
+def order(tracker):
+    return [info.hwnd for info in tracker.snapshot()]
+
+
+def test_start_enumerates_once(setup):
+    backend, tracker, _, _ = setup
+    assert tracker.is_live
+    assert order(tracker) == [1, 2]
+    assert backend.collect_count == 1
+
+
+def test_created_and_shown_windows_go_on_top(setup):
+    backend, tracker, source, changes = setup
+    backend.add_window(window(3))
+    source.emit(WindowEventType.CREATE, 3)
+    assert order(tracker) == [3, 1, 2]
+
+    backend.add_window(window(4))
+    source.emit(WindowEventType.SHOW, 4)
+    assert order(tracker) == [4, 3, 1, 2]
+    assert len(changes) == 2
+
+
+def test_hidden_window_is_not_added(setup):
+    backend, tracker, source, changes = setup
+    backend.add_window(window(3, visible=False))
+    source.emit(WindowEventType.CREATE, 3)
+    assert order(tracker) == [1, 2]
+    assert changes == []
+
+
+def test_foreground_moves_window_to_top(setup):
+    _, tracker, source, changes = setup
+    source.emit(WindowEventType.FOREGROUND, 2)
+    assert tracker.foreground_hwnd == 2
+    assert order(tracker) == [2, 1]
+    assert len(changes) == 1
+
+    # 重复的前台事件不改变状态，不通知
+    source.emit(WindowEventType.FOREGROUND, 2)
+    assert len(changes) == 1
+
+
+def test_hide_and_destroy_remove_window(setup):
+    backend, tracker, source, _ = setup
+    source.emit(WindowEventType.FOREGROUND, 1)
+    source.emit(WindowEventType.HIDE, 1)
+    assert order(tracker) == [2]
+    assert tracker.foreground_hwnd is None
+
+    backend.remove_window(2)
+    source.emit(WindowEventType.DESTROY, 2)
+    assert order(tracker) == []
+    stats = tracker.stats()
+    assert stats['events_received'] == 3
+    assert stats['events_applied'] == 3
+
+
+def test_name_change_keeps_position(setup):
+    backend, tracker, source, changes = setup
+    backend.update_window(2, title='Renamed')
+    source.emit(WindowEventType.NAME, 2)
+    assert order(tracker) == [1, 2]
+    assert tracker.snapshot().get(2).title == 'Renamed'
+    assert len(changes) == 1
+
+
+def test_pure_move_updates_rect_without_notifying(setup):
+    backend, tracker, source, changes = setup
+    backend.update_window(1, rect=(100, 100, 900, 700))
+    source.emit(WindowEventType.LOCATION, 1)
+    assert tracker.snapshot().get(1).rect == (100, 100, 900, 700)
+    assert changes == []
+    assert backend.query_count == 0
+    assert tracker.stats()['moves_applied'] == 1
+
+
+def test_resize_notifies(setup):
+    backend, tracker, source, changes = setup
+    backend.update_window(1, rect=(0, 0, 1920, 1080))
+    source.emit(WindowEventType.LOCATION, 1)
+    assert tracker.snapshot().get(1).rect == (0, 0, 1920, 1080)
+    assert [event.type for event in changes] == [WindowEventType.LOCATION]
+    assert order(tracker) == [1, 2]
+
+
+def test_location_of_untracked_window_is_ignored(setup):
+    backend, tracker, source, changes = setup
+    backend.add_window(window(3))
+    source.emit(WindowEventType.LOCATION, 3)
+    assert order(tracker) == [1, 2]
+    assert changes == []
+
+
+def test_reconcile_corrects_missed_events(setup):
+    backend, tracker, source, _ = setup
+    assert tracker.reconcile() == 0
+
+    backend.add_window(window(3))
+    backend.remove_window(1)
+    backend.update_window(2, title='Changed')
+    assert tracker.reconcile() == 3
+    assert order(tracker) == [2, 3]
+    assert tracker.snapshot().get(2).title == 'Changed'
+    assert tracker.stats()['reconcile_corrections'] == 3
+
+
+def test_play_and_stop(setup):
+    backend, tracker, source, _ = setup
+    backend.add_window(window(3))
+    source.play([(WindowEventType.CREATE, 3), (WindowEventType.FOREGROUND, 2), (WindowEventType.HIDE, 1)])
+    assert source.emitted == 3
+    assert order(tracker) == [2, 3]
+
+    tracker.stop()
+    assert not tracker.is_live
+    source.emit(WindowEventType.HIDE, 2)
+    assert order(tracker) == [2, 3]
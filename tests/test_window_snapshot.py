@@ -0,0 +1,81 @@
+import os
+
+from core.window_snapshot import FakeWindowBackend, WindowInfo, WindowSnapshot, normalize_path
+
+
+def window(hwnd, pid, exe, title='Window', visible=True, rect=(0, 0, 800, 600)):
+    return WindowInfo(hwnd=hwnd, pid=pid, title=title, class_name='AppWindow', visible=visible,
+                      rect=rect, exe=exe, process_name=os.path.basename(exe))
+
+
+def test_normalize_path():
+    assert normalize_path('') == ''
+    assert normalize_path(None) == ''
+    assert normalize_path('/Apps/Editor/Editor.EXE') == os.path.abspath('/Apps/Editor/Editor.EXE').lower()
+    assert normalize_path('/Apps/Editor/../Editor/editor.exe') == normalize_path('/Apps/Editor/Editor.exe')
+
+
+def test_indexes():
+    windows = [
+        window(1, 10, '/Apps/Editor.exe', title='Doc 1'),
+        window(2, 10, '/Apps/Editor.exe', title='Doc 2'),
+        window(3, 20, '/Apps/Player.exe', title=''),
+        window(4, 30, '', title='No access'),
+    ]
+    snapshot = WindowSnapshot(windows)
+    assert len(snapshot) == 4
+    assert [w.hwnd for w in snapshot] == [1, 2, 3, 4]
+
+    assert snapshot.get(3) is windows[2]
+    assert snapshot.get(99) is None
+
+    assert snapshot.pids() == [10, 20, 30]
+    assert [w.hwnd for w in snapshot.windows_for_pid(10)] == [1, 2]
+    assert snapshot.windows_for_pid(99) == []
+
+    # 按 exe 查询时先规范化路径（大小写不敏感）
+    assert [w.hwnd for w in snapshot.windows_for_exe('/APPS/editor.exe')] == [1, 2]
+    assert snapshot.windows_for_exe('') == []
+    # 无标题的窗口不算可见应用窗口
+    assert snapshot.visible_titled_windows('/Apps/Player.exe') == []
+    assert [w.hwnd for w in snapshot.visible_titled_windows('/Apps/Editor.exe')] == [1, 2]
+
+
+def test_queries_return_copies():
+    snapshot = WindowSnapshot([window(1, 10, '/Apps/Editor.exe')])
+    snapshot.windows_for_pid(10).clear()
+    assert len(snapshot.windows_for_pid(10)) == 1
+
+
+def test_signature_changes_only_with_content():
+    backend = FakeWindowBackend([window(1, 10, '/Apps/Editor.exe'), window(2, 20, '/Apps/Player.exe')])
+    base = backend.snapshot().signature()
+    assert backend.snapshot().signature() == base
+    assert backend.collect_count == 2
+
+    # 不参与签名的字段（类名、进程名）变化时签名不变
+    backend.update_window(1, class_name='Other', process_name='other.exe')
+    assert backend.snapshot().signature() == base
+
+    for change in ({'title': 'Renamed'}, {'rect': (10, 10, 810, 610)}, {'visible': False}, {'pid': 11}):
+        backend.set_windows([window(1, 10, '/Apps/Editor.exe'), window(2, 20, '/Apps/Player.exe')])
+        backend.update_window(1, **change)
+        assert backend.snapshot().signature() != base, change
+
+    backend.set_windows([window(1, 10, '/Apps/Editor.exe')])
+    assert backend.snapshot().signature() != base
+
+
+def test_fake_backend_query_and_foreground():
+    backend = FakeWindowBackend([window(1, 10, '/Apps/Editor.exe')])
+    assert backend.query(1).pid == 10
+    assert backend.query(2) is None
+    assert backend.query_count == 2
+    assert backend.window_rect(1) == (0, 0, 800, 600)
+    assert backend.foreground() is None
+    backend.foreground_hwnd = 1
+    assert backend.foreground() == 1
+
+    backend.remove_window(1)
+    assert backend.query(1) is None
+    assert len(backend.snapshot()) == 0